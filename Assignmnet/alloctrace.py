@@ -0,0 +1,190 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bench
+from instrument import Instrumented
+
+# Binary allocation traces and a parallel replay runner, e.g.
+#   python alloctrace.py record run.trace --requests 100000 --recurring 8
+#   python alloctrace.py replay run.trace --workers 4 --allocators asdas.dynamic Memory.dynamic.best
+#
+# A trace is an 8-byte header (magic, version) followed by fixed-size little-endian records of
+# (op, pid, size, timestamp), op being ALLOC or FREE and the timestamp in nanoseconds since the
+# recording started; 20 bytes per request. A Recorder writes them: wrap() returns recording
+# versions of an allocate(pid, size)/free(pid) pair and hook() patches a manager's own methods.
+# Pids that are not integers (asdas takes them from input()) are numbered in order of appearance.
+#
+# replay() hands only the trace path to the worker processes; each one memory-maps the file and
+# decodes the records in place, so the trace is shared through the page cache instead of being
+# pickled to every worker. Allocators come from bench.TARGETS and run under instrument.Instrumented.
+# fixxed and fixedsized have no free operation: they replay the ALLOC records only, one request
+# per call, and are marked in the table as not comparable with the allocators that free.
+
+HEADER = struct.Struct('<4sI')
+RECORD = struct.Struct('<B3xIIQ')
+MAGIC = b'ATRC'
+VERSION = 1
+ALLOC, FREE = 0, 1
+
+def request_args(pid, size, *rest):
+    # (pid, size) from the arguments of an allocate(pid, size, ...) call
+    return pid, size
+
+def process_args(process, *rest):
+    # (pid, size) from the arguments of asdas' allocate(process, strategy)
+    return process.pid, process.memory_required
+
+class Recorder:
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.pids = {}  # non-integer pid -> number in the trace
+        self.records = 0
+        self.started = time.perf_counter_ns()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def pid_number(self, pid):
+        if isinstance(pid, int):
+            return pid
+        return self.pids.setdefault(pid, len(self.pids))
+
+    def record(self, op, pid, size=0):
+        self.file.write(RECORD.pack(op, self.pid_number(pid), size, time.perf_counter_ns() - self.started))
+        self.records += 1
+
+    def wrap(self, allocate, free=None):
+        def recorded_allocate(pid, size):
+            self.record(ALLOC, pid, size)
+            return allocate(pid, size)
+
+        def recorded_free(pid):
+            self.record(FREE, pid)
+            return free(pid)
+        return recorded_allocate, recorded_free if free is not None else None
+
+    def hook(self, manager, allocate='allocate', free='deallocate', request=request_args):
+        # Records every call of the two methods on this manager instance
+        allocate_method = getattr(manager, allocate)
+        free_method = getattr(manager, free)
+
+        def recorded_allocate(*args, **kwargs):
+            pid, size = request(*args, **kwargs)
+            self.record(ALLOC, pid, size)
+            return allocate_method(*args, **kwargs)
+
+        def recorded_free(pid, *args, **kwargs):
+            self.record(FREE, pid)
+            return free_method(pid, *args, **kwargs)
+        setattr(manager, allocate, recorded_allocate)
+        setattr(manager, free, recorded_free)
+        return manager
+
+def records(buffer):
+    # (op, pid, size, timestamp) for every record of a trace held in a bytes-like buffer
+    magic, version = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('not an allocation trace')
+    return RECORD.iter_unpack(memoryview(buffer)[HEADER.size:])
+
+def evaluate(path, name, config):
+    # Replays the trace through one allocator; runs in a worker process
+    allocate, free, free_space = bench.TARGETS[name](config)
+    if getattr(bench.TARGETS[name], 'batch', False):
+        place = allocate
+        allocate = lambda pid, size: place([size]) == 0
+    target = Instrumented(allocate, free, free_space, sample_every=0,
+                          free_oldest=getattr(bench.TARGETS[name], 'free_oldest', False))
+    target_allocate, target_free = target.allocate, target.free
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as trace:
+        started = time.perf_counter()
+        for op, pid, size, timestamp in records(trace):
+            if op == ALLOC:
+                target_allocate(pid, size)
+            elif free is not None:
+                target_free(pid)
+        elapsed = time.perf_counter() - started
+    result = target.snapshot()
+    result['allocator'] = name
+    result['comparable'] = free is not None  # False when the FREE records were ignored
+    result['ops_per_sec'] = result['operations'] / elapsed if elapsed else 0.0
+    return result
+
+def replay(path, names, config, workers=None):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(evaluate, [path] * len(names), names, [config] * len(names)))
+
+def format_row(result):
+    name = result['allocator'] if result['comparable'] else result['allocator'] + ' *'
+    return (f"{name:<26} {result['operations']:>9} {result['ops_per_sec']:>12.0f} "
+            f"{result['latency_p99_ns'] / 1000:>9.2f} {result['failures']:>9} {result['failure_rate']:>7.1%} "
+            f"{result['external_fragmentation']:>9.1%} {result['internal_fragmentation']:>9.1%} "
+            f"{result['utilisation']:>7.1%}")
+
+def record_stream(path, config):
+    # Records a synthetic request stream through the chosen allocator
+    allocate, free, _ = bench.TARGETS[config.allocator](config)
+    if getattr(bench.TARGETS[config.allocator], 'batch', False):
+        place = allocate
+        allocate = lambda pid, size: place([size]) == 0
+    ops = bench.make_stream(config.requests, config.total_memory, config.max_size, config.occupancy, config.seed,
+                            config.recurring)
+    with Recorder(path) as recorder:
+        allocate, free = recorder.wrap(allocate, free)
+        for op, pid, size in ops:
+            if op == 'alloc':
+                allocate(pid, size)
+            elif free is not None:
+                free(pid)
+    return recorder.records
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Record allocation traces and replay them through every allocator.')
+    parser.add_argument('--partitions', type=int, default=1000, help='partitions for the partitioned allocators')
+    parser.add_argument('--max-size', type=int, default=64, help='largest request in KB')
+    parser.add_argument('--page-size', type=int, default=4)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help='record a synthetic request stream')
+    record.add_argument('trace')
+    record.add_argument('--allocator', default='asdas.dynamic', choices=sorted(bench.TARGETS))
+    record.add_argument('--requests', type=int, default=100000)
+    record.add_argument('--occupancy', type=float, default=0.7)
+    record.add_argument('--recurring', type=int, default=0, metavar='K')
+    record.add_argument('--seed', type=int, default=0)
+
+    play = commands.add_parser('replay', help='replay a trace through the allocators in parallel')
+    play.add_argument('trace')
+    play.add_argument('--allocators', nargs='+', default=sorted(bench.TARGETS), choices=sorted(bench.TARGETS),
+                      metavar='NAME', help='allocators to replay through; fixxed and fixedsized have no free '
+                                           'operation and replay the allocations only')
+    play.add_argument('--workers', type=int, default=os.cpu_count())
+    config = parser.parse_args(argv)
+    config.total_memory = config.partitions * config.max_size
+
+    if config.command == 'record':
+        print(f"Recorded {record_stream(config.trace, config)} requests to {config.trace}")
+        return
+
+    print(f"{'allocator':<26} {'calls':>9} {'ops/sec':>12} {'p99 us':>9} {'failures':>9} {'fail':>7} "
+          f"{'ext frag':>9} {'int frag':>9} {'util':>7}")
+    results = replay(config.trace, config.allocators, config, config.workers)
+    for result in results:
+        print(format_row(result))
+    if not all(result['comparable'] for result in results):
+        print('* no free operation: FREE records ignored, not comparable with the other rows')
+
+if __name__ == '__main__':
+    sys.exit(main())
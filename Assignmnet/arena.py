@@ -0,0 +1,371 @@
+import argparse
+import itertools
+import queue
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+import asdas
+from frametable import FrameTable
+from freelist import FreeList
+from placement import Placement
+
+# Thread-safe dynamic and paging managers built from per-thread arenas, e.g.
+#   python arena.py --threads 1 2 4 8 --ops 20000
+#
+# Memory is split into arenas, each with its own lock and its own FreeList or FrameTable. A thread
+# is given a home arena the first time it allocates and allocates from it, moving on to the other
+# arenas only when its home is out of memory, so threads rarely contend for a lock. Which arena
+# holds each pid's memory is kept in a directory sharded by pid, one small lock per shard.
+#
+# Any thread may free any pid. If the owning arena's lock is free the memory goes straight back;
+# otherwise it is queued on the arena's remote list (a deque, safe to append to without the lock)
+# and the arena takes it back the next time someone holds its lock to allocate. With defer=True
+# every free of memory outside the freeing thread's home arena is queued that way, lock or no lock;
+# the stress benchmark uses it (--defer) to exercise the remote lists, which under the GIL would
+# otherwise almost never see a busy lock.
+#
+# A dynamic request that no single arena can hold takes the slow path: every arena lock, in address
+# order (the only place more than one lock is held, so it cannot deadlock), and one run of free
+# memory carved across neighbouring arenas, one piece per arena.
+#
+# The stress benchmark in main() runs the same workload against these managers and against the
+# asdas managers behind one global lock (Locked), which is what a GUI or server wrapper would need
+# today. Under the GIL the threads still take turns running Python code, so the arenas mostly
+# remove lock contention; throughput only scales with threads on a free-threaded interpreter.
+
+class Locked:
+    # The single-lock baseline: any allocate(pid, size)/free(pid) pair behind one lock
+    def __init__(self, allocate, free):
+        self.lock = threading.Lock()
+        self._allocate = allocate
+        self._free = free
+
+    def allocate(self, pid, size):
+        with self.lock:
+            return self._allocate(pid, size)
+
+    def deallocate(self, pid):
+        with self.lock:
+            return self._free(pid)
+
+class Arena:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.remote = deque()  # memory freed by threads that could not take the lock
+        self.remote_frees = 0
+        self.borrowed = 0  # allocations for threads whose home is another arena
+
+    def drain(self):
+        # Takes back the queued frees; the caller holds the lock
+        remote = self.remote
+        while remote:
+            self.release(remote.popleft())
+            self.remote_frees += 1
+
+class DynamicArena(Arena):
+    def __init__(self, base, size, strategy):
+        super().__init__()
+        self.base = base
+        self.size = size
+        self.free_blocks = FreeList()
+        if size > 0:
+            self.free_blocks.add(base, size)
+        self.placement = Placement(self.free_blocks)
+        self.strategy = strategy
+
+    def allocate(self, size):
+        # (start, size) of a block, or None
+        start = self.placement.find(size, self.strategy)
+        if start is None:
+            return None
+        return self.free_blocks.take(start, size), size
+
+    def release(self, block):
+        self.free_blocks.release(*block)
+
+    def head(self):
+        # Free units at the bottom of the arena
+        return self.free_blocks.sizes.get(self.base, 0)
+
+    def tail(self):
+        # (start, size) of the free extent reaching the top of the arena, or None
+        extent = self.free_blocks.floor(self.base + self.size - 1)
+        if extent is None or sum(extent) != self.base + self.size:
+            return None
+        return extent
+
+    def free_space(self):
+        return self.free_blocks.free_space()
+
+class PagingArena(Arena):
+    def __init__(self, first_frame, num_frames):
+        super().__init__()
+        self.first_frame = first_frame
+        self.frames = FrameTable(num_frames)
+
+    def allocate(self, count):
+        # Up to count frames, or None if the arena is full; frames are numbered within the arena,
+        # machine frame = first_frame + frame
+        count = min(count, self.frames.free_count)
+        if not count:
+            return None
+        return self.frames.allocate(count)
+
+    def release(self, frames):
+        self.frames.free(frames)
+
+    def free_space(self):
+        return self.frames.free_space()
+
+class ArenaManager:
+    def __init__(self, arenas, shards=16, defer=False):
+        self.arenas = arenas
+        self.defer = defer
+        self.local = threading.local()
+        self.next_home = itertools.count()
+        self.shards = [(threading.Lock(), {}) for _ in range(shards)]  # pid -> [(arena, memory)]
+        self.spanned = 0  # allocations carved across several arenas
+
+    def _home(self):
+        home = getattr(self.local, 'home', None)
+        if home is None:
+            home = self.local.home = next(self.next_home) % len(self.arenas)
+        return home
+
+    def _search_order(self):
+        home = self._home()
+        return self.arenas[home:] + self.arenas[:home]
+
+    def _shard(self, pid):
+        return self.shards[hash(pid) % len(self.shards)]
+
+    def _record(self, pid, pieces):
+        lock, owned = self._shard(pid)
+        with lock:
+            owned.setdefault(pid, []).extend(pieces)
+
+    def _release(self, arena, memory):
+        if self.defer and arena is not self.arenas[self._home()]:
+            arena.remote.append(memory)
+        elif arena.lock.acquire(blocking=False):
+            try:
+                arena.release(memory)
+            finally:
+                arena.lock.release()
+        else:
+            arena.remote.append(memory)
+
+    def deallocate(self, pid):
+        lock, owned = self._shard(pid)
+        with lock:
+            pieces = owned.pop(pid, None)
+        if pieces is None:
+            return False
+        for arena, memory in pieces:
+            self._release(arena, memory)
+        return True
+
+    def free_space(self):
+        free = largest = 0
+        for arena in self.arenas:
+            with arena.lock:
+                arena.drain()
+                arena_free, arena_largest = arena.free_space()
+            free += arena_free
+            largest = max(largest, arena_largest)
+        return free, largest
+
+    def stats(self):
+        return {
+            'arenas': len(self.arenas),
+            'stolen': sum(arena.borrowed for arena in self.arenas),
+            'remote_frees': sum(arena.remote_frees for arena in self.arenas),
+            'spanned': self.spanned,
+        }
+
+class ArenaDynamicManager(ArenaManager):
+    def __init__(self, total_memory_size, arenas=4, strategy='first_fit', defer=False):
+        size = total_memory_size // arenas
+        sizes = [size] * (arenas - 1) + [total_memory_size - size * (arenas - 1)]
+        super().__init__([DynamicArena(i * size, sizes[i], strategy) for i in range(arenas)], defer=defer)
+        self.total_memory_size = total_memory_size
+
+    def allocate(self, process_id, process_size):
+        if process_size <= 0:
+            return False
+        for i, arena in enumerate(self._search_order()):
+            with arena.lock:
+                arena.drain()
+                block = arena.allocate(process_size)
+                if block is not None and i:
+                    arena.borrowed += 1
+            if block is not None:
+                self._record(process_id, [(arena, block)])
+                return True
+        pieces = self._allocate_spanning(process_size)
+        if pieces is None:
+            return False
+        self._record(process_id, pieces)
+        return True
+
+    def _allocate_spanning(self, process_size):
+        # [(arena, block)] of one free run across neighbouring arenas, or None
+        for arena in self.arenas:
+            arena.lock.acquire()
+        try:
+            run = []  # (arena, start, size) of the run so far
+            length = 0
+            for arena in self.arenas:
+                arena.drain()
+                head = arena.head()
+                if run and length + head >= process_size:
+                    run.append((arena, arena.base, process_size - length))
+                    self.spanned += 1
+                    return [(arena, (arena.free_blocks.take(start, size), size)) for arena, start, size in run]
+                if run and head == arena.size:
+                    if head:
+                        run.append((arena, arena.base, head))
+                        length += head
+                    continue
+                tail = arena.tail()
+                if tail is not None and tail[1] >= process_size:
+                    # Freed since the fast path looked
+                    return [(arena, arena.allocate(process_size))]
+                run, length = ([(arena, *tail)], tail[1]) if tail is not None else ([], 0)
+            return None
+        finally:
+            for arena in self.arenas:
+                arena.lock.release()
+
+class ArenaPagingManager(ArenaManager):
+    def __init__(self, total_memory_size, page_size, arenas=4, defer=False):
+        num_frames = total_memory_size // page_size
+        frames = num_frames // arenas
+        counts = [frames] * (arenas - 1) + [num_frames - frames * (arenas - 1)]
+        super().__init__([PagingArena(i * frames, counts[i]) for i in range(arenas)], defer=defer)
+        self.total_memory_size = total_memory_size
+        self.page_size = page_size
+
+    def allocate(self, process_id, process_size):
+        # Pages need not be contiguous, so a request may take frames from several arenas
+        if process_size <= 0:
+            return False
+        needed = -(-process_size // self.page_size)
+        pieces = []
+        for i, arena in enumerate(self._search_order()):
+            if not needed:
+                break
+            with arena.lock:
+                arena.drain()
+                frames = arena.allocate(needed)
+                if frames is not None and i:
+                    arena.borrowed += 1
+            if frames is not None:
+                pieces.append((arena, frames))
+                needed -= len(frames)
+        if needed:
+            for arena, frames in pieces:
+                self._release(arena, frames)
+            return False
+        self._record(process_id, pieces)
+        return True
+
+    def free_space(self):
+        free, largest = super().free_space()
+        return free * self.page_size, free * self.page_size
+
+def stress(allocate, free, ops, pid_base, live, max_size, cross, handoff, seed, failures, held):
+    # One thread's workload; a `cross` fraction of its frees are handed to whichever thread is next
+    rng = random.Random(seed)
+    mine = []
+    failed = 0
+    for pid in range(pid_base, pid_base + ops):
+        if len(mine) >= live:
+            victim = mine.pop(rng.randrange(len(mine)))
+            if rng.random() < cross:
+                handoff.put(victim)
+                try:
+                    victim = handoff.get_nowait()
+                except queue.Empty:
+                    victim = None
+            if victim is not None:
+                free(victim)
+        if allocate(pid, rng.randint(1, max_size)):
+            mine.append(pid)
+        else:
+            failed += 1
+    failures.append(failed)
+    held.extend(mine)
+
+def run_stress(manager, threads, config):
+    # (ops/s, failed allocations); everything still allocated is freed afterwards, untimed
+    handoff = queue.SimpleQueue()
+    failures = []
+    held = []
+    workers = [threading.Thread(target=stress, args=(manager.allocate, manager.deallocate, config.ops, i * config.ops,
+                                                     config.live, config.max_size, config.cross, handoff,
+                                                     config.seed + i, failures, held))
+               for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    while not handoff.empty():
+        held.append(handoff.get_nowait())
+    for pid in held:
+        manager.deallocate(pid)
+    return threads * config.ops / elapsed, sum(failures)
+
+def baseline(kind, total_memory, page_size):
+    if kind == 'dynamic':
+        memory = asdas.DynamicMemoryAllocation(total_memory)
+    else:
+        memory = asdas.Paging(total_memory, page_size)
+    return Locked(lambda pid, size: memory.allocate(asdas.Process(pid, size)), memory.deallocate)
+
+def arena_manager(kind, total_memory, page_size, arenas, defer):
+    if kind == 'dynamic':
+        return ArenaDynamicManager(total_memory, arenas, defer=defer)
+    return ArenaPagingManager(total_memory, page_size, arenas, defer=defer)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Multi-threaded stress test of the arena managers.')
+    parser.add_argument('--threads', nargs='+', type=int, default=[1, 2, 4, 8])
+    parser.add_argument('--kinds', nargs='+', default=['dynamic', 'paging'], choices=['dynamic', 'paging'])
+    parser.add_argument('--ops', type=int, default=20000, help='allocations per thread')
+    parser.add_argument('--arenas', type=int, help='arenas per manager (default: the thread count)')
+    parser.add_argument('--live', type=int, default=64, help='live allocations per thread')
+    parser.add_argument('--max-size', type=int, default=64, help='largest request in KB')
+    parser.add_argument('--page-size', type=int, default=4)
+    parser.add_argument('--cross', type=float, default=0.2, help='fraction of frees done by another thread')
+    parser.add_argument('--headroom', type=float, default=2.0,
+                        help='total memory as a multiple of what the live allocations can hold; below 1 forces '
+                             'threads to borrow from other arenas')
+    parser.add_argument('--defer', action='store_true', help='queue every free outside the home arena remotely')
+    parser.add_argument('--seed', type=int, default=0)
+    config = parser.parse_args(argv)
+
+    print(f"{'kind':<8} {'threads':>7} {'locked ops/s':>13} {'arena ops/s':>12} {'speedup':>8} "
+          f"{'failures':>13} {'stolen':>7} {'remote':>7} {'spanned':>7} {'drained':>7}")
+    for kind in config.kinds:
+        for threads in config.threads:
+            # Memory for `headroom` times what the live allocations can hold, split across the arenas
+            total_memory = int(config.headroom * threads * config.live * config.max_size)
+            locked, locked_failures = run_stress(baseline(kind, total_memory, config.page_size), threads, config)
+            manager = arena_manager(kind, total_memory, config.page_size, config.arenas or threads, config.defer)
+            empty = manager.free_space()[0]
+            arenas, arena_failures = run_stress(manager, threads, config)
+            # With everything freed, free_space() drains the remote lists and must find all memory back
+            drained = manager.free_space()[0] == empty
+            stats = manager.stats()
+            print(f"{kind:<8} {threads:>7} {locked:>13.0f} {arenas:>12.0f} {arenas / locked:>8.2f} "
+                  f"{f'{locked_failures}/{arena_failures}':>13} {stats['stolen']:>7} {stats['remote_frees']:>7} "
+                  f"{stats['spanned']:>7} {'yes' if drained else 'NO':>7}", flush=True)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,12 @@
-from os import name
+from array import array
+
+from buddy import BuddyAllocator
+from compaction import MODES, Compactor
+from frametable import FrameTable
+from freelist import FreeList
+from ownership import OwnershipIndex
+from placement import STRATEGIES, PartitionIndex, Placement
+from slab import SlabAllocator
 
 
 class Process:
@@ -23,46 +31,47 @@ class Memory:
             else:
                 print(f"Partition {i}: Process {partition['process'].pid}, Memory Required: {partition['memory_required']}")
 
+    def free_space(self):
+        # (free memory, largest free block) for the instrumentation
+        return self.placement.index.free_space()
+
 class FixedSizePartitioning(Memory):
     def __init__(self, total_size, partition_size):
         super().__init__(total_size)
         self.partition_size = partition_size
         self.partitions = [None] * (total_size // partition_size)
+        self.placement = Placement(PartitionIndex([partition_size] * len(self.partitions)))
+        self.owners = OwnershipIndex()  # pid -> partition numbers
 
     def allocate(self, process, strategy='first_fit'):
         remaining_memory = process.memory_required
         allocated_partitions = []
 
         while remaining_memory > 0:
-            partition_found = False
-            if strategy == 'first_fit':
-                for i in range(len(self.partitions)):
-                    if self.partitions[i] is None:
-                        allocation_size = min(remaining_memory, self.partition_size)
-                        self.partitions[i] = {'process': process, 'memory_required': allocation_size}
-                        remaining_memory -= allocation_size
-                        self.free_size -= allocation_size
-                        allocated_partitions.append(i)
-                        partition_found = True
-                        if remaining_memory <= 0:
-                            break
-            # Add best_fit and worst_fit handling as needed
-            
-            if not partition_found:
+            allocation_size = min(remaining_memory, self.partition_size)
+            i = self.placement.find(allocation_size, strategy)
+            if i is None:
                 # Rollback allocation if we can't fully allocate the process
                 for index in allocated_partitions:
                     self.free_size += self.partitions[index]['memory_required']
                     self.partitions[index] = None
+                    self.placement.index.update(index, self.partition_size)
                 return False
+            self.partitions[i] = {'process': process, 'memory_required': allocation_size}
+            self.placement.index.update(i, -1)
+            remaining_memory -= allocation_size
+            self.free_size -= allocation_size
+            allocated_partitions.append(i)
 
+        self.owners.extend(process.pid, allocated_partitions)
         process.status = 'allocated'
         return True
 
     def deallocate(self, pid):
-        for i in range(len(self.partitions)):
-            if self.partitions[i] is not None and self.partitions[i]['process'].pid == pid:
-                self.free_size += self.partitions[i]['memory_required']
-                self.partitions[i] = None
+        for i in self.owners.pop(pid) or ():
+            self.free_size += self.partitions[i]['memory_required']
+            self.partitions[i] = None
+            self.placement.index.update(i, self.partition_size)
         return True
 
 class UnequalSizePartitioning(Memory):
@@ -70,145 +79,193 @@ class UnequalSizePartitioning(Memory):
         super().__init__(total_size)
         self.partition_sizes = partition_sizes
         self.partitions = [None] * len(partition_sizes)
+        self.placement = Placement(PartitionIndex(partition_sizes))
+        self.owners = OwnershipIndex()  # pid -> partition numbers
 
     def allocate(self, process, strategy='best_fit'):
-        remaining_memory = process.memory_required
-        allocated_partitions = []
-
-        while remaining_memory > 0:
-            best_fit_index = -1
-            min_diff = float('inf')
-            for i in range(len(self.partitions)):
-                if self.partitions[i] is None and self.partition_sizes[i] >= remaining_memory:
-                    diff = self.partition_sizes[i] - remaining_memory
-                    if diff < min_diff:
-                        best_fit_index = i
-                        min_diff = diff
-
-            if best_fit_index == -1:
-                # Cannot find a suitable partition for the remaining memory
-                for index in allocated_partitions:
-                    self.free_size += self.partitions[index]['memory_required']
-                    self.partitions[index] = None
-                return False
-
-            allocation_size = min(remaining_memory, self.partition_sizes[best_fit_index])
-            self.partitions[best_fit_index] = {'process': process, 'memory_required': allocation_size}
-            remaining_memory -= allocation_size
-            self.free_size -= allocation_size
-            allocated_partitions.append(best_fit_index)
-
+        # A process must fit in one partition
+        i = self.placement.find(process.memory_required, strategy)
+        if i is None:
+            return False
+
+        self.partitions[i] = {'process': process, 'memory_required': process.memory_required}
+        self.placement.index.update(i, -1)
+        self.owners.add(process.pid, i)
+        self.free_size -= process.memory_required
         process.status = 'allocated'
         return True
 
     def deallocate(self, pid):
-        for i in range(len(self.partitions)):
-            if self.partitions[i] is not None and self.partitions[i]['process'].pid == pid:
-                self.free_size += self.partitions[i]['memory_required']
-                self.partitions[i] = None
+        for i in self.owners.pop(pid) or ():
+            self.free_size += self.partitions[i]['memory_required']
+            self.partitions[i] = None
+            self.placement.index.update(i, self.partition_sizes[i])
         return True
 
 class DynamicMemoryAllocation(Memory):
-    def __init__(self, total_size):
+    def __init__(self, total_size, size_classes=None, compaction=None):
         super().__init__(total_size)
-        self.free_blocks = [(0, total_size)]
+        self.free_blocks = FreeList(total_size)  # address-ordered, coalesced on release
+        self.placement = Placement(self.free_blocks)
+        self.partitions = OwnershipIndex()  # pid -> allocations of that process, oldest first
+        self.block_owners = {}  # start of a block outside the slabs -> its allocation
+        # Optional slab caches for the recurring small sizes, carved from free_blocks
+        self.slabs = SlabAllocator(self.free_blocks, size_classes) if size_classes else None
+        self.compactor = None
+        if compaction:
+            self.compactor = Compactor(self.free_blocks, self._movable, self._movable_size, self._relocate, compaction)
+
+    def free_space(self):
+        return self.free_blocks.free_space()
 
     def allocate(self, process, strategy='first_fit'):
-        remaining_memory = process.memory_required
-        allocated_blocks = []
-
-        while remaining_memory > 0:
-            if strategy == 'first_fit':
-                for i, (start, size) in enumerate(self.free_blocks):
-                    if size >= remaining_memory:
-                        allocation_size = min(remaining_memory, size)
-                        self.free_blocks[i] = (start + allocation_size, size - allocation_size)
-                        if self.free_blocks[i][1] == 0:
-                            del self.free_blocks[i]
-                        allocated_blocks.append((start, allocation_size))
-                        remaining_memory -= allocation_size
-                        break
-            # Add best_fit and worst_fit handling as needed
-
-            if remaining_memory > 0:
-                # Rollback allocation if we can't fully allocate the process
-                for (start, size) in allocated_blocks:
-                    self.free_blocks.append((start, size))
-                self.merge_free_blocks()
+        # A request is placed in a single block, so it fails when no free block is large enough
+        if process.memory_required <= 0:
+            return False
+        start = None
+        if self.slabs is not None:
+            start = self.slabs.allocate(process.memory_required)
+        if start is None:
+            start = self.placement.find(process.memory_required, strategy)
+            if start is None and self.slabs is not None and self.slabs.reclaim():
+                start = self.placement.find(process.memory_required, strategy)
+            if start is None and self.compactor is not None:
+                start = self.compactor.make_room(process.memory_required)
+            if start is None:
                 return False
+            self.free_blocks.take(start, process.memory_required)
 
-        self.partitions.append({'process': process, 'blocks': allocated_blocks})
+        allocation = {'process': process, 'blocks': [(start, process.memory_required)],
+                      'memory_required': process.memory_required}
+        self.partitions.add(process.pid, allocation)
+        if self.slabs is None or start not in self.slabs:
+            self.block_owners[start] = allocation
         self.free_size -= process.memory_required
         process.status = 'allocated'
         return True
 
     def deallocate(self, pid):
-        for i, partition in enumerate(self.partitions):
-            if partition['process'].pid == pid:
-                for (start, size) in partition['blocks']:
-                    self.free_blocks.append((start, size))
-                self.partitions.pop(i)
-                self.free_size += partition['process'].memory_required
-                self.merge_free_blocks()
-                return True
-        return False
-
-    def merge_free_blocks(self):
-        self.free_blocks.sort()
-        merged_blocks = []
-        for block in self.free_blocks:
-            if not merged_blocks or merged_blocks[-1][0] + merged_blocks[-1][1] != block[0]:
-                merged_blocks.append(block)
+        partition = self.partitions.pop_oldest(pid)
+        if partition is None:
+            return False
+        for (start, size) in partition['blocks']:
+            if self.slabs is not None and start in self.slabs:
+                self.slabs.free(start)
             else:
-                merged_blocks[-1] = (merged_blocks[-1][0], merged_blocks[-1][1] + block[1])
-        self.free_blocks = merged_blocks
+                del self.block_owners[start]
+                self.free_blocks.release(start, size)
+        self.free_size += partition['process'].memory_required
+        if self.compactor is not None:
+            self.compactor.step()
+        return True
+
+    def _movable(self):
+        return ((start, allocation['memory_required']) for start, allocation in self.block_owners.items())
+
+    def _movable_size(self, start):
+        allocation = self.block_owners.get(start)
+        return None if allocation is None else allocation['memory_required']
+
+    def _relocate(self, moves):
+        allocations = [self.block_owners.pop(old) for old, new, size in moves]
+        for (old, new, size), allocation in zip(moves, allocations):
+            allocation['blocks'] = [(new, size)]
+            self.block_owners[new] = allocation
+
+    def display_status(self):
+        print(f"Total Memory: {self.total_size}")
+        print(f"Free Memory: {self.free_size}")
+        print("Partitions:")
+        for allocations in self.partitions.values():
+            for partition in allocations:
+                blocks = ', '.join(f"{start}-{start + size}" for start, size in partition['blocks'])
+                print(f"Process {partition['process'].pid}: {blocks}, Memory Required: {partition['memory_required']}")
+        print("Free Blocks:")
+        for start, size in self.free_blocks:
+            print(f"{start}-{start + size}")
+        if self.slabs is not None:
+            stats = self.slabs.stats()
+            print(f"Slabs: {stats['slabs']}, Cached: {stats['cached']}, Hit Rate: {stats['hit_rate']:.1%}")
+        if self.compactor is not None:
+            stats = self.compactor.stats()
+            print(f"Compactions: {stats['compactions'] + stats['steps']}, Blocks Moved: {stats['moves']}, Units Moved: {stats['moved']}")
 
 class BuddySystem(Memory):
-    def __init__(self, total_size):
+    def __init__(self, total_size, min_block_size=1):
         super().__init__(total_size)
-        self.buddy_tree = {}  # Placeholder for buddy system structure
-
-    def allocate(self, process):
-        # Placeholder for buddy system allocation logic
-        pass
+        self.buddy_tree = BuddyAllocator(total_size, min_block_size)
+        self.free_size = self.buddy_tree.free_size
+        self.blocks = OwnershipIndex()  # pid -> (start, process) of each of its blocks
+
+    def free_space(self):
+        return self.buddy_tree.free_space()
+
+    def allocate(self, process, strategy=None):
+        # Block sizes are fixed by the buddy rules, so there is no placement strategy to choose
+        start = self.buddy_tree.allocate(process.memory_required)
+        if start is None:
+            return False
+        self.blocks.add(process.pid, (start, process))
+        self.free_size = self.buddy_tree.free_size
+        process.status = 'allocated'
+        return True
 
     def deallocate(self, pid):
-        # Placeholder for buddy system deallocation logic
-        pass
+        blocks = self.blocks.pop(pid)
+        if blocks is None:
+            return False
+        for start, process in blocks:
+            self.buddy_tree.free(start)
+        self.free_size = self.buddy_tree.free_size
+        return True
+
+    def display_status(self):
+        owners = dict(block for blocks in self.blocks.values() for block in blocks)
+        print(f"Total Memory: {self.total_size}")
+        print(f"Free Memory: {self.free_size}")
+        print("Blocks:")
+        for start, size, is_free in self.buddy_tree.blocks():
+            if is_free:
+                print(f"Block {start}-{start + size}: Free")
+            else:
+                print(f"Block {start}-{start + size}: Process {owners[start].pid}, Memory Required: {owners[start].memory_required}")
 
 class Paging(Memory):
     def __init__(self, total_size, page_size):
         super().__init__(total_size)
         self.page_size = page_size
-        self.frames = [None] * (total_size // page_size)
+        self.frames = FrameTable(total_size // page_size)
         self.page_table = {}
 
-    def allocate(self, process):
+    def free_space(self):
+        free, largest = self.frames.free_space()
+        return free * self.page_size, largest * self.page_size
+
+    def allocate(self, process, strategy=None):
         num_pages = -(-process.memory_required // self.page_size)  # Ceil division
-        allocated_frames = []
-        for i in range(len(self.frames)):
-            if self.frames[i] is None:
-                allocated_frames.append(i)
-                if len(allocated_frames) == num_pages:
-                    break
-        if len(allocated_frames) == num_pages:
-            for frame in allocated_frames:
-                self.frames[frame] = process
-            self.page_table[process.pid] = allocated_frames
-            process.status = 'allocated'
-            self.free_size -= num_pages * self.page_size
-            return True
-        return False
+        allocated_frames = self.frames.allocate(num_pages)
+        if allocated_frames is None:
+            return False
+        self.page_table.setdefault(process.pid, array('l')).extend(allocated_frames)
+        process.status = 'allocated'
+        self.free_size -= num_pages * self.page_size
+        return True
 
     def deallocate(self, pid):
         if pid in self.page_table:
             frames = self.page_table.pop(pid)
-            for frame in frames:
-                self.frames[frame] = None
+            self.frames.free(frames)
             self.free_size += len(frames) * self.page_size
             return True
         return False
 
+    def display_status(self):
+        print(f"Total Memory: {self.total_size}")
+        print(f"Free Memory: {self.free_size}")
+        print("Frames:")
+        for first, last, pid in self.frames.layout(self.page_table):
+            print(f"Frames {first}-{last}: {'Free' if pid is None else f'Process {pid}'}")
+
 def main():
     memory = None
 
@@ -231,7 +288,13 @@ def main():
             memory = UnequalSizePartitioning(total_size, partition_sizes)
         elif choice == 3:
             total_size = int(input("Enter total memory size: "))
-            memory = DynamicMemoryAllocation(total_size)
+            size_classes = input("Enter slab size classes (comma-separated, blank for none): ")
+            compaction = input(f"Enter compaction mode ({', '.join(MODES)}, blank for none): ")
+            if compaction and compaction not in MODES:
+                print("Unknown compaction mode!")
+                continue
+            memory = DynamicMemoryAllocation(total_size, [int(size) for size in size_classes.split(',') if size.strip()],
+                                             compaction or None)
         elif choice == 4:
             total_size = int(input("Enter total memory size: "))
             memory = BuddySystem(total_size)
@@ -256,8 +319,10 @@ def main():
                 pid = input("Enter process ID: ")
                 memory_required = int(input("Enter memory required: "))
                 process = Process(pid, memory_required)
-                strategy = input("Enter allocation strategy (first_fit, best_fit, worst_fit): ")
-                if not memory.allocate(process, strategy):
+                strategy = input(f"Enter allocation strategy ({', '.join(STRATEGIES)}): ") or 'first_fit'
+                if strategy not in STRATEGIES:
+                    print("Unknown allocation strategy!")
+                elif not memory.allocate(process, strategy):
                     print("Allocation failed!")
                 else:
                     print("Process allocated successfully.")
@@ -276,5 +341,5 @@ def main():
             else:
                 print("Invalid choice!")
 
-if name == "main":
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,284 @@
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+import asdas
+import dar
+import fixedsized
+import fixxed
+from instrument import Instrumented
+from placement import PartitionIndex, Placement
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Memory Management'))
+import Memory
+
+# Benchmark runner for the allocators in this folder, e.g.
+#   python bench.py --sizes 1000 10000 100000 --allocators asdas.dynamic Memory.dynamic.best
+#
+# Every allocator replays the same seeded request stream. The stream keeps the live memory under
+# --occupancy of the total so that paging never runs out of frames; the allocators without a free
+# operation (fixxed, fixedsized) only see the allocation requests, and fixxed gets them as one
+# batch. Reported per allocator: throughput, p50/p99 latency of a single allocate/free call,
+# failed allocations and peak Python memory (measured in a second, tracemalloc-instrumented pass).
+# With --stats a third pass replays the stream through instrument.Instrumented and adds the final
+# external and internal fragmentation, utilisation and failure rate; --series DIR also writes the
+# sampled time series of every run to DIR/<allocator>-<requests>.csv.
+
+def make_stream(num_requests, total_memory, max_size, occupancy=0.7, seed=0, recurring=0):
+    # With recurring > 0 every request size is drawn from that many fixed sizes
+    rng = random.Random(seed)
+    mix = [rng.randint(1, max_size) for _ in range(recurring)]
+    ops = []
+    live = {}
+    live_pids = []
+    used = 0
+    for pid in range(num_requests):
+        size = rng.choice(mix) if mix else rng.randint(1, max_size)
+        while live_pids and (used + size > total_memory * occupancy or rng.random() < 0.4):
+            index = rng.randrange(len(live_pids))
+            victim = live_pids[index]
+            live_pids[index] = live_pids[-1]
+            live_pids.pop()
+            used -= live.pop(victim)
+            ops.append(('free', victim, 0))
+        live[pid] = size
+        live_pids.append(pid)
+        used += size
+        ops.append(('alloc', pid, size))
+    return ops
+
+def partition_sizes(num_partitions, max_size, seed=0):
+    rng = random.Random(seed + 1)
+    return [rng.randint(max_size // 2, max_size * 2) for _ in range(num_partitions)]
+
+# Each factory gets the benchmark configuration and returns
+# (allocate(pid, size), free(pid) or None, free_space() -> (free, largest free block))
+
+def fixxed_target(function):
+    # The fixxed functions place a whole list of processes per call, so they are timed as one batch.
+    # The index is built once and kept up to date across calls for the passes that place one
+    # request per call.
+    def factory(config):
+        partitions = partition_sizes(config.partitions, config.max_size)
+        placement = Placement(PartitionIndex(partitions))
+        return (lambda sizes: function(partitions, sizes, placement).count(-1)), None, placement.index.free_space
+    factory.batch = True
+    return factory
+
+def fixedsized_target(method):
+    def factory(config):
+        manager = fixedsized.MemoryManager(partition_sizes(config.partitions, config.max_size))
+        allocate = getattr(manager, method)
+
+        def alloc(pid, size):
+            return allocate([size]) == 0
+        return alloc, None, manager.free_space
+    return factory
+
+def asdas_target(cls, strategy, *args, **options):
+    def factory(config):
+        memory = cls(*args_for(config, args), **options)
+        if strategy is None:
+            allocate = lambda pid, size: bool(memory.allocate(asdas.Process(pid, size)))
+        else:
+            allocate = lambda pid, size: bool(memory.allocate(asdas.Process(pid, size), strategy))
+        return allocate, memory.deallocate, memory.free_space
+    # Its deallocate releases one allocation of the pid per call, the others all of them
+    factory.free_oldest = cls is asdas.DynamicMemoryAllocation
+    return factory
+
+def manager_target(cls, method, free_method, *args, **options):
+    def factory(config):
+        manager = cls(*args_for(config, args), **options)
+        return getattr(manager, method), getattr(manager, free_method), manager.free_space
+    return factory
+
+class Headless:
+    # Stands in for tkinter's messagebox on a dar manager, so failed allocations do not open a dialog
+    @staticmethod
+    def showerror(title, message):
+        pass
+
+def dar_target(cls, *args):
+    def factory(config):
+        manager = cls(*args_for(config, args))
+        manager.messagebox = Headless
+        return manager.allocate, manager.deallocate, manager.free_space
+    return factory
+
+def args_for(config, names):
+    # Turns symbolic constructor arguments into values for this configuration
+    values = {
+        'total': config.total_memory,
+        'partition_size': config.max_size,
+        'partition_sizes': partition_sizes(config.partitions, config.max_size),
+        'page_size': config.page_size,
+        'size_classes': [1 << k for k in range(config.max_size.bit_length() + 1)],
+    }
+    return [values[name] for name in names]
+
+TARGETS = {
+    'fixxed.first_fit': fixxed_target(fixxed.first_fit),
+    'fixxed.best_fit': fixxed_target(fixxed.best_fit),
+    'fixxed.worst_fit': fixxed_target(fixxed.worst_fit),
+    'fixedsized.first_fit': fixedsized_target('first_fit'),
+    'fixedsized.best_fit': fixedsized_target('best_fit'),
+    'fixedsized.worst_fit': fixedsized_target('worst_fit'),
+    'asdas.fixed': asdas_target(asdas.FixedSizePartitioning, 'first_fit', 'total', 'partition_size'),
+    'asdas.unequal': asdas_target(asdas.UnequalSizePartitioning, 'best_fit', 'total', 'partition_sizes'),
+    'asdas.dynamic': asdas_target(asdas.DynamicMemoryAllocation, 'first_fit', 'total'),
+    'asdas.dynamic.slab': asdas_target(asdas.DynamicMemoryAllocation, 'first_fit', 'total', 'size_classes'),
+    'asdas.dynamic.compact': asdas_target(asdas.DynamicMemoryAllocation, 'first_fit', 'total', compaction='on_demand'),
+    'asdas.dynamic.background': asdas_target(asdas.DynamicMemoryAllocation, 'first_fit', 'total',
+                                             compaction='background'),
+    'asdas.buddy': asdas_target(asdas.BuddySystem, None, 'total'),
+    'asdas.paging': asdas_target(asdas.Paging, None, 'total', 'page_size'),
+    'dar.fixed': dar_target(dar.FixedSizePartitioning, 'total', 'partition_size'),
+    'dar.buddy': dar_target(dar.BuddySystem, 'total'),
+    'Memory.partitions.first': manager_target(Memory.MemoryManager, 'allocate_first_fit', 'deallocate', 'partition_sizes'),
+    'Memory.partitions.best': manager_target(Memory.MemoryManager, 'allocate_best_fit', 'deallocate', 'partition_sizes'),
+    'Memory.partitions.worst': manager_target(Memory.MemoryManager, 'allocate_worst_fit', 'deallocate', 'partition_sizes'),
+    'Memory.dynamic.first': manager_target(Memory.DynamicMemoryManager, 'allocate_first_fit', 'deallocate', 'total'),
+    'Memory.dynamic.best': manager_target(Memory.DynamicMemoryManager, 'allocate_best_fit', 'deallocate', 'total'),
+    'Memory.dynamic.worst': manager_target(Memory.DynamicMemoryManager, 'allocate_worst_fit', 'deallocate', 'total'),
+    'Memory.dynamic.slab': manager_target(Memory.DynamicMemoryManager, 'allocate_first_fit', 'deallocate', 'total',
+                                          'size_classes'),
+    'Memory.dynamic.compact': manager_target(Memory.DynamicMemoryManager, 'allocate_first_fit', 'deallocate', 'total',
+                                             compaction='on_demand'),
+    'Memory.dynamic.background': manager_target(Memory.DynamicMemoryManager, 'allocate_first_fit', 'deallocate',
+                                                'total', compaction='background'),
+    'Memory.buddy': manager_target(Memory.BuddyMemoryManager, 'allocate_memory', 'deallocate_memory', 'total'),
+    'Memory.paging': manager_target(Memory.PagingMemoryManager, 'allocate_memory', 'deallocate_memory', 'total',
+                                    'page_size'),
+}
+
+def run(factory, config, ops):
+    allocate, free, _ = factory(config)
+    if getattr(factory, 'batch', False):
+        return run_batch(allocate, ops)
+    latencies = array('q')
+    failures = 0
+    clock = time.perf_counter_ns
+    started = clock()
+    for op, pid, size in ops:
+        if op == 'alloc':
+            before = clock()
+            ok = allocate(pid, size)
+            latencies.append(clock() - before)
+            if not ok:
+                failures += 1
+        elif free is not None:
+            before = clock()
+            free(pid)
+            latencies.append(clock() - before)
+    elapsed = (clock() - started) / 1e9
+    return latencies, failures, elapsed
+
+def run_batch(place, ops):
+    # One call for the whole stream; every request is credited with the mean latency
+    sizes = [size for op, pid, size in ops if op == 'alloc']
+    started = time.perf_counter_ns()
+    failures = place(sizes)
+    elapsed = time.perf_counter_ns() - started
+    latencies = array('q', [elapsed // max(1, len(sizes))]) * len(sizes)
+    return latencies, failures, elapsed / 1e9
+
+def peak_memory(factory, config, ops):
+    tracemalloc.start()
+    try:
+        run(factory, config, ops)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def fragmentation(factory, config, ops, series_path=None):
+    # Final Instrumented snapshot of the stream; batch targets are fed one request per call
+    allocate, free, free_space = factory(config)
+    if getattr(factory, 'batch', False):
+        place = allocate
+        allocate = lambda pid, size: place([size]) == 0
+    target = Instrumented(allocate, free, free_space, config.sample_every,
+                          free_oldest=getattr(factory, 'free_oldest', False))
+    for op, pid, size in ops:
+        if op == 'alloc':
+            target.allocate(pid, size)
+        elif free is not None:
+            target.free(pid)
+    target.sample()
+    if series_path is not None:
+        target.stats.write_series(series_path)
+    return target.snapshot()
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+def benchmark(name, config, ops):
+    factory = TARGETS[name]
+    latencies, failures, elapsed = run(factory, config, ops)
+    ordered = sorted(latencies)
+    stats = None
+    if config.stats or config.series:
+        series_path = None
+        if config.series:
+            series_path = os.path.join(config.series, f'{name}-{len(ops)}.csv')
+        stats = fragmentation(factory, config, ops, series_path)
+    return {
+        'allocator': name,
+        'calls': len(latencies),
+        'ops_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_us': percentile(ordered, 0.50) / 1000,
+        'p99_us': percentile(ordered, 0.99) / 1000,
+        'failures': failures,
+        'peak_kb': peak_memory(factory, config, ops) / 1024 if config.memory else None,
+        'stats': stats,
+    }
+
+def format_row(result):
+    peak = '-' if result['peak_kb'] is None else f"{result['peak_kb']:.0f}"
+    row = (f"{result['allocator']:<24} {result['calls']:>9} {result['ops_per_sec']:>12.0f} "
+           f"{result['p50_us']:>9.2f} {result['p99_us']:>9.2f} {result['failures']:>9} {peak:>9}")
+    stats = result['stats']
+    if stats is not None:
+        row += (f" {stats['external_fragmentation']:>9.1%} {stats['internal_fragmentation']:>9.1%} "
+                f"{stats['utilisation']:>9.1%} {stats['failure_rate']:>9.1%}")
+    return row
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the allocators with synthetic request streams.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000], help='requests per stream')
+    parser.add_argument('--allocators', nargs='+', default=sorted(TARGETS), choices=sorted(TARGETS), metavar='NAME')
+    parser.add_argument('--partitions', type=int, default=1000, help='partitions for the partitioned allocators')
+    parser.add_argument('--max-size', type=int, default=64, help='largest request in KB')
+    parser.add_argument('--page-size', type=int, default=4)
+    parser.add_argument('--occupancy', type=float, default=0.7, help='cap on live memory as a fraction of the total')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--recurring', type=int, default=0, metavar='K', help='draw request sizes from K fixed sizes')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='skip the tracemalloc pass')
+    parser.add_argument('--stats', action='store_true', help='add fragmentation, utilisation and failure rate')
+    parser.add_argument('--series', metavar='DIR', help='write a CSV time series per allocator and size')
+    parser.add_argument('--sample-every', type=int, default=100, help='operations between time series samples')
+    config = parser.parse_args(argv)
+    if config.series:
+        os.makedirs(config.series, exist_ok=True)
+    # Total memory is sized to the partitioned layouts so every allocator models the same machine
+    config.total_memory = config.partitions * config.max_size
+
+    header = f"{'allocator':<24} {'calls':>9} {'ops/sec':>12} {'p50 us':>9} {'p99 us':>9} {'failures':>9} {'peak KB':>9}"
+    if config.stats or config.series:
+        header += f" {'ext frag':>9} {'int frag':>9} {'util':>9} {'fail':>9}"
+    print(header)
+    for num_requests in config.sizes:
+        print(f'-- {num_requests} requests')
+        ops = make_stream(num_requests, config.total_memory, config.max_size, config.occupancy, config.seed,
+                          config.recurring)
+        for name in config.allocators:
+            print(format_row(benchmark(name, config, ops)), flush=True)
+
+if __name__ == '__main__':
+    sys.exit(main())
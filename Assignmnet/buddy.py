@@ -0,0 +1,73 @@
+# Power-of-two buddy allocator shared by the BuddySystem classes.
+#
+# Memory is cut into the largest aligned power-of-two roots that fit (a 12 KB machine gets an 8 KB
+# root at 0 and a 4 KB root at 8). There is one free set per order; a block of order k starting at
+# `start` has its buddy at start ^ 2**k, so freeing a block merges it with its buddy for as long
+# as the buddy is free. Allocation and free both touch at most one block per order.
+
+class BuddyAllocator:
+    def __init__(self, total_size, min_block_size=1):
+        self.min_order = max(0, (min_block_size - 1).bit_length())
+        self.total_size = total_size - total_size % (1 << self.min_order)
+        self.max_order = max(self.min_order, self.total_size.bit_length() - 1)
+        self.free_lists = [set() for _ in range(self.max_order + 1)]
+        self.allocated = {}  # block start -> order
+        self.free_size = self.total_size
+        start = 0
+        for order in range(self.max_order, self.min_order - 1, -1):
+            if self.total_size & (1 << order):
+                self.free_lists[order].add(start)
+                start += 1 << order
+
+    def order_for(self, size):
+        return max(self.min_order, (size - 1).bit_length())
+
+    def allocate(self, size):
+        # Start address of a block of at least size, or None; empty requests get nothing
+        if size <= 0:
+            return None
+        order = self.order_for(size)
+        current = order
+        while current <= self.max_order and not self.free_lists[current]:
+            current += 1
+        if current > self.max_order:
+            return None
+        start = self.free_lists[current].pop()
+        while current > order:
+            current -= 1
+            self.free_lists[current].add(start + (1 << current))
+        self.allocated[start] = order
+        self.free_size -= 1 << order
+        return start
+
+    def free(self, start):
+        order = self.allocated.pop(start)
+        self.free_size += 1 << order
+        while order < self.max_order:
+            buddy = start ^ (1 << order)
+            free_list = self.free_lists[order]
+            if buddy not in free_list:
+                break
+            free_list.remove(buddy)
+            start = min(start, buddy)
+            order += 1
+        self.free_lists[order].add(start)
+        return start
+
+    def free_space(self):
+        # (total free, largest free block)
+        for order in range(self.max_order, -1, -1):
+            if self.free_lists[order]:
+                return self.free_size, 1 << order
+        return self.free_size, 0
+
+    def block_size(self, start):
+        return 1 << self.allocated[start]
+
+    def blocks(self):
+        # (start, size, is_free) for every block, in address order
+        blocks = [(start, 1 << order, False) for start, order in self.allocated.items()]
+        for order, free_list in enumerate(self.free_lists):
+            blocks.extend((start, 1 << order, True) for start in free_list)
+        blocks.sort()
+        return blocks
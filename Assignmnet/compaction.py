@@ -0,0 +1,138 @@
+from heapq import merge
+
+# Compaction for the variable-partition allocators.
+#
+# A Compactor works on the allocator's FreeList plus three callbacks from the allocator:
+# movable() lists the (start, size) of every block that may be relocated, movable_size(start)
+# answers the same for one address (None when nothing movable starts there), and
+# relocate(moves) updates the owner bookkeeping after blocks were moved, with moves a list of
+# (old start, new start, size). Occupied memory that is not a movable block (slabs, for
+# instance) is pinned: no window is planned across it.
+#
+#   on_demand   when an allocation fails although enough memory is free, make_room() picks the
+#               window of neighbouring extents that holds enough free memory while containing the
+#               fewest allocated units, slides only the blocks inside it down to the window's
+#               start and returns the hole left at its top
+#   background  additionally, after every free, step() slides up to `budget` units of blocks down
+#               into the lowest hole while external fragmentation is above `threshold`, so the
+#               cost of a full compaction is spread over many calls
+#
+# Relocation cost is recorded as the number of blocks moved and units copied.
+
+MODES = ['on_demand', 'background']
+
+class Compactor:
+    def __init__(self, free_blocks, movable, movable_size, relocate, mode='on_demand', threshold=0.5, budget=64):
+        if mode not in MODES:
+            raise ValueError(f"Unknown compaction mode: {mode}")
+        self.free_blocks = free_blocks
+        self.movable = movable
+        self.movable_size = movable_size
+        self.relocate = relocate
+        self.mode = mode
+        self.threshold = threshold
+        self.budget = budget
+        self.compactions = 0  # successful make_room calls
+        self.steps = 0  # background steps that moved something
+        self.moves = 0
+        self.moved = 0  # units copied
+
+    def plan(self, size):
+        # (units to move, window start, blocks in the window) of the cheapest window, or None
+        extents = merge(((start, length, True) for start, length in self.free_blocks),
+                        ((start, length, False) for start, length in sorted(self.movable())))
+        best = None
+        segment = []
+        end = None
+        for extent in extents:
+            if end is not None and extent[0] != end:
+                best = self._cheapest(segment, size, best)
+                segment = []
+            segment.append(extent)
+            end = extent[0] + extent[1]
+        best = self._cheapest(segment, size, best)
+        if best is None:
+            return None
+        cost, segment, first, last = best
+        return cost, segment[first][0], [(start, length) for start, length, is_free in segment[first:last + 1]
+                                         if not is_free]
+
+    def _cheapest(self, segment, size, best):
+        # Two pointers over one run of extents without pinned memory in between
+        first = 0
+        free = used = 0
+        for last, (start, length, is_free) in enumerate(segment):
+            if is_free:
+                free += length
+            else:
+                used += length
+                continue
+            while first < last:
+                start_first, length_first, first_free = segment[first]
+                if first_free and free - length_first < size:
+                    break
+                if first_free:
+                    free -= length_first
+                else:
+                    used -= length_first
+                first += 1
+            if free >= size and (best is None or used < best[0]):
+                best = (used, segment, first, last)
+        return best
+
+    def make_room(self, size):
+        # Start of a free extent of at least size after compacting the cheapest window, or None
+        if self.free_blocks.free_size < size:
+            return None
+        found = self.plan(size)
+        if found is None:
+            return None
+        cost, address, blocks = found
+        moves = []
+        for start, length in blocks:
+            self._move(start, address, length, moves)
+            address += length
+        self.relocate(moves)
+        self.compactions += 1
+        return address
+
+    def step(self):
+        # One background increment; the number of units moved
+        free, largest = self.free_blocks.free_space()
+        if self.mode != 'background' or not free or 1 - largest / free <= self.threshold:
+            return 0
+        hole = self.free_blocks.ceiling(0)
+        moves = []
+        moved = 0
+        while hole is not None and moved < self.budget:
+            address, hole_size = hole
+            length = self.movable_size(address + hole_size)
+            if length is None:
+                # Pinned memory or the end of memory; carry on from the next hole
+                hole = self.free_blocks.ceiling(address + hole_size)
+                continue
+            self._move(address + hole_size, address, length, moves)
+            moved += length
+            # The hole moved up past the block and merged with whatever was free above it
+            hole = (address + length, self.free_blocks.sizes[address + length])
+        if moves:
+            self.relocate(moves)
+            self.steps += 1
+        return moved
+
+    def _move(self, start, address, length, moves):
+        if start == address:
+            return
+        self.free_blocks.release(start, length)
+        self.free_blocks.take(address, length)
+        moves.append((start, address, length))
+        self.moves += 1
+        self.moved += length
+
+    def stats(self):
+        return {
+            'compactions': self.compactions,
+            'steps': self.steps,
+            'moves': self.moves,
+            'moved': self.moved,
+        }
@@ -1,17 +1,36 @@
 import tkinter as tk
 from tkinter import messagebox
+
+from buddy import BuddyAllocator
+from extentmap import ExtentMap
+from frametable import FrameTable
+from freelist import FreeList
+from ownership import OwnershipIndex
+from placement import STRATEGIES, PartitionIndex, Placement
+
 class MemoryManagement:
     def __init__(self, total_size):
         self.total_size = total_size
-        self.memory = [None] * total_size
+        self.memory = ExtentMap(total_size)  # owner of each unit, stored as runs
+        self.messagebox = messagebox  # where failed allocations are reported; replaceable per instance
 
     def display_memory(self):
-        print("Memory Allocation:")
-        for i in range(self.total_size):
-            if self.memory[i] is None:
-                print(f"[{i}]: Free")
+        memory_status = "Memory Allocation:\n"
+        for start, end, process_id in self.memory.runs():
+            if process_id is None:
+                memory_status += f"[{start}-{end - 1}]: Free\n"
             else:
-                print(f"[{i}]: Process {self.memory[i]}")
+                memory_status += f"[{start}-{end - 1}]: Process {process_id}\n"
+        return memory_status
+
+    def free_space(self):
+        # (free units, largest free run) for the instrumentation
+        free = largest = 0
+        for start, end, process_id in self.memory.runs():
+            if process_id is None:
+                free += end - start
+                largest = max(largest, end - start)
+        return free, largest
 
 class FixedSizePartitioning(MemoryManagement):
     def __init__(self, total_size, partition_size):
@@ -27,30 +46,114 @@ class UnequalSizePartitioning(MemoryManagement):
     def __init__(self, total_size, partition_sizes):
         super().__init__(total_size)
         self.partitions = partition_sizes
+        self.starts = [sum(partition_sizes[:i]) for i in range(len(partition_sizes))]
+        self.occupants = [None] * len(partition_sizes)
+        self.owners = OwnershipIndex()  # process id -> partition numbers
+        # Free capacity per partition (-1 once occupied)
+        self.placement = Placement(PartitionIndex(partition_sizes))
+
+    def free_space(self):
+        return self.placement.index.free_space()
 
     def allocate(self, process_id, size, strategy='first_fit'):
-        # Implement allocation strategy based on partition sizes
-        pass
+        # A process must fit in one partition
+        i = self.placement.find(size, strategy)
+        if i is None:
+            self.messagebox.showerror("Error", f"Failed to allocate memory for Process {process_id}")
+            return False
+        self.occupants[i] = process_id
+        self.placement.index.update(i, -1)
+        self.memory.assign(self.starts[i], self.partitions[i], process_id)
+        self.owners.add(process_id, i)
+        return True
+
+    def deallocate(self, process_id):
+        for i in self.owners.pop(process_id) or ():
+            self.occupants[i] = None
+            self.placement.index.update(i, self.partitions[i])
+            self.memory.free(self.starts[i], self.partitions[i])
 
 class DynamicMemoryAllocation(MemoryManagement):
+    def __init__(self, total_size):
+        super().__init__(total_size)
+        self.free_blocks = FreeList(total_size)  # address-ordered, coalesced on release
+        self.placement = Placement(self.free_blocks)
+        self.process_blocks = OwnershipIndex()  # process id -> (start, size) of its blocks
+
+    def free_space(self):
+        return self.free_blocks.free_space()
+
     def allocate(self, process_id, size, strategy='first_fit'):
-        # Implement first fit, best fit, or worst fit allocation strategy
-        pass
+        start = self.placement.find(size, strategy) if size > 0 else None
+        if start is None:
+            self.messagebox.showerror("Error", f"Failed to allocate memory for Process {process_id}")
+            return False
+        self.free_blocks.take(start, size)
+        self.memory.assign(start, size, process_id)
+        self.process_blocks.add(process_id, (start, size))
+        return True
+
+    def deallocate(self, process_id):
+        for start, size in self.process_blocks.pop(process_id) or ():
+            self.free_blocks.release(start, size)
+            self.memory.free(start, size)
 
 class BuddySystem(MemoryManagement):
-    def allocate(self, process_id, size):
-        # Implement buddy system allocation
-        pass
+    def __init__(self, total_size, min_block_size=1):
+        super().__init__(total_size)
+        self.allocator = BuddyAllocator(total_size, min_block_size)
+        self.process_blocks = OwnershipIndex()  # process id -> start addresses of its blocks
+
+    def free_space(self):
+        return self.allocator.free_space()
+
+    def allocate(self, process_id, size, strategy=None):
+        start = self.allocator.allocate(size)
+        if start is None:
+            self.messagebox.showerror("Error", f"Failed to allocate memory for Process {process_id}")
+            return False
+        self.memory.assign(start, self.allocator.block_size(start), process_id)
+        self.process_blocks.add(process_id, start)
+        return True
+
+    def deallocate(self, process_id):
+        for start in self.process_blocks.pop(process_id) or ():
+            self.memory.free(start, self.allocator.block_size(start))
+            self.allocator.free(start)
+
+    def display_memory(self):
+        memory_status = "Memory Allocation:\n"
+        for start, size, is_free in self.allocator.blocks():
+            owner = "Free" if is_free else f"Process {self.memory[start]}"
+            memory_status += f"[{start}-{start + size - 1}]: {owner}\n"
+        return memory_status
 
 class Paging(MemoryManagement):
     def __init__(self, total_size, page_size):
         super().__init__(total_size)
         self.page_size = page_size
-        self.page_table = {}
+        self.frames = FrameTable(total_size // page_size)
+        self.page_table = {}  # process id -> frames, in page order
+
+    def free_space(self):
+        free, largest = self.frames.free_space()
+        return free * self.page_size, largest * self.page_size
 
     def allocate(self, process_id, size):
-        # Implement paging allocation
-        pass
+        frames = self.frames.allocate(-(-size // self.page_size)) if size > 0 else None
+        if frames is None:
+            self.messagebox.showerror("Error", f"Failed to allocate memory for Process {process_id}")
+            return False
+        self.page_table.setdefault(process_id, []).extend(frames)
+        for frame in frames:
+            self.memory.assign(frame * self.page_size, self.page_size, process_id)
+        return True
+
+    def deallocate(self, process_id):
+        frames = self.page_table.pop(process_id, ())
+        self.frames.free(frames)
+        for frame in frames:
+            self.memory.free(frame * self.page_size, self.page_size)
 
 
 class MemoryManagementSimulator:
@@ -72,37 +175,43 @@ class MemoryManagementSimulator:
         self.technique_menu = tk.OptionMenu(self.root, self.technique_var, "fixed", "unequal", "dynamic", "buddy", "paging")
         self.technique_menu.grid(row=1, column=1)
 
+        self.strategy_label = tk.Label(self.root, text="Allocation Strategy:")
+        self.strategy_label.grid(row=2, column=0)
+        self.strategy_var = tk.StringVar(value="first_fit")
+        self.strategy_menu = tk.OptionMenu(self.root, self.strategy_var, *STRATEGIES)
+        self.strategy_menu.grid(row=2, column=1)
+
         self.partition_label = tk.Label(self.root, text="Partition Size (fixed/unequal):")
-        self.partition_label.grid(row=2, column=0)
+        self.partition_label.grid(row=3, column=0)
         self.partition_entry = tk.Entry(self.root)
-        self.partition_entry.grid(row=2, column=1)
+        self.partition_entry.grid(row=3, column=1)
 
         self.page_size_label = tk.Label(self.root, text="Page Size (paging):")
-        self.page_size_label.grid(row=3, column=0)
+        self.page_size_label.grid(row=4, column=0)
         self.page_size_entry = tk.Entry(self.root)
-        self.page_size_entry.grid(row=3, column=1)
+        self.page_size_entry.grid(row=4, column=1)
 
         self.process_id_label = tk.Label(self.root, text="Process ID:")
-        self.process_id_label.grid(row=4, column=0)
+        self.process_id_label.grid(row=5, column=0)
         self.process_id_entry = tk.Entry(self.root)
-        self.process_id_entry.grid(row=4, column=1)
+        self.process_id_entry.grid(row=5, column=1)
 
         self.process_size_label = tk.Label(self.root, text="Process Size:")
-        self.process_size_label.grid(row=5, column=0)
+        self.process_size_label.grid(row=6, column=0)
         self.process_size_entry = tk.Entry(self.root)
-        self.process_size_entry.grid(row=5, column=1)
+        self.process_size_entry.grid(row=6, column=1)
 
         self.allocate_button = tk.Button(self.root, text="Allocate", command=self.allocate_memory)
-        self.allocate_button.grid(row=6, column=0)
+        self.allocate_button.grid(row=7, column=0)
 
         self.deallocate_button = tk.Button(self.root, text="Deallocate", command=self.deallocate_memory)
-        self.deallocate_button.grid(row=6, column=1)
+        self.deallocate_button.grid(row=7, column=1)
 
         self.display_button = tk.Button(self.root, text="Display Memory", command=self.display_memory)
-        self.display_button.grid(row=7, column=0, columnspan=2)
+        self.display_button.grid(row=8, column=0, columnspan=2)
 
         self.output_text = tk.Text(self.root, height=10, width=50)
-        self.output_text.grid(row=8, column=0, columnspan=2)
+        self.output_text.grid(row=9, column=0, columnspan=2)
 
     def initialize_memory_management(self):
         total_size = int(self.total_memory_entry.get())
@@ -125,7 +234,7 @@ class MemoryManagementSimulator:
     def allocate_memory(self):
         process_id = int(self.process_id_entry.get())
         size = int(self.process_size_entry.get())
-        strategy = "first_fit"  # For simplicity, using first_fit strategy
+        strategy = self.strategy_var.get()
 
         if not hasattr(self, 'mm'):
             self.initialize_memory_management()
@@ -151,37 +260,30 @@ class FixedSizePartitioning(MemoryManagement):
         super().__init__(total_size)
         self.partition_size = partition_size
         self.partitions = [None] * (total_size // partition_size)
+        self.owners = OwnershipIndex()  # process id -> partition numbers
+        # Free capacity per partition (-1 once occupied)
+        self.placement = Placement(PartitionIndex([partition_size] * len(self.partitions)))
 
     def allocate(self, process_id, size, strategy='first_fit'):
         if size > self.partition_size:
-            messagebox.showerror("Error", f"Process {process_id} requires more memory than partition size.")
+            self.messagebox.showerror("Error", f"Process {process_id} requires more memory than partition size.")
             return False
 
-        if strategy == 'first_fit':
-            for i in range(len(self.partitions)):
-                if self.partitions[i] is None:
-                    self.partitions[i] = process_id
-                    for j in range(i * self.partition_size, (i + 1) * self.partition_size):
-                        self.memory[j] = process_id
-                    return True
-        messagebox.showerror("Error", f"Failed to allocate memory for Process {process_id}")
-        return False
+        i = self.placement.find(size, strategy)
+        if i is None:
+            self.messagebox.showerror("Error", f"Failed to allocate memory for Process {process_id}")
+            return False
+        self.partitions[i] = process_id
+        self.placement.index.update(i, -1)
+        self.memory.assign(i * self.partition_size, self.partition_size, process_id)
+        self.owners.add(process_id, i)
+        return True
 
     def deallocate(self, process_id):
-        for i in range(len(self.partitions)):
-            if self.partitions[i] == process_id:
-                self.partitions[i] = None
-                for j in range(i * self.partition_size, (i + 1) * self.partition_size):
-                    self.memory[j] = None
-
-    def display_memory(self):
-        memory_status = "Memory Allocation:\n"
-        for i in range(len(self.memory)):
-            if self.memory[i] is None:
-                memory_status += f"[{i}]: Free\n"
-            else:
-                memory_status += f"[{i}]: Process {self.memory[i]}\n"
-        return memory_status
+        for i in self.owners.pop(process_id) or ():
+            self.partitions[i] = None
+            self.placement.index.update(i, self.partition_size)
+            self.memory.free(i * self.partition_size, self.partition_size)
 
 # Similarly implement other classes...
 
@@ -0,0 +1,59 @@
+from sortedlist import SortedList
+
+# Run-length memory map: which owner holds each unit of memory, stored as extents instead of one
+# slot per unit. Every extent starts at a boundary in `starts` and runs to the next boundary;
+# neighbouring extents always have different owners. Assigning a range touches only the
+# extents it overlaps, so allocating or freeing a block is O(log n) in the number of extents.
+
+class ExtentMap:
+    def __init__(self, total_size, owner=None):
+        self.total_size = total_size
+        self.starts = SortedList([0] if total_size > 0 else [])
+        self.owners = {0: owner} if total_size > 0 else {}
+
+    def __len__(self):
+        return self.total_size
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.total_size:
+            raise IndexError('memory index out of range')
+        return self.owners[self.starts.floor(index)]
+
+    def _split(self, index):
+        # Makes index the start of an extent
+        if index >= self.total_size or index in self.owners:
+            return
+        self.owners[index] = self.owners[self.starts.floor(index)]
+        self.starts.add(index)
+
+    def assign(self, start, length, owner):
+        end = min(start + length, self.total_size)
+        if start >= end:
+            return
+        self._split(start)
+        self._split(end)
+        boundary = self.starts.ceiling(start + 1)
+        while boundary is not None and boundary < end:
+            self.starts.remove(boundary)
+            del self.owners[boundary]
+            boundary = self.starts.ceiling(start + 1)
+        self.owners[start] = owner
+        # Merge with equal neighbours so the map stays minimal
+        if end in self.owners and self.owners[end] == owner:
+            self.starts.remove(end)
+            del self.owners[end]
+        if start > 0:
+            before = self.starts.floor(start - 1)
+            if self.owners[before] == owner:
+                self.starts.remove(start)
+                del self.owners[start]
+
+    def free(self, start, length):
+        self.assign(start, length, None)
+
+    def runs(self):
+        # (start, end, owner) for every extent in address order, end exclusive
+        starts = list(self.starts)
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else self.total_size
+            yield start, end, self.owners[start]
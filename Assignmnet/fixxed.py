@@ -1,70 +1,68 @@
-def first_fit(partitions, processes):
-    allocation = [-1] * len(processes)  # Initialize allocation list
-    for i in range(len(processes)):
-        for j in range(len(partitions)):
-            if partitions[j] >= processes[i]:
-                allocation[i] = j
-                partitions[j] -= processes[i]
-                break
-    return allocation
+from placement import PartitionIndex, Placement
 
-def best_fit(partitions, processes):
+def allocate(partitions, processes, strategy='first_fit', placement=None):
+    # Places each process in a partition and shrinks that partition's remaining size. A caller
+    # placing requests a few at a time passes the same placement (built over these partitions)
+    # on every call, so the index is not rebuilt each time.
     allocation = [-1] * len(processes)  # Initialize allocation list
-    for i in range(len(processes)):
-        best_idx = -1
-        for j in range(len(partitions)):
-            if partitions[j] >= processes[i]:
-                if best_idx == -1 or partitions[j] < partitions[best_idx]:
-                    best_idx = j
-        if best_idx != -1:
-            allocation[i] = best_idx
-            partitions[best_idx] -= processes[i]
+    if placement is None:
+        placement = Placement(PartitionIndex(partitions))
+    for i, size in enumerate(processes):
+        j = placement.find(size, strategy)
+        if j is not None:
+            allocation[i] = j
+            partitions[j] -= size
+            placement.index.update(j, partitions[j])
     return allocation
 
-def worst_fit(partitions, processes):
-    allocation = [-1] * len(processes)  # Initialize allocation list
-    for i in range(len(processes)):
-        worst_idx = -1
-        for j in range(len(partitions)):
-            if partitions[j] >= processes[i]:
-                if worst_idx == -1 or partitions[j] > partitions[worst_idx]:
-                    worst_idx = j
-        if worst_idx != -1:
-            allocation[i] = worst_idx
-            partitions[worst_idx] -= processes[i]
-    return allocation
+def first_fit(partitions, processes, placement=None):
+    return allocate(partitions, processes, 'first_fit', placement)
+
+def best_fit(partitions, processes, placement=None):
+    return allocate(partitions, processes, 'best_fit', placement)
+
+def worst_fit(partitions, processes, placement=None):
+    return allocate(partitions, processes, 'worst_fit', placement)
+
+def free_space(partitions):
+    # (total remaining, largest remaining) over the partitions
+    return sum(partitions), max(partitions, default=0)
 
 def display_memory_allocation(partitions, allocation, processes):
+    first_process = {}
+    for process_index, partition in enumerate(allocation):
+        first_process.setdefault(partition, process_index)
     for i in range(len(partitions)):
         partition_info = f"Partition {i+1} (Remaining Size: {partitions[i]} KB) -> "
-        if i in allocation:
-            process_index = allocation.index(i)
+        if i in first_process:
+            process_index = first_process[i]
             partition_info += f"Process {process_index} (Size: {processes[process_index]} KB)"
         else:
             partition_info += "Free"
         print(partition_info)
 
-# Define the partition sizes (in KB)
-partition_sizes = [100, 500, 200, 300, 600]
+if __name__ == "__main__":
+    # Define the partition sizes (in KB)
+    partition_sizes = [100, 500, 200, 300, 600]
 
-# Define the process sizes (in KB)
-process_sizes = [212, 417, 112, 426]
+    # Define the process sizes (in KB)
+    process_sizes = [212, 417, 112, 426]
 
-# Allocate processes using First Fit strategy
-print("First Fit Allocation:")
-partitions_copy = partition_sizes[:]
-first_fit_allocation = first_fit(partitions_copy, process_sizes)
-display_memory_allocation(partitions_copy, first_fit_allocation, process_sizes)
+    # Allocate processes using First Fit strategy
+    print("First Fit Allocation:")
+    partitions_copy = partition_sizes[:]
+    first_fit_allocation = first_fit(partitions_copy, process_sizes)
+    display_memory_allocation(partitions_copy, first_fit_allocation, process_sizes)
 
-# Allocate processes using Best Fit strategy
-print("\n Best Fit Allocation:")
-partitions_copy = partition_sizes[:]
-best_fit_allocation = best_fit(partitions_copy, process_sizes)
-display_memory_allocation(partitions_copy, best_fit_allocation, process_sizes)
+    # Allocate processes using Best Fit strategy
+    print("\n Best Fit Allocation:")
+    partitions_copy = partition_sizes[:]
+    best_fit_allocation = best_fit(partitions_copy, process_sizes)
+    display_memory_allocation(partitions_copy, best_fit_allocation, process_sizes)
 
-# Allocate processes using Worst Fit strategy
-print("\nWorst Fit Allocation:")
-partitions_copy = partition_sizes[:]
-worst_fit_allocation = worst_fit(partitions_copy, process_sizes)
-display_memory_allocation(partitions_copy, worst_fit_allocation, process_sizes)
+    # Allocate processes using Worst Fit strategy
+    print("\nWorst Fit Allocation:")
+    partitions_copy = partition_sizes[:]
+    worst_fit_allocation = worst_fit(partitions_copy, process_sizes)
+    display_memory_allocation(partitions_copy, worst_fit_allocation, process_sizes)
 
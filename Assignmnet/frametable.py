@@ -0,0 +1,75 @@
+import re
+from array import array
+
+# Physical frame table for the paging allocators: one bit per frame (1 = in use) in a bytearray,
+# so a 16 GB machine with 4 KB pages needs 512 KB. Free frames are found a byte at a time by a
+# compiled regex that skips full bytes in C, starting from a hint below which every frame is in use.
+
+_NOT_FULL = re.compile(rb'[^\xff]')
+_FREE_BITS = [[bit for bit in range(8) if not byte & (1 << bit)] for byte in range(256)]
+
+class FrameTable:
+    def __init__(self, num_frames):
+        self.num_frames = num_frames
+        self.bits = bytearray((num_frames + 7) // 8)
+        if num_frames % 8:
+            self.bits[-1] = 0xFF & ~((1 << (num_frames % 8)) - 1)  # frames past the end are never free
+        self.free_count = num_frames
+        self.hint = 0  # every byte before this one is full
+
+    def is_free(self, frame):
+        return not self.bits[frame >> 3] & (1 << (frame & 7))
+
+    def free_space(self):
+        # Any free frame can back any page, so all free frames count as one block
+        return self.free_count, self.free_count
+
+    def allocate(self, count):
+        # The count lowest-numbered free frames, or None if there are not enough
+        if count > self.free_count:
+            return None
+        frames = array('l')
+        bits = self.bits
+        position = self.hint
+        while len(frames) < count:
+            position = _NOT_FULL.search(bits, position).start()
+            byte = bits[position]
+            base = position * 8
+            if byte == 0 and count - len(frames) >= 8:
+                frames.extend(range(base, base + 8))
+                byte = 0xFF
+            else:
+                for bit in _FREE_BITS[byte]:
+                    frames.append(base + bit)
+                    byte |= 1 << bit
+                    if len(frames) == count:
+                        break
+            bits[position] = byte
+        self.hint = position
+        self.free_count -= count
+        return frames
+
+    def free(self, frames):
+        bits = self.bits
+        for frame in frames:
+            bits[frame >> 3] &= ~(1 << (frame & 7))
+            if frame >> 3 < self.hint:
+                self.hint = frame >> 3
+        self.free_count += len(frames)
+
+    def layout(self, page_table):
+        # (first frame, last frame, owner or None) runs covering every frame, from a pid -> frames map
+        owners = sorted((frame, pid) for pid, frames in page_table.items() for frame in frames)
+        runs = []
+        next_frame = 0
+        for frame, pid in owners:
+            if frame > next_frame:
+                runs.append([next_frame, frame - 1, None])
+            if runs and runs[-1][2] == pid and runs[-1][1] == frame - 1:
+                runs[-1][1] = frame
+            else:
+                runs.append([frame, frame, pid])
+            next_frame = frame + 1
+        if next_frame < self.num_frames:
+            runs.append([next_frame, self.num_frames - 1, None])
+        return [tuple(run) for run in runs]
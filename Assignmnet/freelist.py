@@ -0,0 +1,178 @@
+import random
+
+from placement import SizeClasses
+from sortedlist import SortedList
+
+# Free extents of a variable-partition allocator.
+#
+# Extents are kept twice: in a treap ordered by start address, where every node also records the
+# largest extent in its subtree, and in a SortedList of (size, start) pairs. The treap answers
+# first fit and finds the neighbours to coalesce with on release, the size index answers best and
+# worst fit, and SizeClasses keeps the per-class lists for segregated fit. Every operation is
+# O(log n) in the number of free extents.
+
+class _Node:
+    __slots__ = ('start', 'size', 'priority', 'left', 'right', 'max_size')
+
+    def __init__(self, start, size, priority):
+        self.start = start
+        self.size = size
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_size = size
+
+def _update(node):
+    max_size = node.size
+    if node.left is not None and node.left.max_size > max_size:
+        max_size = node.left.max_size
+    if node.right is not None and node.right.max_size > max_size:
+        max_size = node.right.max_size
+    node.max_size = max_size
+
+def _split(node, start):
+    # (extents starting before start, extents starting at or after start)
+    if node is None:
+        return None, None
+    if node.start < start:
+        node.right, right = _split(node.right, start)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, start)
+    _update(node)
+    return left, node
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+class FreeList:
+    def __init__(self, total_size=0, seed=0):
+        self.root = None
+        self.sizes = {}  # start -> size
+        self.by_size = SortedList()
+        self.classes = SizeClasses()
+        self.free_size = 0
+        self.rng = random.Random(seed)
+        if total_size > 0:
+            self.add(0, total_size)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __iter__(self):
+        # (start, size) in address order
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.start, node.size
+            node = node.right
+
+    def add(self, start, size):
+        # Inserts an extent as is, without coalescing
+        left, right = _split(self.root, start)
+        self.root = _merge(_merge(left, _Node(start, size, self.rng.random())), right)
+        self.sizes[start] = size
+        self.by_size.add((size, start))
+        self.classes.add(start, size)
+        self.free_size += size
+
+    def remove(self, start):
+        size = self.sizes.pop(start)
+        left, right = _split(self.root, start)
+        _, right = _split(right, start + 1)
+        self.root = _merge(left, right)
+        self.by_size.remove((size, start))
+        self.classes.remove(start, size)
+        self.free_size -= size
+        return size
+
+    def floor(self, address):
+        # The extent starting at or before address, as (start, size), or None
+        node = self.root
+        found = None
+        while node is not None:
+            if node.start <= address:
+                found = node
+                node = node.right
+            else:
+                node = node.left
+        return None if found is None else (found.start, found.size)
+
+    def ceiling(self, address):
+        # The extent starting at or after address, as (start, size), or None
+        node = self.root
+        found = None
+        while node is not None:
+            if node.start >= address:
+                found = node
+                node = node.left
+            else:
+                node = node.right
+        return None if found is None else (found.start, found.size)
+
+    def release(self, start, size):
+        # Returns [start, start + size) to the free list, merged with free neighbours on both sides
+        before = self.floor(start - 1)
+        if before is not None and before[0] + before[1] == start:
+            self.remove(before[0])
+            start, size = before[0], before[1] + size
+        if start + size in self.sizes:
+            size += self.remove(start + size)
+        self.add(start, size)
+
+    def take(self, start, size):
+        # Allocates size units from the front of the free extent at start
+        remaining = self.remove(start) - size
+        if remaining > 0:
+            self.add(start + size, remaining)
+        return start
+
+    def free_space(self):
+        # (total free, largest extent)
+        largest = self.by_size.max()
+        return self.free_size, 0 if largest is None else largest[0]
+
+    def find_first(self, size, address=0):
+        # Lowest-addressed extent at or after address that can hold size, or None
+        return self._find_first(self.root, size, address)
+
+    def _find_first(self, node, size, address):
+        if node is None or node.max_size < size:
+            return None
+        if node.start >= address:
+            found = self._find_first(node.left, size, address)
+            if found is not None:
+                return found
+            if node.size >= size:
+                return node.start
+        return self._find_first(node.right, size, address)
+
+    def find_best(self, size):
+        # Smallest extent that can hold size, lowest address on ties
+        entry = self.by_size.ceiling((size, -1))
+        return None if entry is None else entry[1]
+
+    def find_segregated(self, size):
+        # Lowest-addressed extent in the smallest size class that can hold size, or None
+        return self.classes.find(size)
+
+    def find_worst(self, size):
+        # Largest extent if it can hold size, lowest address on ties
+        largest = self.by_size.max()
+        if largest is None or largest[0] < size:
+            return None
+        return self.by_size.ceiling((largest[0], -1))[1]
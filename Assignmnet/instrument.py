@@ -0,0 +1,156 @@
+import csv
+import time
+from array import array
+
+from ownership import OwnershipIndex
+
+# Instrumentation shared by the allocators. Instrumented wraps an allocate(pid, size) -> bool and
+# a free(pid) callable pair, e.g. Memory.py's allocate_best_fit/deallocate or a lambda around
+# asdas' allocate(Process), and keeps counters and histograms up to date on every call. Every
+# allocator also has a free_space() method returning (free units, largest free block). It is
+# O(log n) or better everywhere except fixxed.free_space() and dar's MemoryManagement.free_space(),
+# which walk every partition or extent; raise sample_every for those two (bench's fixxed targets
+# read the same numbers from their partition index instead). Measured per sample:
+#
+#   internal fragmentation   handed out but not requested, as a fraction of the memory in use
+#   external fragmentation   1 - largest free block / total free
+#   utilisation              requested memory that is live, as a fraction of the capacity
+#
+# Samples are taken every sample_every operations and can be written out as a CSV time series.
+# A pid may hold several allocations at once. Most managers release all of them on free(pid); for
+# the ones that release only the pid's oldest allocation (asdas' DynamicMemoryAllocation) pass
+# free_oldest=True so the requested sizes are released the same way.
+
+SERIES_FIELDS = ['operations', 'calls', 'failures', 'live_requested', 'used', 'free', 'largest_free',
+                 'internal_fragmentation', 'external_fragmentation', 'utilisation', 'failure_rate']
+
+class Log2Histogram:
+    # Bucket b counts values in [2**(b-1), 2**b)
+    def __init__(self):
+        self.counts = array('q', [0] * 65)
+        self.total = 0
+
+    def add(self, value):
+        self.counts[min(64, max(0, int(value)).bit_length())] += 1
+        self.total += 1
+
+    def percentile(self, p):
+        # Upper bound of the bucket holding the p-th value
+        if not self.total:
+            return 0
+        rank = p * self.total
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return 1 << bucket
+        return 1 << 64
+
+class AllocatorStats:
+    def __init__(self, capacity=0):
+        self.capacity = capacity
+        self.calls = 0
+        self.failures = 0
+        self.frees = 0
+        self.live_requested = 0
+        self.latency = Log2Histogram()  # nanoseconds per allocate or free
+        self.sizes = Log2Histogram()  # requested sizes
+        self.free = capacity
+        self.largest_free = capacity
+        self.series = []
+
+    def record_allocation(self, size, ok, elapsed):
+        self.calls += 1
+        self.sizes.add(size)
+        self.latency.add(elapsed)
+        if ok:
+            self.live_requested += size
+        else:
+            self.failures += 1
+
+    def record_free(self, size, elapsed):
+        self.frees += 1
+        self.latency.add(elapsed)
+        self.live_requested -= size
+
+    def update_free_space(self, free, largest_free):
+        self.free = free
+        self.largest_free = largest_free
+
+    def snapshot(self):
+        used = self.capacity - self.free
+        return {
+            'operations': self.calls + self.frees,
+            'calls': self.calls,
+            'failures': self.failures,
+            'live_requested': self.live_requested,
+            'used': used,
+            'free': self.free,
+            'largest_free': self.largest_free,
+            'internal_fragmentation': (used - self.live_requested) / used if used > 0 else 0.0,
+            'external_fragmentation': 1 - self.largest_free / self.free if self.free > 0 else 0.0,
+            'utilisation': self.live_requested / self.capacity if self.capacity else 0.0,
+            'failure_rate': self.failures / self.calls if self.calls else 0.0,
+            'latency_p50_ns': self.latency.percentile(0.50),
+            'latency_p99_ns': self.latency.percentile(0.99),
+        }
+
+    def sample(self):
+        snapshot = self.snapshot()
+        self.series.append([snapshot[name] for name in SERIES_FIELDS])
+        return snapshot
+
+    def write_series(self, path):
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(SERIES_FIELDS)
+            writer.writerows(self.series)
+
+class Instrumented:
+    def __init__(self, allocate, free=None, free_space=None, sample_every=100, clock=time.perf_counter_ns,
+                 free_oldest=False):
+        self._allocate = allocate
+        self._free = free
+        self._free_space = free_space
+        self.sample_every = sample_every
+        self.clock = clock
+        self.free_oldest = free_oldest
+        self.requested = OwnershipIndex()  # pid -> sizes of its live requests, oldest first
+        capacity = free_space()[0] if free_space is not None else 0
+        self.stats = AllocatorStats(capacity)
+
+    def allocate(self, pid, size):
+        before = self.clock()
+        ok = self._allocate(pid, size)
+        self.stats.record_allocation(size, ok, self.clock() - before)
+        if ok:
+            self.requested.add(pid, size)
+        self._tick()
+        return ok
+
+    def free(self, pid):
+        before = self.clock()
+        result = self._free(pid)
+        elapsed = self.clock() - before
+        if self.free_oldest:
+            size = self.requested.pop_oldest(pid) or 0
+        else:
+            size = sum(self.requested.pop(pid) or ())
+        self.stats.record_free(size, elapsed)
+        self._tick()
+        return result
+
+    def _tick(self):
+        stats = self.stats
+        if self.sample_every and (stats.calls + stats.frees) % self.sample_every == 0:
+            self.sample()
+
+    def sample(self):
+        if self._free_space is not None:
+            self.stats.update_free_space(*self._free_space())
+        return self.stats.sample()
+
+    def snapshot(self):
+        if self._free_space is not None:
+            self.stats.update_free_space(*self._free_space())
+        return self.stats.snapshot()
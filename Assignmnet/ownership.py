@@ -0,0 +1,55 @@
+from collections import deque
+
+# Ownership index shared by the managers: pid -> what the pid holds (partition numbers, block
+# starts, allocation records), oldest first. Managers add to it on every allocation, so a
+# deallocation looks its pid up instead of scanning the partitions, and costs O(items owned).
+
+class OwnershipIndex:
+    def __init__(self):
+        self.owned = {}  # pid -> deque of items
+
+    def __contains__(self, pid):
+        return pid in self.owned
+
+    def __len__(self):
+        return len(self.owned)
+
+    def __iter__(self):
+        return iter(self.owned)
+
+    def items(self):
+        return self.owned.items()
+
+    def values(self):
+        return self.owned.values()
+
+    def get(self, pid):
+        return self.owned.get(pid, ())
+
+    def add(self, pid, item):
+        self.owned.setdefault(pid, deque()).append(item)
+
+    def extend(self, pid, items):
+        self.owned.setdefault(pid, deque()).extend(items)
+
+    def pop(self, pid):
+        # Everything the pid holds, or None if it holds nothing
+        return self.owned.pop(pid, None)
+
+    def pop_oldest(self, pid):
+        # The pid's oldest item, or None if it holds nothing
+        items = self.owned.get(pid)
+        if not items:
+            return None
+        item = items.popleft()
+        if not items:
+            del self.owned[pid]
+        return item
+
+    def replace(self, pid, old, new):
+        items = self.owned[pid]
+        items[items.index(old)] = new
+
+    def owners(self):
+        # item -> pid for every item held
+        return {item: pid for pid, items in self.owned.items() for item in items}
@@ -0,0 +1,305 @@
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+# Page table organisations for the paging simulators. All of them map (pid, virtual page) to a
+# frame and count the memory references a hardware walk would make (`walks`), and footprint()
+# gives the bytes the table would occupy on the modelled machine:
+#
+#   flat       one linear table per process, sized for the whole virtual address space
+#   2level,
+#   3level     a radix tree per process; only the nodes covering mapped pages exist
+#   inverted   one entry per physical frame, found through a hash anchor table
+#
+# The Python side is sparse in every case, so huge address spaces only cost host memory for the
+# pages that are actually mapped. Comparing the schemes on a sparse 64-bit workload:
+#   python pagetable.py --processes 1000 --va-bits 64
+
+ENTRY_SIZE = 8  # bytes per page table entry
+
+def vpn_bits(va_bits, page_size):
+    return max(0, va_bits - (page_size - 1).bit_length())
+
+class FlatPageTable:
+    levels = 1
+
+    def __init__(self, va_bits=32, page_size=4096, num_frames=0):
+        self.vpn_bits = vpn_bits(va_bits, page_size)
+        self.tables = {}  # pid -> {page: frame}
+        self.walks = 0
+
+    def add_process(self, pid):
+        self.tables.setdefault(pid, {})
+
+    def remove_process(self, pid):
+        # Frames the process had mapped
+        return list(self.tables.pop(pid, {}).values())
+
+    def __contains__(self, pid):
+        return pid in self.tables
+
+    def lookup(self, pid, page):
+        self.walks += self.levels
+        return self.tables[pid].get(page)
+
+    def map(self, pid, page, frame):
+        self.tables[pid][page] = frame
+
+    def unmap(self, pid, page):
+        del self.tables[pid][page]
+
+    def resident(self):
+        # pid -> frames currently mapped
+        return {pid: list(pages.values()) for pid, pages in self.tables.items()}
+
+    def footprint(self):
+        return len(self.tables) * (1 << self.vpn_bits) * ENTRY_SIZE
+
+class MultiLevelPageTable:
+    def __init__(self, levels, va_bits=32, page_size=4096, num_frames=0):
+        self.levels = levels
+        bits = vpn_bits(va_bits, page_size)
+        # Lower levels get equal shares of the page number; the top level takes what is left
+        share = -(-bits // levels)
+        self.level_bits = [bits - share * (levels - 1)] + [share] * (levels - 1)
+        self.shifts = [sum(self.level_bits[i + 1:]) for i in range(levels)]
+        self.masks = [(1 << b) - 1 for b in self.level_bits]
+        self.roots = {}  # pid -> top-level node; a node is a dict of index -> child node or frame
+        self.node_counts = [0] * levels
+        self.mapped = 0
+        self.walks = 0
+
+    def add_process(self, pid):
+        if pid not in self.roots:
+            self.roots[pid] = {}
+            self.node_counts[0] += 1
+
+    def remove_process(self, pid):
+        root = self.roots.pop(pid, None)
+        if root is None:
+            return []
+        frames = []
+        stack = [(root, 0)]
+        while stack:
+            node, level = stack.pop()
+            self.node_counts[level] -= 1
+            if level == self.levels - 1:
+                frames.extend(node.values())
+            else:
+                stack.extend((child, level + 1) for child in node.values())
+        self.mapped -= len(frames)
+        return frames
+
+    def __contains__(self, pid):
+        return pid in self.roots
+
+    def _index(self, page, level):
+        return (page >> self.shifts[level]) & self.masks[level]
+
+    def lookup(self, pid, page):
+        node = self.roots[pid]
+        for level in range(self.levels):
+            self.walks += 1
+            node = node.get(self._index(page, level))
+            if node is None:
+                return None
+        return node
+
+    def map(self, pid, page, frame):
+        node = self.roots[pid]
+        for level in range(self.levels - 1):
+            index = self._index(page, level)
+            child = node.get(index)
+            if child is None:
+                child = node[index] = {}
+                self.node_counts[level + 1] += 1
+            node = child
+        index = self._index(page, self.levels - 1)
+        if index not in node:
+            self.mapped += 1
+        node[index] = frame
+
+    def unmap(self, pid, page):
+        # Removes the entry and any table nodes left empty
+        path = [self.roots[pid]]
+        for level in range(self.levels - 1):
+            path.append(path[-1][self._index(page, level)])
+        del path[-1][self._index(page, self.levels - 1)]
+        self.mapped -= 1
+        for level in range(self.levels - 1, 0, -1):
+            if path[level]:
+                break
+            del path[level - 1][self._index(page, level - 1)]
+            self.node_counts[level] -= 1
+
+    def resident(self):
+        resident = {}
+        for pid, root in self.roots.items():
+            frames = resident[pid] = []
+            stack = [(root, 0)]
+            while stack:
+                node, level = stack.pop()
+                if level == self.levels - 1:
+                    frames.extend(node.values())
+                else:
+                    stack.extend((child, level + 1) for child in node.values())
+        return resident
+
+    def footprint(self):
+        return sum(count * (1 << bits) * ENTRY_SIZE for count, bits in zip(self.node_counts, self.level_bits))
+
+class InvertedPageTable:
+    # One entry per frame, chained from a hash anchor table with as many slots as frames
+    levels = 1
+    ENTRY_SIZE = 16  # pid, virtual page and chain pointer
+    ANCHOR_SIZE = 4
+
+    def __init__(self, va_bits=32, page_size=4096, num_frames=1024):
+        self.num_frames = num_frames
+        self.anchors = [None] * max(1, num_frames)  # slot -> list of (pid, page, frame)
+        self.processes = set()
+        self.walks = 0
+
+    def _slot(self, pid, page):
+        return hash((pid, page)) % len(self.anchors)
+
+    def add_process(self, pid):
+        self.processes.add(pid)
+
+    def remove_process(self, pid):
+        # A real inverted table has no per-process index, so this scans every chain
+        self.processes.discard(pid)
+        frames = []
+        for slot, chain in enumerate(self.anchors):
+            if chain:
+                kept = [entry for entry in chain if entry[0] != pid]
+                if len(kept) != len(chain):
+                    frames.extend(entry[2] for entry in chain if entry[0] == pid)
+                    self.anchors[slot] = kept or None
+        return frames
+
+    def __contains__(self, pid):
+        return pid in self.processes
+
+    def lookup(self, pid, page):
+        self.walks += 1  # anchor slot
+        chain = self.anchors[self._slot(pid, page)]
+        if chain:
+            for entry in chain:
+                self.walks += 1
+                if entry[0] == pid and entry[1] == page:
+                    return entry[2]
+        return None
+
+    def map(self, pid, page, frame):
+        slot = self._slot(pid, page)
+        chain = self.anchors[slot]
+        if chain is None:
+            chain = self.anchors[slot] = []
+        chain.append((pid, page, frame))
+
+    def unmap(self, pid, page):
+        slot = self._slot(pid, page)
+        chain = [entry for entry in self.anchors[slot] if entry[0] != pid or entry[1] != page]
+        self.anchors[slot] = chain or None
+
+    def resident(self):
+        resident = {pid: [] for pid in self.processes}
+        for chain in self.anchors:
+            if chain:
+                for pid, page, frame in chain:
+                    resident[pid].append(frame)
+        return resident
+
+    def footprint(self):
+        return self.num_frames * (self.ENTRY_SIZE + self.ANCHOR_SIZE)
+
+PAGE_TABLES = {
+    'flat': FlatPageTable,
+    '2level': lambda *args: MultiLevelPageTable(2, *args),
+    '3level': lambda *args: MultiLevelPageTable(3, *args),
+    'inverted': InvertedPageTable,
+}
+
+def make_page_table(scheme, va_bits=32, page_size=4096, num_frames=1024):
+    return PAGE_TABLES[scheme](va_bits, page_size, num_frames)
+
+def sparse_mappings(num_processes, va_bits, page_size, pages_per_process, seed=0):
+    # Per process: a code+heap region at the bottom, a stack at the top and a few mapped regions
+    # scattered through the address space
+    rng = random.Random(seed)
+    top = 1 << vpn_bits(va_bits, page_size)
+    mappings = []
+    for pid in range(num_processes):
+        pages = []
+        regions = [0, top - pages_per_process // 4] + [rng.randrange(top) for _ in range(4)]
+        per_region = max(1, pages_per_process // len(regions))
+        for base in regions:
+            pages.extend((base + i) % top for i in range(per_region))
+        mappings.append((pid, list(dict.fromkeys(pages))))
+    return mappings
+
+def compare(schemes, num_processes, va_bits, page_size, pages_per_process, lookups, seed=0):
+    mappings = sparse_mappings(num_processes, va_bits, page_size, pages_per_process, seed)
+    num_frames = num_processes * pages_per_process
+    rng = random.Random(seed + 1)
+    probes = []
+    for _ in range(lookups):
+        pid, pages = mappings[rng.randrange(len(mappings))]
+        probes.append((pid, pages[rng.randrange(len(pages))]))
+
+    results = []
+    for scheme in schemes:
+        tracemalloc.start()
+        table = make_page_table(scheme, va_bits, page_size, num_frames)
+        frame = 0
+        for pid, pages in mappings:
+            table.add_process(pid)
+            for page in pages:
+                table.map(pid, page, frame)
+                frame += 1
+        host = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        table.walks = 0
+        started = time.perf_counter()
+        for pid, page in probes:
+            table.lookup(pid, page)
+        elapsed = time.perf_counter() - started
+        results.append({
+            'scheme': scheme,
+            'footprint': table.footprint(),
+            'host_kb': host / 1024,
+            'accesses': table.walks / lookups if lookups else 0.0,
+            'lookup_us': elapsed / lookups * 1e6 if lookups else 0.0,
+        })
+    return results
+
+def format_bytes(size):
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB', 'PB', 'EB']:
+        if size < 1024:
+            return f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1e} ZB'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare page table organisations on sparse address spaces.')
+    parser.add_argument('--schemes', nargs='+', default=list(PAGE_TABLES), choices=list(PAGE_TABLES))
+    parser.add_argument('--processes', type=int, default=1000)
+    parser.add_argument('--va-bits', type=int, default=64, help='virtual address bits')
+    parser.add_argument('--page-size', type=int, default=4096, help='bytes per page (a power of two)')
+    parser.add_argument('--pages', type=int, default=64, help='mapped pages per process')
+    parser.add_argument('--lookups', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'scheme':<10} {'table size':>12} {'host KB':>10} {'accesses':>9} {'us/lookup':>10}")
+    for result in compare(args.schemes, args.processes, args.va_bits, args.page_size, args.pages,
+                          args.lookups, args.seed):
+        print(f"{result['scheme']:<10} {format_bytes(result['footprint']):>12} {result['host_kb']:>10.0f} "
+              f"{result['accesses']:>9.2f} {result['lookup_us']:>10.2f}")
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+from segtree import MaxSegmentTree
+from sortedlist import SortedList
+
+# Placement strategies shared by the allocators.
+#
+# A Placement chooses where a request goes in an index of free space. Two indexes share the same
+# interface (find_first, find_best, find_worst): FreeList for variable partitions, where a
+# location is a start address, and PartitionIndex below for fixed partitions, where it is a
+# partition number. Both also keep their free space in SizeClasses, segregated free lists by
+# power-of-two size. Every strategy is an O(log n) lookup:
+#
+#   first_fit       lowest location that fits
+#   next_fit        like first fit, but searching on from the previous placement and wrapping
+#   best_fit        smallest free space that fits, lowest location on ties
+#   worst_fit       largest free space, lowest location on ties
+#   segregated_fit  requests are rounded up to a power-of-two size class and served from the
+#                   lowest location in the smallest non-empty class list at or above it; best fit
+#                   among the free spaces below the rounded size when every such list is empty
+
+STRATEGIES = ['first_fit', 'next_fit', 'best_fit', 'worst_fit', 'segregated_fit']
+
+class SizeClasses:
+    # One location-ordered free list per class; class k holds free spaces of [2**k, 2**(k+1))
+    def __init__(self):
+        self.lists = {}  # class -> SortedList of locations
+
+    def add(self, location, size):
+        if size > 0:
+            self.lists.setdefault(size.bit_length() - 1, SortedList()).add(location)
+
+    def remove(self, location, size):
+        if size > 0:
+            self.lists[size.bit_length() - 1].remove(location)
+
+    def find(self, size):
+        # Lowest location in the smallest class whose members all hold size, or None
+        size_class = max(0, size - 1).bit_length()
+        for k in sorted(self.lists):
+            if k >= size_class and self.lists[k]:
+                return self.lists[k].min()
+        return None
+
+class PartitionIndex:
+    # Free capacity per partition number; -1 marks a partition that cannot be used
+    def __init__(self, capacities):
+        self.capacities = list(capacities)
+        self.tree = MaxSegmentTree(self.capacities)
+        self.by_size = SortedList((capacity, i) for i, capacity in enumerate(self.capacities) if capacity >= 0)
+        self.free_total = sum(capacity for capacity in self.capacities if capacity >= 0)
+        self.classes = SizeClasses()
+        for i, capacity in enumerate(self.capacities):
+            self.classes.add(i, capacity)
+
+    def __len__(self):
+        return len(self.capacities)
+
+    def update(self, i, capacity):
+        old = self.capacities[i]
+        if old == capacity:
+            return
+        if old >= 0:
+            self.by_size.remove((old, i))
+            self.classes.remove(i, old)
+            self.free_total -= old
+        if capacity >= 0:
+            self.by_size.add((capacity, i))
+            self.classes.add(i, capacity)
+            self.free_total += capacity
+        self.capacities[i] = capacity
+        self.tree.update(i, capacity)
+
+    def free_space(self):
+        largest = self.by_size.max()
+        return self.free_total, 0 if largest is None else largest[0]
+
+    def find_first(self, size, start=0):
+        i = self.tree.find_first(size, start)
+        return None if i == -1 else i
+
+    def find_best(self, size):
+        entry = self.by_size.ceiling((size, -1))
+        return None if entry is None else entry[1]
+
+    def find_worst(self, size):
+        largest = self.by_size.max()
+        if largest is None or largest[0] < size:
+            return None
+        return self.by_size.ceiling((largest[0], -1))[1]
+
+    def find_segregated(self, size):
+        return self.classes.find(size)
+
+class Placement:
+    def __init__(self, index):
+        self.index = index
+        self.cursor = 0  # where next fit resumes
+
+    def find(self, size, strategy='first_fit'):
+        index = self.index
+        if strategy == 'first_fit':
+            return index.find_first(size)
+        if strategy == 'next_fit':
+            found = index.find_first(size, self.cursor)
+            if found is None and self.cursor:
+                found = index.find_first(size)
+            if found is not None:
+                self.cursor = found
+            return found
+        if strategy == 'best_fit':
+            return index.find_best(size)
+        if strategy == 'worst_fit':
+            return index.find_worst(size)
+        if strategy == 'segregated_fit':
+            found = index.find_segregated(size)
+            if found is None:
+                found = index.find_best(size)
+            return found
+        raise ValueError(f"Unknown allocation strategy: {strategy}")
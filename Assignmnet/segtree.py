@@ -0,0 +1,59 @@
+# Max segment tree over partition capacities, used for first fit. Leaf i holds the free capacity
+# of partition i (-1 when the partition is unavailable) and every inner node the maximum of its two
+# children, so "leftmost partition with at least k free" is one walk from the root.
+
+class MaxSegmentTree:
+    def __init__(self, values):
+        self.count = len(values)
+        size = 1
+        while size < self.count:
+            size *= 2
+        self.size = size
+        self.tree = [-1] * (2 * size)
+        self.tree[size:size + self.count] = values
+        for node in range(size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def __len__(self):
+        return self.count
+
+    def get(self, index):
+        return self.tree[self.size + index]
+
+    def update(self, index, value):
+        tree = self.tree
+        node = self.size + index
+        tree[node] = value
+        node //= 2
+        while node:
+            best = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == best:
+                break
+            tree[node] = best
+            node //= 2
+
+    def find_first(self, k, start=0):
+        # Index of the leftmost value >= k at or after start, or -1
+        tree = self.tree
+        if self.count == 0 or tree[1] < k or start >= self.count:
+            return -1
+        if start <= 0:
+            node = 1
+        else:
+            # Climb from the start leaf to the first subtree on its right that holds k
+            node = self.size + start
+            if tree[node] >= k:
+                return start
+            while True:
+                while node & 1:
+                    node //= 2
+                    if node == 0:
+                        return -1
+                node += 1
+                if tree[node] >= k:
+                    break
+        while node < self.size:
+            node *= 2
+            if tree[node] < k:
+                node += 1
+        return node - self.size
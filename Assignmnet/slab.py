@@ -0,0 +1,158 @@
+from bisect import bisect_left
+
+# Slab layer for the variable-partition allocators.
+#
+# Requests up to the largest size class are rounded up to a class and served from a cache of
+# slabs, each slab being one extent carved from the allocator's FreeList and cut into
+# objects_per_slab equal objects. A cache keeps its slabs on three lists (partial, full, empty)
+# and every slab knows its position in its list, so allocating or freeing an object is O(1) and
+# never splits or coalesces free extents. Empty slabs beyond keep_empty per cache go straight back
+# to the FreeList; reclaim() returns the rest, which the managers do before failing a request.
+#
+# A hit is an object served from a slab the cache already had, a miss one that needed a new slab
+# carved, and a bypass a request too large for any class.
+
+SIZE_CLASSES = [1 << k for k in range(9)]
+
+class _Slab:
+    __slots__ = ('start', 'free', 'in_use', 'position')
+
+    def __init__(self, start, object_size, count):
+        self.start = start
+        self.free = list(range(start + (count - 1) * object_size, start - 1, -object_size))
+        self.in_use = 0
+        self.position = -1
+
+def _push(slabs, slab):
+    slab.position = len(slabs)
+    slabs.append(slab)
+
+def _drop(slabs, slab):
+    last = slabs.pop()
+    if last is not slab:
+        slabs[slab.position] = last
+        last.position = slab.position
+
+class SlabCache:
+    def __init__(self, object_size, objects_per_slab):
+        self.object_size = object_size
+        self.objects_per_slab = objects_per_slab
+        self.slab_size = object_size * objects_per_slab
+        self.partial = []
+        self.full = []
+        self.empty = []
+        self.hits = 0
+        self.misses = 0
+
+    def allocate(self, free_blocks):
+        # (address, slab) of a free object, or None when no slab can be carved
+        if self.partial:
+            slab = self.partial[-1]
+            self.hits += 1
+        elif self.empty:
+            slab = self.empty.pop()
+            _push(self.partial, slab)
+            self.hits += 1
+        else:
+            # Best fit keeps the large free extents whole for the general allocator
+            start = free_blocks.find_best(self.slab_size)
+            if start is None:
+                return None
+            slab = _Slab(free_blocks.take(start, self.slab_size), self.object_size, self.objects_per_slab)
+            _push(self.partial, slab)
+            self.misses += 1
+        slab.in_use += 1
+        address = slab.free.pop()
+        if not slab.free:
+            _drop(self.partial, slab)
+            _push(self.full, slab)
+        return address, slab
+
+    def free(self, slab, address):
+        # True when the slab became empty
+        if slab.in_use == self.objects_per_slab:
+            _drop(self.full, slab)
+            _push(self.partial, slab)
+        slab.free.append(address)
+        slab.in_use -= 1
+        if slab.in_use:
+            return False
+        _drop(self.partial, slab)
+        _push(self.empty, slab)
+        return True
+
+    def cached(self):
+        # Units held in free objects of this cache
+        slabs = len(self.partial) + len(self.full) + len(self.empty)
+        in_use = sum(slab.in_use for slab in self.partial) + self.objects_per_slab * len(self.full)
+        return (slabs * self.objects_per_slab - in_use) * self.object_size
+
+class SlabAllocator:
+    def __init__(self, free_blocks, size_classes=SIZE_CLASSES, objects_per_slab=8, keep_empty=1):
+        self.free_blocks = free_blocks
+        self.size_classes = sorted(set(size_classes))
+        self.caches = [SlabCache(size, objects_per_slab) for size in self.size_classes]
+        self.keep_empty = keep_empty
+        self.objects = {}  # address of a live object -> (cache, slab)
+        self.bypasses = 0
+        self.reclaimed = 0  # slabs returned to the free list
+
+    def __contains__(self, address):
+        return address in self.objects
+
+    def cache_for(self, size):
+        i = bisect_left(self.size_classes, size)
+        return self.caches[i] if i < len(self.caches) else None
+
+    def allocate(self, size):
+        # Address of an object of at least size, or None when the request is left to the free list
+        cache = self.cache_for(size)
+        if cache is None:
+            self.bypasses += 1
+            return None
+        found = cache.allocate(self.free_blocks)
+        if found is None:
+            return None
+        address, slab = found
+        self.objects[address] = (cache, slab)
+        return address
+
+    def free(self, address):
+        cache, slab = self.objects.pop(address)
+        if cache.free(slab, address) and len(cache.empty) > self.keep_empty:
+            self._release(cache, cache.empty.pop())
+
+    def extents(self):
+        # (start, size, object size) of every slab, empty ones included
+        for cache in self.caches:
+            for slab in cache.partial + cache.full + cache.empty:
+                yield slab.start, cache.slab_size, cache.object_size
+
+    def reclaim(self):
+        # Returns every empty slab to the free list; the number of units released
+        released = 0
+        for cache in self.caches:
+            while cache.empty:
+                self._release(cache, cache.empty.pop())
+                released += cache.slab_size
+        return released
+
+    def _release(self, cache, slab):
+        self.free_blocks.release(slab.start, cache.slab_size)
+        self.reclaimed += 1
+
+    def hit_rate(self):
+        hits = sum(cache.hits for cache in self.caches)
+        served = hits + sum(cache.misses for cache in self.caches)
+        return hits / served if served else 0.0
+
+    def stats(self):
+        return {
+            'hits': sum(cache.hits for cache in self.caches),
+            'misses': sum(cache.misses for cache in self.caches),
+            'bypasses': self.bypasses,
+            'hit_rate': self.hit_rate(),
+            'slabs': sum(len(cache.partial) + len(cache.full) + len(cache.empty) for cache in self.caches),
+            'reclaimed': self.reclaimed,
+            'cached': sum(cache.cached() for cache in self.caches),
+        }
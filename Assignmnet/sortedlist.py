@@ -0,0 +1,84 @@
+from bisect import bisect_left, bisect_right, insort
+
+# Sorted container used by the indexed allocators. Values are kept in a list of sorted buckets of
+# at most 2 * load items plus a list of bucket maxima, so a lookup is two binary searches and an
+# insert or delete only shifts one small bucket instead of the whole sequence.
+
+class SortedList:
+    def __init__(self, values=(), load=512):
+        values = sorted(values)
+        self.load = load
+        self.buckets = [values[i:i + load] for i in range(0, len(values), load)]
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+        self.size = len(values)
+
+    def add(self, value):
+        buckets, maxes = self.buckets, self.maxes
+        self.size += 1
+        if not buckets:
+            buckets.append([value])
+            maxes.append(value)
+            return
+        i = bisect_left(maxes, value)
+        if i == len(maxes):
+            i -= 1
+        bucket = buckets[i]
+        insort(bucket, value)
+        maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self.load:
+            half = bucket[self.load:]
+            del bucket[self.load:]
+            buckets.insert(i + 1, half)
+            maxes[i] = bucket[-1]
+            maxes.insert(i + 1, half[-1])
+
+    def remove(self, value):
+        buckets, maxes = self.buckets, self.maxes
+        i = bisect_left(maxes, value)
+        if i == len(maxes):
+            raise ValueError(f'{value!r} not in list')
+        bucket = buckets[i]
+        j = bisect_left(bucket, value)
+        if j == len(bucket) or bucket[j] != value:
+            raise ValueError(f'{value!r} not in list')
+        del bucket[j]
+        self.size -= 1
+        if bucket:
+            maxes[i] = bucket[-1]
+        else:
+            del buckets[i]
+            del maxes[i]
+
+    def ceiling(self, value):
+        # Smallest item >= value, or None
+        i = bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            return None
+        bucket = self.buckets[i]
+        return bucket[bisect_left(bucket, value)]
+
+    def floor(self, value):
+        # Largest item <= value, or None
+        i = bisect_left(self.maxes, value)
+        if i < len(self.maxes) and self.buckets[i][0] <= value:
+            bucket = self.buckets[i]
+            return bucket[bisect_right(bucket, value) - 1]
+        if i == 0:
+            return None
+        return self.buckets[i - 1][-1]
+
+    def min(self):
+        return self.buckets[0][0] if self.buckets else None
+
+    def max(self):
+        return self.maxes[-1] if self.maxes else None
+
+    def __contains__(self, value):
+        return self.ceiling(value) == value
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for bucket in self.buckets:
+            yield from bucket
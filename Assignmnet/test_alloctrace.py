@@ -0,0 +1,90 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import alloctrace
+import asdas
+import bench
+from alloctrace import ALLOC, FREE, Recorder, process_args, records
+
+# Traces recorded, decoded and replayed, e.g.
+#   python -m pytest test_alloctrace.py
+
+def config(**options):
+    values = dict(partitions=20, max_size=16, page_size=4, requests=400, occupancy=0.7, recurring=0, seed=0,
+                  allocator='asdas.dynamic', sample_every=0, stats=True, series=None)
+    values.update(options)
+    values['total_memory'] = values['partitions'] * values['max_size']
+    return argparse.Namespace(**values)
+
+def read(path):
+    with open(path, 'rb') as file:
+        return [(op, pid, size) for op, pid, size, timestamp in records(file.read())]
+
+class AllocTraceTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'run.trace')
+
+    def test_wrap_round_trip(self):
+        calls = []
+        with Recorder(self.path) as recorder:
+            allocate, free = recorder.wrap(lambda pid, size: calls.append((pid, size)) or True,
+                                           lambda pid: calls.append(pid))
+            self.assertTrue(allocate(7, 12))
+            allocate('editor', 3)
+            free(7)
+            allocate('shell', 5)
+            free('editor')
+        self.assertEqual(calls, [(7, 12), ('editor', 3), 7, ('shell', 5), 'editor'])
+        # Names are numbered in order of appearance
+        self.assertEqual(read(self.path), [(ALLOC, 7, 12), (ALLOC, 0, 3), (FREE, 7, 0), (ALLOC, 1, 5), (FREE, 0, 0)])
+        with open(self.path, 'rb') as file:
+            timestamps = [timestamp for op, pid, size, timestamp in records(file.read())]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_hook(self):
+        memory = asdas.DynamicMemoryAllocation(100)
+        with Recorder(self.path) as recorder:
+            recorder.hook(memory, request=process_args)
+            self.assertTrue(memory.allocate(asdas.Process('a', 40), 'best_fit'))
+            self.assertFalse(memory.allocate(asdas.Process('b', 70)))
+            self.assertTrue(memory.deallocate('a'))
+        self.assertEqual(read(self.path), [(ALLOC, 0, 40), (ALLOC, 1, 70), (FREE, 0, 0)])
+        self.assertEqual(memory.free_space(), (100, 100))
+
+    def test_not_a_trace(self):
+        with self.assertRaises(ValueError):
+            list(records(b'NOPE\x01\x00\x00\x00'))
+
+    def test_replay_matches_bench(self):
+        options = config()
+        ops = bench.make_stream(400, options.total_memory, options.max_size)
+        self.assertEqual(alloctrace.record_stream(self.path, options), len(ops))
+        for name in ('asdas.dynamic', 'Memory.dynamic.best', 'asdas.buddy', 'fixxed.best_fit'):
+            result = alloctrace.evaluate(self.path, name, options)
+            expected = bench.fragmentation(bench.TARGETS[name], options, ops)
+            for key in ('failures', 'used', 'live_requested', 'external_fragmentation'):
+                self.assertEqual(result[key], expected[key], (name, key))
+            self.assertEqual(result['comparable'], not name.startswith('fixxed'))
+
+    def test_main(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            alloctrace.main(['--partitions', '20', '--max-size', '16', 'record', self.path, '--requests', '300'])
+            alloctrace.main(['--partitions', '20', '--max-size', '16', 'replay', self.path, '--workers', '2',
+                             '--allocators', 'asdas.dynamic', 'fixedsized.first_fit'])
+        lines = output.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('Recorded '))
+        self.assertEqual([line.split()[0] for line in lines[2:4]], ['asdas.dynamic', 'fixedsized.first_fit'])
+        self.assertEqual(lines[3].split()[1], '*')
+        self.assertTrue(lines[4].startswith('* no free operation'))
+
+if __name__ == '__main__':
+    unittest.main()
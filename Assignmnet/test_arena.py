@@ -0,0 +1,112 @@
+import argparse
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import arena
+from arena import ArenaDynamicManager, ArenaPagingManager
+
+# The arena managers from one and from several threads, e.g.
+#   python -m pytest test_arena.py
+
+def in_thread(function, *args):
+    # Runs function on a new thread, which gets the next home arena
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function(*args)))
+    thread.start()
+    thread.join()
+    return result[0]
+
+def blocks(manager, pid):
+    lock, owned = manager._shard(pid)
+    return [(manager.arenas.index(owner), memory) for owner, memory in owned[pid]]
+
+class ArenaDynamicManagerTest(unittest.TestCase):
+    def test_home_arena_then_borrow(self):
+        manager = ArenaDynamicManager(100, arenas=4)
+        self.assertTrue(manager.allocate(1, 20))
+        self.assertTrue(manager.allocate(2, 20))
+        self.assertEqual(blocks(manager, 1), [(0, (0, 20))])
+        self.assertEqual(blocks(manager, 2), [(1, (25, 20))])
+        self.assertTrue(in_thread(manager.allocate, 3, 5))
+        # The second thread's home is arena 1
+        self.assertEqual(blocks(manager, 3), [(1, (45, 5))])
+        self.assertEqual(manager.stats()['stolen'], 1)
+
+    def test_rejects_non_positive_sizes(self):
+        manager = ArenaDynamicManager(100, arenas=4)
+        self.assertFalse(manager.allocate(1, 0))
+        self.assertFalse(manager.allocate(2, -3))
+        self.assertFalse(manager.deallocate(1))
+        self.assertEqual(manager.free_space(), (100, 25))
+
+    def test_spanning_slow_path(self):
+        manager = ArenaDynamicManager(100, arenas=4)
+        self.assertTrue(manager.allocate(1, 10))
+        self.assertTrue(manager.allocate(2, 60))
+        # The free tail of arena 0, all of arena 1 and the head of arena 2
+        self.assertEqual(blocks(manager, 2), [(0, (10, 15)), (1, (25, 25)), (2, (50, 20))])
+        self.assertEqual(manager.stats()['spanned'], 1)
+        self.assertFalse(manager.allocate(3, 60))
+        self.assertTrue(manager.deallocate(2))
+        self.assertTrue(manager.deallocate(1))
+        self.assertEqual(manager.free_space(), (100, 25))
+        self.assertTrue(manager.allocate(4, 100))
+
+    def test_deferred_remote_free(self):
+        manager = ArenaDynamicManager(100, arenas=2, defer=True)
+        self.assertTrue(manager.allocate(1, 10))
+        self.assertTrue(in_thread(manager.allocate, 2, 10))
+        # Freed away from its home arena: queued until that arena's lock is next taken
+        self.assertTrue(manager.deallocate(2))
+        self.assertEqual(len(manager.arenas[1].remote), 1)
+        self.assertEqual(manager.arenas[1].free_blocks.free_space(), (40, 40))
+        self.assertEqual(manager.free_space(), (90, 50))
+        self.assertEqual(manager.stats()['remote_frees'], 1)
+        # Freed at home: straight back
+        self.assertTrue(manager.deallocate(1))
+        self.assertEqual(len(manager.arenas[0].remote), 0)
+        self.assertEqual(manager.stats()['remote_frees'], 1)
+
+    def test_remote_free_while_locked(self):
+        manager = ArenaDynamicManager(100, arenas=2)
+        self.assertTrue(manager.allocate(1, 10))
+        with manager.arenas[0].lock:
+            self.assertTrue(manager.deallocate(1))
+            self.assertEqual(len(manager.arenas[0].remote), 1)
+        # The next allocation from the arena drains the queue first
+        self.assertTrue(manager.allocate(2, 50))
+        self.assertEqual(blocks(manager, 2), [(0, (0, 50))])
+        self.assertEqual(manager.stats()['remote_frees'], 1)
+
+class ArenaPagingManagerTest(unittest.TestCase):
+    def test_frames_from_several_arenas(self):
+        manager = ArenaPagingManager(64, 4, arenas=4)
+        self.assertFalse(manager.allocate(1, 0))
+        self.assertTrue(manager.allocate(1, 24))
+        self.assertEqual([(i, list(frames)) for i, frames in blocks(manager, 1)],
+                         [(0, [0, 1, 2, 3]), (1, [0, 1])])
+        self.assertEqual(manager.free_space(), (40, 40))
+        # Not enough frames left: the partial pieces go back
+        self.assertFalse(manager.allocate(2, 44))
+        self.assertEqual(manager.free_space(), (40, 40))
+        self.assertTrue(manager.deallocate(1))
+        self.assertEqual(manager.free_space(), (64, 64))
+
+class StressTest(unittest.TestCase):
+    def test_everything_drains_back(self):
+        config = argparse.Namespace(ops=2000, live=16, max_size=16, cross=0.5, seed=0)
+        for defer in (False, True):
+            for kind in ('dynamic', 'paging'):
+                manager = arena.arena_manager(kind, 4 * 16 * 16 * 2, 4, 4, defer)
+                empty = manager.free_space()
+                ops_per_sec, failures = arena.run_stress(manager, 4, config)
+                self.assertEqual(manager.free_space(), empty, (kind, defer))
+                self.assertEqual(manager.shards, [(lock, {}) for lock, owned in manager.shards])
+                if defer:
+                    self.assertGreater(manager.stats()['remote_frees'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
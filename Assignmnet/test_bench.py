@@ -0,0 +1,78 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench
+import dar
+
+# The benchmark runner on small streams, e.g.
+#   python -m pytest test_bench.py
+
+class Config:
+    partitions, max_size, page_size, sample_every = 50, 16, 4, 10
+    total_memory = partitions * max_size
+    stats, series, memory = True, None, False
+
+class StreamTest(unittest.TestCase):
+    def test_stream_stays_under_occupancy(self):
+        ops = bench.make_stream(5000, 1000, 64, occupancy=0.5, seed=3)
+        live = {}
+        for op, pid, size in ops:
+            if op == 'alloc':
+                self.assertNotIn(pid, live)
+                self.assertTrue(1 <= size <= 64)
+                live[pid] = size
+                self.assertLessEqual(sum(live.values()), 500)
+            else:
+                del live[pid]
+        self.assertEqual(sum(op == 'alloc' for op, pid, size in ops), 5000)
+        self.assertEqual(ops, bench.make_stream(5000, 1000, 64, occupancy=0.5, seed=3))
+
+    def test_recurring_sizes(self):
+        ops = bench.make_stream(1000, 1000, 64, seed=1, recurring=3)
+        self.assertLessEqual(len({size for op, pid, size in ops if op == 'alloc'}), 3)
+
+class BenchmarkTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(dar, 'messagebox')
+        self.messagebox = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_every_target(self):
+        ops = bench.make_stream(300, Config.total_memory, Config.max_size)
+        allocations = sum(op == 'alloc' for op, pid, size in ops)
+        for name in bench.TARGETS:
+            result = bench.benchmark(name, Config, ops)
+            self.assertGreaterEqual(result['calls'], allocations, name)
+            self.assertLessEqual(result['failures'], allocations, name)
+            stats = result['stats']
+            self.assertTrue(0 <= stats['utilisation'] <= 1, name)
+            self.assertTrue(0 <= stats['external_fragmentation'] <= 1, name)
+        self.messagebox.showerror.assert_not_called()
+
+    def test_fixxed_batch_matches_one_request_per_call(self):
+        ops = bench.make_stream(500, Config.total_memory, Config.max_size)
+        sizes = [size for op, pid, size in ops if op == 'alloc']
+        for name in ('fixxed.first_fit', 'fixxed.best_fit', 'fixxed.worst_fit'):
+            place, free, free_space = bench.TARGETS[name](Config)
+            failures = place(sizes)
+            batch = free_space()
+            place, free, free_space = bench.TARGETS[name](Config)
+            self.assertEqual(sum(place([size]) for size in sizes), failures, name)
+            self.assertEqual(free_space(), batch, name)
+
+    def test_main(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            bench.main(['--sizes', '200', '--partitions', '20', '--no-memory', '--stats',
+                        '--allocators', 'asdas.dynamic', 'fixxed.best_fit'])
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[1], '-- 200 requests')
+        self.assertEqual([line.split()[0] for line in lines[2:]], ['asdas.dynamic', 'fixxed.best_fit'])
+
+if __name__ == '__main__':
+    unittest.main()
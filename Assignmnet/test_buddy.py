@@ -0,0 +1,73 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import asdas
+from buddy import BuddyAllocator
+
+# BuddyAllocator checked against a unit map, e.g.
+#   python -m pytest test_buddy.py
+
+class BuddyAllocatorTest(unittest.TestCase):
+    def test_against_unit_map(self):
+        rng = random.Random(2)
+        for trial in range(60):
+            total = rng.randint(1, 300)
+            min_block_size = rng.choice([1, 2, 4])
+            allocator = BuddyAllocator(total, min_block_size)
+            initial = allocator.blocks()
+            units = [None] * allocator.total_size
+            for step in range(200):
+                if allocator.allocated and rng.random() < 0.45:
+                    start = rng.choice(list(allocator.allocated))
+                    size = allocator.block_size(start)
+                    allocator.free(start)
+                    units[start:start + size] = [None] * size
+                else:
+                    size = rng.randint(0, 70)
+                    start = allocator.allocate(size)
+                    if size <= 0:
+                        self.assertIsNone(start)
+                        continue
+                    block = max(min_block_size, 1 << (size - 1).bit_length())
+                    free = [length for start_free, length, is_free in allocator.blocks() if is_free]
+                    if start is None:
+                        # Fails only when every free block is too small
+                        self.assertTrue(all(length < block for length in free))
+                        continue
+                    self.assertEqual(allocator.block_size(start), block)
+                    self.assertEqual(start % block, 0)
+                    self.assertEqual(units[start:start + block], [None] * block)
+                    units[start:start + block] = [start] * block
+                blocks = allocator.blocks()
+                self.assertEqual(sum(size for start, size, is_free in blocks), allocator.total_size)
+                address = 0
+                for start, size, is_free in blocks:
+                    self.assertEqual(start, address)
+                    self.assertEqual(units[start:start + size], [None if is_free else start] * size)
+                    address += size
+                self.assertEqual(allocator.free_space()[0], units.count(None))
+            # Freeing everything merges the buddies back into the starting roots
+            for start in list(allocator.allocated):
+                allocator.free(start)
+            self.assertEqual(allocator.blocks(), initial)
+
+class BuddySystemTest(unittest.TestCase):
+    def test_rejects_non_positive_sizes(self):
+        memory = asdas.BuddySystem(64)
+        self.assertFalse(memory.allocate(asdas.Process(1, 0)))
+        self.assertFalse(memory.allocate(asdas.Process(2, -4)))
+        self.assertEqual(memory.free_space(), (64, 64))
+
+    def test_non_power_of_two_total(self):
+        # 12 units: an 8-unit root at 0 and a 4-unit root at 8
+        allocator = BuddyAllocator(12)
+        self.assertEqual(allocator.blocks(), [(0, 8, True), (8, 4, True)])
+        self.assertEqual(allocator.allocate(4), 8)
+        self.assertEqual(allocator.allocate(8), 0)
+        self.assertIsNone(allocator.allocate(1))
+
+if __name__ == '__main__':
+    unittest.main()
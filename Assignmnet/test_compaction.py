@@ -0,0 +1,161 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Memory Management'))
+import asdas
+import Memory
+from compaction import Compactor
+from freelist import FreeList
+
+# Compaction in both dynamic managers under random workloads, e.g.
+#   python -m pytest test_compaction.py
+
+class CompactorTest(unittest.TestCase):
+    def make(self, blocks, total, mode='on_demand'):
+        # A FreeList of everything outside blocks (start -> size) and a Compactor that moves them
+        free_blocks = FreeList()
+        address = 0
+        for start, size in sorted(blocks.items()) + [(total, 0)]:
+            if start > address:
+                free_blocks.add(address, start - address)
+            address = start + size
+
+        def relocate(moves):
+            moved = [(new, blocks.pop(old)) for old, new, size in moves]
+            blocks.update(moved)
+        return free_blocks, Compactor(free_blocks, blocks.items, blocks.get, relocate, mode)
+
+    def test_moves_the_cheapest_window(self):
+        # 0-10 used, 10-12 free, 12-13 used, 13-15 free, 15-30 used: sliding the 1-unit block is enough
+        blocks = {0: 10, 12: 1, 15: 15}
+        free_blocks, compactor = self.make(blocks, 30)
+        self.assertEqual(compactor.make_room(4), 11)
+        self.assertEqual(blocks, {0: 10, 10: 1, 15: 15})
+        self.assertEqual(list(free_blocks), [(11, 4)])
+        self.assertEqual(compactor.stats(), {'compactions': 1, 'steps': 0, 'moves': 1, 'moved': 1})
+
+    def test_not_enough_free_memory(self):
+        blocks = {0: 10, 12: 1, 15: 15}
+        free_blocks, compactor = self.make(blocks, 30)
+        self.assertIsNone(compactor.make_room(5))
+        self.assertEqual(compactor.stats()['moves'], 0)
+
+    def test_pinned_memory_splits_windows(self):
+        # 5-8 is occupied but not movable: the two 2-unit holes around it cannot be joined
+        blocks = {0: 3, 10: 2}
+        free_blocks, compactor = self.make(blocks, 12)
+        free_blocks.remove(3)
+        free_blocks.add(3, 2)
+        free_blocks.add(8, 2)
+        self.assertIsNone(compactor.make_room(4))
+        self.assertEqual(compactor.make_room(2), 3)
+
+    def test_background_step(self):
+        blocks = {2: 3, 7: 3}
+        free_blocks, compactor = self.make(blocks, 12, 'background')
+        self.assertEqual(compactor.step(), 6)
+        self.assertEqual(blocks, {0: 3, 3: 3})
+        self.assertEqual(list(free_blocks), [(6, 6)])
+        # Nothing left to do once the free memory is one extent
+        self.assertEqual(compactor.step(), 0)
+
+class CompactionTest(unittest.TestCase):
+    # Without slabs nothing is pinned, so an on-demand compactor makes any request fit that the
+    # free space can hold
+    def run_workload(self, memory, allocate, blocks, seed, mode, size_classes):
+        rng = random.Random(seed)
+        total = memory.free_blocks.free_space()[0]
+        live = {}
+        for pid in range(600):
+            if live and (rng.random() < 0.4 or sum(live.values()) > 0.9 * total):
+                victim = rng.choice(list(live))
+                memory.deallocate(victim)
+                del live[victim]
+            else:
+                size = rng.choice([1, 3, 5, 10, 20, 40, 60])
+                free = memory.free_blocks.free_space()[0]
+                ok = allocate(pid, size)
+                if mode is not None and size_classes is None:
+                    self.assertEqual(ok, free >= size)
+                if ok:
+                    live[pid] = size
+            self.check(memory, blocks(memory), total, live)
+        for pid in list(live):
+            memory.deallocate(pid)
+        if memory.slabs is not None:
+            memory.slabs.reclaim()
+        self.assertEqual(list(memory.free_blocks), [(0, total)])
+
+    def check(self, memory, blocks, total, live):
+        extents = sorted(blocks + list(memory.free_blocks))
+        for (start, size), (next_start, next_size) in zip(extents, extents[1:]):
+            self.assertLessEqual(start + size, next_start)
+        # Slab objects are counted through the slabs holding them
+        used = sum(size for start, size in blocks if memory.slabs is None or start not in memory.slabs)
+        if memory.slabs is not None:
+            used += sum(size for start, size, object_size in memory.slabs.extents())
+        self.assertEqual(used + memory.free_blocks.free_space()[0], total)
+        self.assertEqual(sum(live.values()), sum(size for start, size in blocks))
+
+    def test_asdas_dynamic(self):
+        for mode in [None, 'on_demand', 'background']:
+            for size_classes in [None, [1, 2, 4, 8]]:
+                for seed in range(4):
+                    memory = asdas.DynamicMemoryAllocation(500, size_classes, mode)
+
+                    def blocks(memory):
+                        found = [block for allocations in memory.partitions.values()
+                                 for allocation in allocations for block in allocation['blocks']]
+                        # block_owners holds exactly the blocks outside the slabs, at their current start
+                        outside = {start: size for start, size in found
+                                   if memory.slabs is None or start not in memory.slabs}
+                        self.assertEqual({start: allocation['memory_required']
+                                          for start, allocation in memory.block_owners.items()}, outside)
+                        for start, allocation in memory.block_owners.items():
+                            self.assertEqual(allocation['blocks'], [(start, allocation['memory_required'])])
+                        return found
+
+                    allocate = lambda pid, size: memory.allocate(asdas.Process(pid, size))
+                    self.run_workload(memory, allocate, blocks, seed, mode, size_classes)
+
+    def test_memory_dynamic(self):
+        for mode in [None, 'on_demand', 'background']:
+            for size_classes in [None, [1, 2, 4, 8]]:
+                for seed in range(4):
+                    memory = Memory.DynamicMemoryManager(500, size_classes, mode)
+
+                    def blocks(memory):
+                        # process_blocks names exactly the allocated starts, each under its owner
+                        owners = memory.process_blocks.owners()
+                        self.assertEqual(set(owners), set(memory.allocated))
+                        for start, pid in owners.items():
+                            self.assertEqual(memory.allocated[start].start, start)
+                            self.assertEqual(memory.allocated[start].process_id, pid)
+                        return [(block.start, block.size) for block in memory.allocated.values()]
+
+                    self.run_workload(memory, memory.allocate_first_fit, blocks, seed, mode, size_classes)
+
+    def test_zero_size_requests(self):
+        # Rejected up front, so no zero-length blocks share a start in block_owners
+        for mode in [None, 'on_demand', 'background']:
+            memory = asdas.DynamicMemoryAllocation(100, compaction=mode)
+            self.assertFalse(memory.allocate(asdas.Process(1, 0)))
+            self.assertFalse(memory.allocate(asdas.Process(2, 0)))
+            self.assertTrue(memory.allocate(asdas.Process(3, 10)))
+            for pid in (1, 2, 3):
+                memory.deallocate(pid)
+            self.assertEqual(memory.block_owners, {})
+            self.assertEqual(list(memory.free_blocks), [(0, 100)])
+
+            manager = Memory.DynamicMemoryManager(100, compaction=mode)
+            self.assertFalse(manager.allocate_first_fit(1, 0))
+            self.assertFalse(manager.allocate_first_fit(2, 0))
+            for pid in (1, 2):
+                manager.deallocate(pid)
+            self.assertEqual(list(manager.free_blocks), [(0, 100)])
+
+if __name__ == '__main__':
+    unittest.main()
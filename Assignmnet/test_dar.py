@@ -0,0 +1,99 @@
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import dar
+from placement import STRATEGIES
+
+# dar's managers on the shared placement engine, e.g.
+#   python -m pytest test_dar.py
+#
+# Failed allocations open a tkinter dialog, so every test replaces dar.messagebox.
+
+def owners(manager):
+    # The owner of every unit, from the memory map
+    units = []
+    for start, end, process_id in manager.memory.runs():
+        units.extend([process_id] * (end - start))
+    return units
+
+class DarTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(dar, 'messagebox')
+        self.messagebox = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unequal_strategies(self):
+        expected = {'first_fit': 0, 'next_fit': 0, 'best_fit': 2, 'worst_fit': 1, 'segregated_fit': 0}
+        for strategy in STRATEGIES:
+            manager = dar.UnequalSizePartitioning(100, [30, 50, 20])
+            self.assertTrue(manager.allocate(1, 15, strategy))
+            self.assertEqual(manager.occupants.index(1), expected[strategy], strategy)
+        manager = dar.UnequalSizePartitioning(100, [30, 50, 20])
+        self.assertFalse(manager.allocate(1, 60))
+        self.messagebox.showerror.assert_called_once()
+        self.assertTrue(manager.allocate(1, 40))
+        self.assertEqual(owners(manager), [None] * 30 + [1] * 50 + [None] * 20)
+        manager.deallocate(1)
+        self.assertEqual(owners(manager), [None] * 100)
+        self.assertEqual(manager.free_space(), (100, 50))
+
+    def test_dynamic_against_unit_map(self):
+        rng = random.Random(0)
+        for strategy in STRATEGIES:
+            manager = dar.DynamicMemoryAllocation(200)
+            units = [None] * 200
+            live = []
+            for pid in range(300):
+                if live and rng.random() < 0.45:
+                    victim = live.pop(rng.randrange(len(live)))
+                    manager.deallocate(victim)
+                    units = [None if owner == victim else owner for owner in units]
+                else:
+                    size = rng.randint(1, 40)
+                    free_run = max(len(run) for run in ''.join('.' if owner is None else '#'
+                                                               for owner in units).split('#'))
+                    self.assertEqual(manager.allocate(pid, size, strategy), free_run >= size, strategy)
+                    if free_run >= size:
+                        start, length = manager.process_blocks.get(pid)[0]
+                        self.assertEqual(units[start:start + size], [None] * size)
+                        units[start:start + size] = [pid] * size
+                        live.append(pid)
+                self.assertEqual(owners(manager), units)
+                self.assertEqual(manager.free_space()[0], units.count(None))
+
+    def test_dynamic_rejects_non_positive_sizes(self):
+        manager = dar.DynamicMemoryAllocation(100)
+        self.assertFalse(manager.allocate(1, 0))
+        self.assertFalse(manager.allocate(2, -5))
+        self.assertEqual(list(manager.free_blocks), [(0, 100)])
+
+    def test_paging(self):
+        manager = dar.Paging(64, 8)
+        self.assertTrue(manager.allocate(1, 20))
+        self.assertTrue(manager.allocate(2, 8))
+        self.assertEqual(list(manager.page_table[1]), [0, 1, 2])
+        self.assertEqual(manager.free_space(), (32, 32))
+        self.assertFalse(manager.allocate(3, 40))
+        manager.deallocate(1)
+        self.assertTrue(manager.allocate(3, 40))
+        self.assertEqual(owners(manager), [3] * 24 + [2] * 8 + [3] * 16 + [None] * 16)
+        manager.deallocate(2)
+        manager.deallocate(3)
+        self.assertEqual(manager.free_space(), (64, 64))
+
+    def test_bench_target_leaves_module_alone(self):
+        import bench
+
+        class Config:
+            partitions, max_size, total_memory, page_size = 10, 8, 80, 4
+        allocate, free, free_space = bench.TARGETS['dar.fixed'](Config)
+        self.assertFalse(allocate(1, 100))
+        self.assertIs(dar.messagebox, self.messagebox)
+        self.messagebox.showerror.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
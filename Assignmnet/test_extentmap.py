@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from extentmap import ExtentMap
+
+# The run-length memory map checked against one owner per unit, e.g.
+#   python -m pytest test_extentmap.py
+
+def expand(memory):
+    units = []
+    for start, end, owner in memory.runs():
+        units.extend([owner] * (end - start))
+    return units
+
+class ExtentMapTest(unittest.TestCase):
+    def test_against_units(self):
+        rng = random.Random(0)
+        for total in (1, 2, 17, 100):
+            memory = ExtentMap(total)
+            units = [None] * total
+            for step in range(500):
+                start = rng.randrange(total)
+                length = rng.randint(0, total)
+                owner = rng.choice([None, 'a', 'b', 'c'])
+                if owner is None:
+                    memory.free(start, length)
+                else:
+                    memory.assign(start, length, owner)
+                end = min(start + length, total)
+                units[start:end] = [owner] * (end - start)
+
+                self.assertEqual(expand(memory), units)
+                index = rng.randrange(total)
+                self.assertEqual(memory[index], units[index])
+                runs = list(memory.runs())
+                # Minimal: neighbouring runs never share an owner
+                for (_, _, left), (_, _, right) in zip(runs, runs[1:]):
+                    self.assertNotEqual(left, right)
+
+    def test_index_out_of_range(self):
+        memory = ExtentMap(4, owner='a')
+        self.assertEqual(len(memory), 4)
+        with self.assertRaises(IndexError):
+            memory[4]
+        with self.assertRaises(IndexError):
+            memory[-1]
+
+    def test_empty(self):
+        memory = ExtentMap(0)
+        memory.assign(0, 5, 'a')
+        self.assertEqual(list(memory.runs()), [])
+
+    def test_runs(self):
+        memory = ExtentMap(10)
+        memory.assign(2, 3, 'a')
+        memory.assign(5, 2, 'a')
+        memory.assign(8, 10, 'b')
+        self.assertEqual(list(memory.runs()), [(0, 2, None), (2, 7, 'a'), (7, 8, None), (8, 10, 'b')])
+        memory.free(0, 10)
+        self.assertEqual(list(memory.runs()), [(0, 10, None)])
+
+if __name__ == '__main__':
+    unittest.main()
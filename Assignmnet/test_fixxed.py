@@ -0,0 +1,102 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fixxed
+from placement import PartitionIndex
+from sortedlist import SortedList
+
+# Indexed fixxed placement checked against linear scans, e.g.
+#   python -m pytest test_fixxed.py
+
+PARTITIONS = [100, 500, 200, 300, 600]
+PROCESSES = [212, 417, 112, 426]
+
+def scan(partitions, processes, choose):
+    # The original loops: choose picks among (remaining, index) of the partitions that fit
+    allocation = []
+    for size in processes:
+        fits = [(remaining, j) for j, remaining in enumerate(partitions) if remaining >= size]
+        if fits:
+            remaining, j = choose(fits)
+            partitions[j] -= size
+            allocation.append(j)
+        else:
+            allocation.append(-1)
+    return allocation
+
+SCANS = {
+    'first_fit': lambda fits: fits[0],
+    'best_fit': min,
+    # Largest remaining, lowest index on ties
+    'worst_fit': lambda fits: min(fits, key=lambda fit: (-fit[0], fit[1])),
+}
+
+class FixxedTest(unittest.TestCase):
+    def test_textbook_example(self):
+        expected = {'first_fit': [1, 4, 1, -1], 'best_fit': [3, 1, 2, 4], 'worst_fit': [4, 1, 4, -1]}
+        for strategy, allocation in expected.items():
+            self.assertEqual(getattr(fixxed, strategy)(PARTITIONS[:], PROCESSES), allocation, strategy)
+
+    def test_against_scan(self):
+        rng = random.Random(0)
+        for strategy, choose in SCANS.items():
+            for trial in range(20):
+                partitions = [rng.randint(0, 50) for _ in range(rng.randint(1, 40))]
+                processes = [rng.randint(1, 30) for _ in range(60)]
+                expected_partitions = partitions[:]
+                expected = scan(expected_partitions, processes, choose)
+                self.assertEqual(getattr(fixxed, strategy)(partitions, processes), expected, strategy)
+                self.assertEqual(partitions, expected_partitions, strategy)
+
+class PartitionIndexTest(unittest.TestCase):
+    def test_against_scan(self):
+        rng = random.Random(1)
+        capacities = [rng.randint(-1, 40) for _ in range(100)]
+        index = PartitionIndex(capacities)
+        for step in range(2000):
+            size = rng.randint(1, 40)
+            fits = [(capacity, i) for i, capacity in enumerate(capacities) if capacity >= size]
+            self.assertEqual(index.find_first(size), fits[0][1] if fits else None)
+            self.assertEqual(index.find_best(size), min(fits)[1] if fits else None)
+            self.assertEqual(index.find_worst(size), SCANS['worst_fit'](fits)[1] if fits else None)
+            usable = [capacity for capacity in capacities if capacity >= 0]
+            self.assertEqual(index.free_space(), (sum(usable), max(usable, default=0)))
+            i = rng.randrange(len(capacities))
+            capacities[i] = rng.randint(-1, 40)
+            index.update(i, capacities[i])
+
+class SortedListTest(unittest.TestCase):
+    def test_against_sorted(self):
+        rng = random.Random(2)
+        values = SortedList(load=4)
+        expected = []
+        for step in range(3000):
+            value = rng.randint(0, 200)
+            if expected and rng.random() < 0.4:
+                value = rng.choice(expected)
+                values.remove(value)
+                expected.remove(value)
+            else:
+                values.add(value)
+                expected.append(value)
+                expected.sort()
+            self.assertEqual(len(values), len(expected))
+            probe = rng.randint(-5, 205)
+            self.assertEqual(values.ceiling(probe), min((v for v in expected if v >= probe), default=None))
+            self.assertEqual(values.floor(probe), max((v for v in expected if v <= probe), default=None))
+            self.assertEqual(probe in values, probe in expected)
+        self.assertEqual(list(values), expected)
+        self.assertEqual((values.min(), values.max()), (expected[0], expected[-1]))
+
+    def test_remove_missing(self):
+        values = SortedList([1, 3])
+        with self.assertRaises(ValueError):
+            values.remove(2)
+        with self.assertRaises(ValueError):
+            values.remove(4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Memory Management'))
+import asdas
+import Memory
+from frametable import FrameTable
+
+# The bitmap frame table checked against a list of flags, e.g.
+#   python -m pytest test_frametable.py
+
+class FrameTableTest(unittest.TestCase):
+    def test_against_flags(self):
+        rng = random.Random(0)
+        for num_frames in (1, 7, 8, 9, 64, 101):
+            table = FrameTable(num_frames)
+            used = [False] * num_frames
+            held = []
+            for step in range(400):
+                if held and rng.random() < 0.45:
+                    frames = held.pop(rng.randrange(len(held)))
+                    table.free(frames)
+                    for frame in frames:
+                        used[frame] = False
+                else:
+                    count = rng.randint(1, max(1, num_frames // 3))
+                    frames = table.allocate(count)
+                    free = [frame for frame in range(num_frames) if not used[frame]]
+                    if count > len(free):
+                        self.assertIsNone(frames)
+                    else:
+                        # The lowest-numbered free frames
+                        self.assertEqual(list(frames), free[:count])
+                        for frame in frames:
+                            used[frame] = True
+                        held.append(frames)
+                self.assertEqual(table.free_space(), (used.count(False), used.count(False)))
+                self.assertEqual([table.is_free(frame) for frame in range(num_frames)], [not flag for flag in used])
+
+    def test_frames_past_the_end(self):
+        table = FrameTable(10)
+        self.assertEqual(list(table.allocate(10)), list(range(10)))
+        self.assertIsNone(table.allocate(1))
+
+    def test_layout(self):
+        table = FrameTable(10)
+        page_table = {1: table.allocate(3), 2: table.allocate(2)}
+        table.free(page_table.pop(1)[1:2])
+        page_table[1] = [0, 2]
+        self.assertEqual(table.layout(page_table), [(0, 0, 1), (1, 1, None), (2, 2, 1), (3, 4, 2), (5, 9, None)])
+
+class PagingManagerTest(unittest.TestCase):
+    def test_asdas_paging(self):
+        memory = asdas.Paging(64, 8)
+        self.assertTrue(memory.allocate(asdas.Process(1, 20)))
+        self.assertTrue(memory.allocate(asdas.Process(2, 8)))
+        self.assertEqual(memory.free_space(), (32, 32))
+        self.assertFalse(memory.allocate(asdas.Process(3, 40)))
+        memory.deallocate(1)
+        self.assertTrue(memory.allocate(asdas.Process(3, 40)))
+        self.assertEqual(list(memory.page_table[3]), [0, 1, 2, 4, 5])
+        self.assertEqual(memory.free_space(), (16, 16))
+
+    def test_memory_paging(self):
+        manager = Memory.PagingMemoryManager(64, 8)
+        self.assertTrue(manager.allocate_memory(1, 20))
+        self.assertTrue(manager.allocate_memory(2, 8))
+        # A failed allocation warns through tkinter
+        with mock.patch.object(Memory, 'messagebox') as messagebox:
+            self.assertFalse(manager.allocate_memory(3, 40))
+        messagebox.showwarning.assert_called_once()
+        manager.deallocate_memory(1)
+        self.assertTrue(manager.allocate_memory(3, 40))
+        self.assertEqual(manager.free_space(), (16, 16))
+        self.assertEqual(manager.get_memory_status(), [
+            'Frames 0-2: Occupied by Process 3', 'Frame 3: Occupied by Process 2',
+            'Frames 4-5: Occupied by Process 3', 'Frames 6-7: Free'])
+
+if __name__ == '__main__':
+    unittest.main()
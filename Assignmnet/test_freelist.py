@@ -0,0 +1,79 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import asdas
+from freelist import FreeList
+
+# FreeList checked against a unit map, e.g.
+#   python -m pytest test_freelist.py
+#
+# The model keeps one owner per unit of memory, so the extents and every placement answer can be
+# recomputed by a plain scan.
+
+def runs(units):
+    # Maximal free runs of a unit map, as (start, size) in address order
+    found = []
+    start = None
+    for address, owner in enumerate(units + [0]):
+        if owner is None and start is None:
+            start = address
+        elif owner is not None and start is not None:
+            found.append((start, address - start))
+            start = None
+    return found
+
+def size_class(size):
+    return size.bit_length() - 1
+
+class FreeListTest(unittest.TestCase):
+    def check(self, free_blocks, units):
+        extents = runs(units)
+        self.assertEqual(list(free_blocks), extents)
+        self.assertEqual(free_blocks.free_space(), (units.count(None), max((size for start, size in extents),
+                                                                           default=0)))
+        for size in range(1, len(units) + 2):
+            fits = [(start, length) for start, length in extents if length >= size]
+            self.assertEqual(free_blocks.find_first(size), fits[0][0] if fits else None)
+            self.assertEqual(free_blocks.find_best(size), min(fits, key=lambda e: (e[1], e[0]))[0] if fits else None)
+            self.assertEqual(free_blocks.find_worst(size), min(fits, key=lambda e: (-e[1], e[0]))[0] if fits else None)
+            classes = [(size_class(length), start) for start, length in extents
+                       if size_class(length) >= max(0, size - 1).bit_length()]
+            self.assertEqual(free_blocks.find_segregated(size), min(classes)[1] if classes else None)
+
+    def test_against_unit_map(self):
+        rng = random.Random(1)
+        for trial in range(40):
+            total = rng.randint(1, 120)
+            free_blocks = FreeList(total, seed=trial)
+            units = [None] * total
+            live = []
+            for step in range(150):
+                if live and rng.random() < 0.45:
+                    start, size = live.pop(rng.randrange(len(live)))
+                    free_blocks.release(start, size)
+                    units[start:start + size] = [None] * size
+                else:
+                    extents = runs(units)
+                    if not extents:
+                        continue
+                    start, length = rng.choice(extents)
+                    size = rng.randint(1, length)
+                    self.assertEqual(free_blocks.take(start, size), start)
+                    units[start:start + size] = [1] * size
+                    live.append((start, size))
+                self.check(free_blocks, units)
+
+class DynamicMemoryAllocationTest(unittest.TestCase):
+    def test_rejects_non_positive_sizes(self):
+        memory = asdas.DynamicMemoryAllocation(100)
+        for size in (0, -5):
+            self.assertFalse(memory.allocate(asdas.Process(size, size)))
+        self.assertEqual(list(memory.free_blocks), [(0, 100)])
+        self.assertEqual(memory.free_space(), (100, 100))
+        self.assertEqual(memory.free_size, 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Memory Management'))
+import asdas
+import Memory
+from instrument import Instrumented, Log2Histogram
+
+# Instrumented around real managers, e.g.
+#   python -m pytest test_instrument.py
+
+class InstrumentedTest(unittest.TestCase):
+    def test_pid_with_two_allocations_freed_oldest_first(self):
+        memory = asdas.DynamicMemoryAllocation(100)
+        target = Instrumented(lambda pid, size: memory.allocate(asdas.Process(pid, size)), memory.deallocate,
+                              memory.free_space, sample_every=0, free_oldest=True)
+        self.assertTrue(target.allocate(1, 10))
+        self.assertTrue(target.allocate(1, 30))
+        self.assertTrue(target.allocate(2, 20))
+        target.free(1)
+        snapshot = target.snapshot()
+        self.assertEqual(snapshot['live_requested'], 50)
+        self.assertEqual(snapshot['used'], 50)
+        self.assertEqual(snapshot['internal_fragmentation'], 0.0)
+        self.assertEqual(snapshot['utilisation'], 0.5)
+        target.free(1)
+        snapshot = target.snapshot()
+        self.assertEqual((snapshot['live_requested'], snapshot['used']), (20, 20))
+
+    def test_pid_with_two_allocations_freed_together(self):
+        manager = Memory.DynamicMemoryManager(100)
+        target = Instrumented(manager.allocate_first_fit, manager.deallocate, manager.free_space, sample_every=0)
+        self.assertTrue(target.allocate(1, 10))
+        self.assertTrue(target.allocate(1, 30))
+        self.assertTrue(target.allocate(2, 20))
+        target.free(1)
+        snapshot = target.snapshot()
+        self.assertEqual((snapshot['live_requested'], snapshot['used']), (20, 20))
+        self.assertEqual(snapshot['internal_fragmentation'], 0.0)
+
+    def test_failures_and_samples(self):
+        memory = asdas.BuddySystem(64)
+        target = Instrumented(lambda pid, size: memory.allocate(asdas.Process(pid, size)), memory.deallocate,
+                              memory.free_space, sample_every=2)
+        self.assertTrue(target.allocate(1, 20))
+        self.assertFalse(target.allocate(2, 40))
+        snapshot = target.snapshot()
+        self.assertEqual((snapshot['failures'], snapshot['failure_rate']), (1, 0.5))
+        self.assertEqual(snapshot['used'], 32)
+        self.assertEqual(snapshot['internal_fragmentation'], 12 / 32)
+        self.assertEqual(len(target.stats.series), 1)
+
+class Log2HistogramTest(unittest.TestCase):
+    def test_percentile(self):
+        histogram = Log2Histogram()
+        for value in [1, 2, 3, 100]:
+            histogram.add(value)
+        # Upper bounds of the buckets [1, 2), [2, 4) and [64, 128)
+        self.assertEqual(histogram.percentile(0.25), 2)
+        self.assertEqual(histogram.percentile(0.75), 4)
+        self.assertEqual(histogram.percentile(1.0), 128)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench
+import dar
+from ownership import OwnershipIndex
+
+# The pid index behind every deallocate path, e.g.
+#   python -m pytest test_ownership.py
+
+class OwnershipIndexTest(unittest.TestCase):
+    def test_index(self):
+        owners = OwnershipIndex()
+        owners.add('a', 1)
+        owners.extend('a', [2, 3])
+        owners.add('b', 4)
+        self.assertEqual((len(owners), 'a' in owners, 'c' in owners), (2, True, False))
+        self.assertEqual(owners.owners(), {1: 'a', 2: 'a', 3: 'a', 4: 'b'})
+        owners.replace('a', 2, 5)
+        self.assertEqual(list(owners.get('a')), [1, 5, 3])
+        self.assertEqual(owners.get('c'), ())
+        self.assertEqual(owners.pop_oldest('a'), 1)
+        self.assertEqual(list(owners.pop('a')), [5, 3])
+        self.assertIsNone(owners.pop('a'))
+        self.assertEqual(owners.pop_oldest('b'), 4)
+        # The last item takes the pid with it
+        self.assertNotIn('b', owners)
+        self.assertIsNone(owners.pop_oldest('b'))
+
+class DeallocateTest(unittest.TestCase):
+    class Config:
+        partitions, max_size, page_size = 8, 16, 4
+        total_memory = partitions * max_size
+
+    def setUp(self):
+        patcher = mock.patch.object(dar, 'messagebox')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_every_manager_gives_memory_back(self):
+        for name, factory in bench.TARGETS.items():
+            # The slab targets keep empty slabs cached until they are reclaimed (see test_slab.py)
+            if name.endswith('.slab'):
+                continue
+            allocate, free, free_space = factory(self.Config)
+            if free is None:
+                continue
+            empty = free_space()
+            placed = [pid for pid, size in [(1, 5), (2, 9), (1, 3), (3, 16), (2, 1)] if allocate(pid, size)]
+            self.assertTrue(placed, name)
+            self.assertNotEqual(free_space(), empty, name)
+            # Managers that free one allocation per call get one call per allocation
+            frees = placed if getattr(factory, 'free_oldest', False) else set(placed)
+            for pid in frees:
+                free(pid)
+            self.assertEqual(free_space(), empty, name)
+            # A pid holding nothing is a no-op
+            free(1)
+            self.assertEqual(free_space(), empty, name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pagetable
+from pagetable import PAGE_TABLES, MultiLevelPageTable, make_page_table
+from vmem import VirtualMemory, replay
+
+# Every page table organisation checked against a dict of mappings, e.g.
+#   python -m pytest test_pagetable.py
+
+class PageTableTest(unittest.TestCase):
+    def test_against_dict(self):
+        rng = random.Random(0)
+        for scheme in PAGE_TABLES:
+            for va_bits in (16, 32, 64):
+                table = make_page_table(scheme, va_bits, 4096, 64)
+                top = 1 << pagetable.vpn_bits(va_bits, 4096)
+                expected = {}
+                for step in range(1000):
+                    pid = rng.randrange(4)
+                    action = rng.random()
+                    if pid not in table:
+                        table.add_process(pid)
+                        expected[pid] = {}
+                    elif action < 0.02:
+                        self.assertEqual(sorted(table.remove_process(pid)), sorted(expected.pop(pid).values()))
+                        self.assertNotIn(pid, table)
+                    elif action < 0.3 and expected[pid]:
+                        page = rng.choice(list(expected[pid]))
+                        table.unmap(pid, page)
+                        del expected[pid][page]
+                    else:
+                        page = rng.choice([rng.randrange(8), rng.randrange(top)])
+                        if page in expected[pid]:
+                            self.assertEqual(table.lookup(pid, page), expected[pid][page])
+                        else:
+                            self.assertIsNone(table.lookup(pid, page))
+                            table.map(pid, page, step)
+                            expected[pid][page] = step
+                resident = table.resident()
+                self.assertEqual({pid: sorted(frames) for pid, frames in resident.items()},
+                                 {pid: sorted(pages.values()) for pid, pages in expected.items()}, scheme)
+
+    def test_walks(self):
+        for scheme, walks in (('flat', 1), ('2level', 2), ('3level', 3), ('inverted', 2)):
+            table = make_page_table(scheme, 32, 4096, 16)
+            table.add_process(1)
+            table.map(1, 5, 0)
+            table.lookup(1, 5)
+            self.assertEqual(table.walks, walks, scheme)
+
+    def test_level_split(self):
+        self.assertEqual(MultiLevelPageTable(2, 32, 4096).level_bits, [10, 10])
+        self.assertEqual(MultiLevelPageTable(3, 64, 4096).level_bits, [16, 18, 18])
+
+    def test_footprint(self):
+        flat = make_page_table('flat', 32, 4096)
+        flat.add_process(1)
+        self.assertEqual(flat.footprint(), (1 << 20) * 8)
+
+        table = make_page_table('2level', 32, 4096)
+        table.add_process(1)
+        table.map(1, 0, 0)
+        table.map(1, 1, 1)
+        # The top-level node and one second-level node of 1024 entries each
+        self.assertEqual(table.footprint(), 2 * 1024 * 8)
+        table.unmap(1, 0)
+        table.unmap(1, 1)
+        # The empty second-level node is released
+        self.assertEqual(table.footprint(), 1024 * 8)
+
+        self.assertEqual(make_page_table('inverted', 64, 4096, 100).footprint(), 100 * (16 + 4))
+
+    def test_compare(self):
+        results = pagetable.compare(list(PAGE_TABLES), 10, 64, 4096, 16, 100)
+        self.assertEqual([result['scheme'] for result in results], list(PAGE_TABLES))
+        footprints = {result['scheme']: result['footprint'] for result in results}
+        self.assertLess(footprints['2level'], footprints['flat'])
+        self.assertLess(footprints['inverted'], footprints['2level'])
+
+class VirtualMemoryPageTableTest(unittest.TestCase):
+    def test_same_faults_with_every_scheme(self):
+        trace = [(1, page) for page in [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]]
+        for scheme in PAGE_TABLES:
+            for policy, faults in (('fifo', 15), ('lru', 12), ('opt', 9)):
+                memory = replay(VirtualMemory(3, 1, policy, 0, scheme), trace)
+                self.assertEqual(memory.faults, faults, (scheme, policy))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Memory Management'))
+import Memory
+from fixedsized import MemoryManager
+from segtree import MaxSegmentTree
+
+# Segment-tree first fit checked against a linear scan, e.g.
+#   python -m pytest test_segtree.py
+
+def first_at_least(values, k, start=0):
+    return next((i for i in range(max(0, start), len(values)) if values[i] >= k), -1)
+
+class MaxSegmentTreeTest(unittest.TestCase):
+    def test_against_scan(self):
+        rng = random.Random(0)
+        for count in (1, 2, 5, 8, 33):
+            values = [rng.randint(-1, 20) for _ in range(count)]
+            tree = MaxSegmentTree(values)
+            for step in range(500):
+                k = rng.randint(0, 21)
+                start = rng.randint(-1, count)
+                self.assertEqual(tree.find_first(k, start), first_at_least(values, k, start), (values, k, start))
+                i = rng.randrange(count)
+                values[i] = rng.randint(-1, 20)
+                tree.update(i, values[i])
+                self.assertEqual(tree.get(i), values[i])
+            self.assertEqual(len(tree), count)
+
+    def test_empty(self):
+        self.assertEqual(MaxSegmentTree([]).find_first(1), -1)
+
+class PartitionManagerTest(unittest.TestCase):
+    # Each partition holds one process, so the textbook example places differently from fixxed
+    PARTITIONS = [100, 500, 200, 300, 600]
+    PROCESSES = [212, 417, 112, 426]
+    EXPECTED = {'first_fit': [1, 4, 2, None], 'best_fit': [3, 1, 2, 4], 'worst_fit': [4, 1, 3, None]}
+
+    def test_fixedsized(self):
+        for strategy, placed in self.EXPECTED.items():
+            manager = MemoryManager(self.PARTITIONS)
+            self.assertEqual(getattr(manager, strategy)(self.PROCESSES), placed.count(None))
+            owners = {partition.process_id: i for i, partition in enumerate(manager.partitions)
+                      if partition.is_allocated}
+            self.assertEqual([owners.get(pid) for pid in range(len(self.PROCESSES))], placed, strategy)
+
+    def test_memory_partitions(self):
+        for strategy, placed in self.EXPECTED.items():
+            manager = Memory.MemoryManager(self.PARTITIONS)
+            for pid, size in enumerate(self.PROCESSES):
+                self.assertEqual(manager.allocate(pid, size, strategy), placed[pid] is not None)
+            owners = {partition.process_id: i for i, partition in enumerate(manager.partitions)
+                      if not partition.is_free}
+            self.assertEqual([owners.get(pid) for pid in range(len(self.PROCESSES))], placed, strategy)
+            # Freeing process 1 gives its partition back to the index
+            manager.deallocate(1)
+            self.assertTrue(manager.allocate(9, 450, 'best_fit'))
+            self.assertEqual(manager.partitions[placed[1]].process_id, 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import asdas
+from freelist import FreeList
+from slab import SlabAllocator
+
+# The slab layer checked against the free list it carves from, e.g.
+#   python -m pytest test_slab.py
+
+def free_list(total):
+    free_blocks = FreeList()
+    free_blocks.add(0, total)
+    return free_blocks
+
+class SlabAllocatorTest(unittest.TestCase):
+    def test_hits_misses_and_bypasses(self):
+        slabs = SlabAllocator(free_list(1000), [4, 16], objects_per_slab=4)
+        addresses = [slabs.allocate(3) for _ in range(5)]
+        # The first object carves a slab of four; the fifth carves a second one
+        self.assertEqual(addresses, [0, 4, 8, 12, 16])
+        self.assertIsNone(slabs.allocate(17))
+        stats = slabs.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['bypasses'], stats['slabs']), (3, 2, 1, 2))
+        self.assertEqual(stats['cached'], 3 * 4)
+        self.assertEqual(slabs.free_blocks.free_space(), (1000 - 32, 1000 - 32))
+
+    def test_objects_never_overlap(self):
+        rng = random.Random(0)
+        slabs = SlabAllocator(free_list(4096), objects_per_slab=8, keep_empty=1)
+        live = {}
+        for step in range(5000):
+            if live and rng.random() < 0.5:
+                address = rng.choice(list(live))
+                slabs.free(address)
+                del live[address]
+            else:
+                size = rng.randint(1, 256)
+                address = slabs.allocate(size)
+                if address is None:
+                    continue
+                self.assertGreaterEqual(slabs.cache_for(size).object_size, size)
+                live[address] = slabs.cache_for(size).object_size
+        ordered = sorted(live.items())
+        for (start, size), (next_start, _) in zip(ordered, ordered[1:]):
+            self.assertLessEqual(start + size, next_start)
+        # Every object lies inside a slab, and the slabs and the free list never overlap
+        extents = sorted((start, size) for start, size, object_size in slabs.extents())
+        for address, size in live.items():
+            self.assertTrue(any(start <= address and address + size <= start + length for start, length in extents))
+        free = sorted(slabs.free_blocks)
+        self.assertEqual(sum(size for start, size in extents) + sum(size for start, size in free), 4096)
+        for address in list(live):
+            slabs.free(address)
+        slabs.reclaim()
+        self.assertEqual(list(slabs.free_blocks), [(0, 4096)])
+
+    def test_keep_empty(self):
+        slabs = SlabAllocator(free_list(100), [8], objects_per_slab=2, keep_empty=1)
+        addresses = [slabs.allocate(8) for _ in range(4)]
+        for address in addresses:
+            slabs.free(address)
+        # One empty slab stays cached, the other goes straight back
+        self.assertEqual((slabs.stats()['slabs'], slabs.reclaimed), (1, 1))
+        self.assertEqual(slabs.reclaim(), 16)
+        self.assertEqual(slabs.free_blocks.free_space(), (100, 100))
+
+class DynamicSlabTest(unittest.TestCase):
+    def test_reclaims_before_failing(self):
+        memory = asdas.DynamicMemoryAllocation(64, [8], compaction=None)
+        self.assertTrue(memory.allocate(asdas.Process(1, 8)))
+        memory.deallocate(1)
+        # The empty slab holds the whole memory until it is reclaimed
+        self.assertTrue(memory.allocate(asdas.Process(2, 64)))
+        memory.deallocate(2)
+        self.assertEqual(memory.free_space(), (64, 64))
+
+if __name__ == '__main__':
+    unittest.main()
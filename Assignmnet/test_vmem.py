@@ -0,0 +1,133 @@
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import vmem
+from asdas import Process
+from vmem import POLICIES, VirtualMemory, replay
+
+# Demand paging checked against textbook fault counts and simple reference policies, e.g.
+#   python -m pytest test_vmem.py
+
+TEXTBOOK = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+
+def faults(policy, pages, num_frames, tlb_size=0):
+    memory = VirtualMemory(num_frames, 1, policy, tlb_size)
+    replay(memory, [(1, page) for page in pages])
+    return memory.faults
+
+def reference_faults(policy, pages, num_frames):
+    # The textbook definitions over a plain list of resident pages
+    resident = []
+    count = 0
+    for i, page in enumerate(pages):
+        if page in resident:
+            if policy == 'lru':
+                resident.remove(page)
+                resident.append(page)
+            continue
+        count += 1
+        if len(resident) == num_frames:
+            if policy == 'opt':
+                future = pages[i + 1:]
+                resident.remove(max(resident, key=lambda p: future.index(p) if p in future else len(future)))
+            else:
+                resident.pop(0)
+        resident.append(page)
+    return count
+
+class ReplacementTest(unittest.TestCase):
+    def test_textbook_string(self):
+        self.assertEqual(faults('fifo', TEXTBOOK, 3), 15)
+        self.assertEqual(faults('lru', TEXTBOOK, 3), 12)
+        self.assertEqual(faults('opt', TEXTBOOK, 3), 9)
+
+    def test_belady_anomaly(self):
+        pages = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+        self.assertEqual((faults('fifo', pages, 3), faults('fifo', pages, 4)), (9, 10))
+
+    def test_against_reference(self):
+        rng = random.Random(0)
+        for trial in range(30):
+            pages = [rng.randrange(8) for _ in range(200)]
+            num_frames = rng.randint(1, 6)
+            for policy in ('fifo', 'lru'):
+                self.assertEqual(faults(policy, pages, num_frames, tlb_size=4),
+                                 reference_faults(policy, pages, num_frames), policy)
+            optimal = faults('opt', pages, num_frames, tlb_size=4)
+            self.assertEqual(optimal, reference_faults('opt', pages, num_frames))
+            for policy in POLICIES:
+                # Nothing beats OPT, and every distinct page faults at least once
+                self.assertGreaterEqual(faults(policy, pages, num_frames), optimal, policy)
+                self.assertGreaterEqual(optimal, len(set(pages)))
+
+    def test_opt_needs_the_future(self):
+        memory = VirtualMemory(4, 1, 'opt')
+        memory.allocate(Process(1, 4))
+        with self.assertRaises(ValueError):
+            memory.translate(1, 0)
+
+class VirtualMemoryTest(unittest.TestCase):
+    def test_translation_stays_consistent(self):
+        # After every reference the frame really holds the page, whatever the TLB had cached
+        rng = random.Random(1)
+        for policy in POLICIES:
+            memory = VirtualMemory(8 * 4, 4, policy, tlb_size=4)
+            trace = [(rng.randrange(3), rng.randrange(64)) for _ in range(2000)]
+            uses = vmem.next_uses(trace, 4)
+            for pid in range(3):
+                memory.allocate(Process(pid, 64))
+            for (pid, address), use in zip(trace, uses):
+                physical = memory.translate(pid, address, use)
+                frame, offset = divmod(physical, 4)
+                self.assertEqual(memory.frame_owner[frame], (pid, address // 4), policy)
+                self.assertEqual(offset, address % 4)
+            self.assertEqual(memory.references, 2000)
+            self.assertEqual(memory.faults - memory.evictions, 8)
+
+    def test_tlb(self):
+        memory = VirtualMemory(16, 4, 'lru', tlb_size=2)
+        replay(memory, [(1, 0), (1, 1), (1, 4), (1, 5), (1, 8), (1, 0)])
+        # Pages 0, 0, 1, 1, 2, 0 with two TLB entries: page 0 has been pushed out by the time it returns
+        self.assertEqual((memory.tlb.hits, memory.tlb.misses), (2, 4))
+        self.assertEqual(memory.faults, 3)
+        self.assertAlmostEqual(memory.tlb_hit_ratio(), 2 / 6)
+
+    def test_deallocate(self):
+        memory = VirtualMemory(16, 4, 'fifo')
+        replay(memory, [(1, 0), (1, 4), (2, 0)])
+        self.assertEqual(memory.free_size, 4)
+        self.assertTrue(memory.deallocate(1))
+        self.assertFalse(memory.deallocate(1))
+        self.assertEqual(memory.free_size, 12)
+        self.assertEqual(memory.frame_owner.count(None), 3)
+        self.assertEqual(memory.tlb.entries.keys(), {(2, 0)})
+
+    def test_address_outside_the_process(self):
+        memory = VirtualMemory(16, 4)
+        memory.allocate(Process(1, 6))
+        memory.translate(1, 7)
+        with self.assertRaises(ValueError):
+            memory.translate(1, 8)
+
+class TraceTest(unittest.TestCase):
+    def test_read_trace_and_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.txt')
+            with open(path, 'w') as file:
+                file.write('# pid address\n')
+                file.writelines(f'a 0x{page:x}\n' for page in TEXTBOOK)
+            self.assertEqual(vmem.read_trace(path), [('a', page) for page in TEXTBOOK])
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                vmem.main(['--trace', path, '--frames', '3', '--page-size', '1', '--policies', 'fifo', 'lru', 'opt'])
+        rows = [line.split() for line in output.getvalue().splitlines()[1:]]
+        self.assertEqual([(row[0], row[2]) for row in rows], [('fifo', '15'), ('lru', '12'), ('opt', '9')])
+
+if __name__ == '__main__':
+    unittest.main()
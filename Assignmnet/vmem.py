@@ -0,0 +1,364 @@
+import argparse
+import heapq
+import random
+import sys
+import time
+from collections import OrderedDict
+
+from asdas import Paging, Process
+from pagetable import PAGE_TABLES, make_page_table, vpn_bits
+
+# Demand paging on top of asdas.Paging. Processes reserve virtual pages when they are allocated
+# and only get a frame when a page is first touched. Every access translates a logical address
+# through a TLB and the page table; a miss on a non-resident page is a page fault, which takes a
+# free frame or evicts one chosen by the replacement policy. Traces can be replayed from a file of
+# "pid address" lines or generated, e.g.
+#   python vmem.py --frames 256 --policies fifo lru clock lfu opt --references 1000000
+# The page table organisation (flat, 2level, 3level, inverted) is selectable; its walk cost on
+# TLB misses is reported next to the fault rate.
+
+INFINITY = float('inf')
+
+class TLB:
+    # Fully associative, LRU replacement
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()  # (pid, page) -> frame
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key):
+        frame = self.entries.get(key)
+        if frame is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return frame
+
+    def insert(self, key, frame):
+        if self.size <= 0:
+            return
+        self.entries[key] = frame
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        self.entries.pop(key, None)
+
+    def invalidate_process(self, pid):
+        for key in [key for key in self.entries if key[0] == pid]:
+            del self.entries[key]
+
+# Replacement policies track resident frames. loaded() and accessed() get the position of the
+# page's next reference, which only OPT uses; victim() picks a frame and stops tracking it.
+
+class FIFOPolicy:
+    def __init__(self, num_frames):
+        self.queue = OrderedDict()
+
+    def loaded(self, frame, next_use=None):
+        self.queue[frame] = None
+
+    def accessed(self, frame, next_use=None):
+        pass
+
+    def victim(self):
+        return self.queue.popitem(last=False)[0]
+
+    def removed(self, frame):
+        self.queue.pop(frame, None)
+
+class LRUPolicy(FIFOPolicy):
+    def accessed(self, frame, next_use=None):
+        self.queue.move_to_end(frame)
+
+class ClockPolicy:
+    def __init__(self, num_frames):
+        self.num_frames = num_frames
+        self.used = bytearray(num_frames)
+        self.referenced = bytearray(num_frames)
+        self.hand = 0
+
+    def loaded(self, frame, next_use=None):
+        self.used[frame] = 1
+        self.referenced[frame] = 1
+
+    def accessed(self, frame, next_use=None):
+        self.referenced[frame] = 1
+
+    def victim(self):
+        while True:
+            hand = self.hand
+            self.hand = (hand + 1) % self.num_frames
+            if self.used[hand]:
+                if not self.referenced[hand]:
+                    self.used[hand] = 0
+                    return hand
+                self.referenced[hand] = 0
+
+    def removed(self, frame):
+        self.used[frame] = 0
+        self.referenced[frame] = 0
+
+class LFUPolicy:
+    # Frames bucketed by access count; the oldest frame in the lowest bucket is evicted
+    def __init__(self, num_frames):
+        self.counts = {}
+        self.buckets = {}  # count -> OrderedDict of frames
+        self.min_count = 0
+
+    def loaded(self, frame, next_use=None):
+        self.counts[frame] = 1
+        self.buckets.setdefault(1, OrderedDict())[frame] = None
+        self.min_count = 1
+
+    def accessed(self, frame, next_use=None):
+        count = self.counts[frame]
+        self._unlink(frame, count)
+        if self.min_count == count and count not in self.buckets:
+            self.min_count = count + 1
+        self.counts[frame] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[frame] = None
+
+    def _unlink(self, frame, count):
+        bucket = self.buckets[count]
+        del bucket[frame]
+        if not bucket:
+            del self.buckets[count]
+
+    def victim(self):
+        if self.min_count not in self.buckets:
+            self.min_count = min(self.buckets)
+        frame, _ = self.buckets[self.min_count].popitem(last=False)
+        if not self.buckets[self.min_count]:
+            del self.buckets[self.min_count]
+        del self.counts[frame]
+        return frame
+
+    def removed(self, frame):
+        count = self.counts.pop(frame, None)
+        if count is not None:
+            self._unlink(frame, count)
+
+class OPTPolicy:
+    # Belady's optimal policy: evict the frame whose page is used furthest in the future.
+    # The heap holds (-next use, frame) and is cleaned lazily.
+    def __init__(self, num_frames):
+        self.heap = []
+        self.next_use = {}
+
+    def loaded(self, frame, next_use=None):
+        self.accessed(frame, next_use)
+
+    def accessed(self, frame, next_use=None):
+        if next_use is None:
+            raise ValueError("OPT replacement needs the future of the trace")
+        self.next_use[frame] = next_use
+        heapq.heappush(self.heap, (-next_use, frame))
+        if len(self.heap) > 4 * len(self.next_use) + 64:
+            self.heap = [(-use, frame) for frame, use in self.next_use.items()]
+            heapq.heapify(self.heap)
+
+    def victim(self):
+        while True:
+            use, frame = heapq.heappop(self.heap)
+            if self.next_use.get(frame) == -use:
+                del self.next_use[frame]
+                return frame
+
+    def removed(self, frame):
+        self.next_use.pop(frame, None)
+
+POLICIES = {
+    'fifo': FIFOPolicy,
+    'lru': LRUPolicy,
+    'clock': ClockPolicy,
+    'lfu': LFUPolicy,
+    'opt': OPTPolicy,
+}
+
+class VirtualMemory(Paging):
+    def __init__(self, total_size, page_size, policy='lru', tlb_size=16, page_table='flat', va_bits=32):
+        super().__init__(total_size, page_size)
+        self.num_frames = total_size // page_size
+        self.max_pages = 1 << vpn_bits(va_bits, page_size)
+        self.page_table = make_page_table(page_table, va_bits, page_size, self.num_frames)
+        self.policy_name = policy
+        self.policy = POLICIES[policy](self.num_frames)
+        self.tlb = TLB(tlb_size)
+        self.virtual_pages = {}  # pid -> pages reserved by the process
+        self.frame_owner = [None] * self.num_frames  # frame -> (pid, page)
+        self.references = 0
+        self.faults = 0
+        self.evictions = 0
+
+    def allocate(self, process, strategy=None):
+        # Reserves the address space only; frames are assigned on first touch
+        num_pages = -(-process.memory_required // self.page_size)  # Ceil division
+        num_pages += self.virtual_pages.get(process.pid, 0)
+        if num_pages > self.max_pages:
+            return False
+        self.virtual_pages[process.pid] = num_pages
+        self.page_table.add_process(process.pid)
+        process.status = 'allocated'
+        return True
+
+    def deallocate(self, pid):
+        if pid not in self.page_table:
+            return False
+        frames = self.page_table.remove_process(pid)
+        del self.virtual_pages[pid]
+        self.tlb.invalidate_process(pid)
+        for frame in frames:
+            self.policy.removed(frame)
+            self.frame_owner[frame] = None
+        self.frames.free(frames)
+        self.free_size += len(frames) * self.page_size
+        return True
+
+    def translate(self, pid, address, next_use=None):
+        # Physical address for a logical address of pid, faulting the page in if needed
+        page, offset = divmod(address, self.page_size)
+        if not 0 <= page < self.virtual_pages[pid]:
+            raise ValueError(f"Process {pid} has no page {page} (address {address})")
+        self.references += 1
+        key = (pid, page)
+        frame = self.tlb.lookup(key)
+        if frame is None:
+            frame = self.page_table.lookup(pid, page)
+            if frame is None:
+                frame = self._fault(pid, page, next_use)
+            else:
+                self.policy.accessed(frame, next_use)
+            self.tlb.insert(key, frame)
+        else:
+            self.policy.accessed(frame, next_use)
+        return frame * self.page_size + offset
+
+    def _fault(self, pid, page, next_use):
+        self.faults += 1
+        frames = self.frames.allocate(1)
+        if frames is None:
+            frame = self.policy.victim()
+            victim_pid, victim_page = self.frame_owner[frame]
+            self.page_table.unmap(victim_pid, victim_page)
+            self.tlb.invalidate((victim_pid, victim_page))
+            self.evictions += 1
+        else:
+            frame = frames[0]
+            self.free_size -= self.page_size
+        self.page_table.map(pid, page, frame)
+        self.frame_owner[frame] = (pid, page)
+        self.policy.loaded(frame, next_use)
+        return frame
+
+    def fault_rate(self):
+        return self.faults / self.references if self.references else 0.0
+
+    def tlb_hit_ratio(self):
+        lookups = self.tlb.hits + self.tlb.misses
+        return self.tlb.hits / lookups if lookups else 0.0
+
+    def walk_cost(self):
+        # Page table memory references per TLB miss
+        return self.page_table.walks / self.tlb.misses if self.tlb.misses else 0.0
+
+    def display_status(self):
+        print(f"Total Memory: {self.total_size}")
+        print(f"Free Memory: {self.free_size}")
+        print("Frames:")
+        for first, last, pid in self.frames.layout(self.page_table.resident()):
+            print(f"Frames {first}-{last}: {'Free' if pid is None else f'Process {pid}'}")
+        print(f"References: {self.references}, Page Faults: {self.faults}, "
+              f"Fault Rate: {self.fault_rate():.4f}, TLB Hit Ratio: {self.tlb_hit_ratio():.4f}")
+
+def next_uses(trace, page_size):
+    # For each reference, the position of the next reference to the same page (INFINITY if none)
+    uses = [INFINITY] * len(trace)
+    upcoming = {}
+    for i in range(len(trace) - 1, -1, -1):
+        pid, address = trace[i]
+        key = (pid, address // page_size)
+        uses[i] = upcoming.get(key, INFINITY)
+        upcoming[key] = i
+    return uses
+
+def replay(memory, trace):
+    # Registers every pid in the trace with enough address space, then runs the references
+    sizes = {}
+    for pid, address in trace:
+        if address >= sizes.get(pid, 0):
+            sizes[pid] = address + 1
+    for pid, size in sizes.items():
+        if pid not in memory.page_table:
+            memory.allocate(Process(pid, size))
+    translate = memory.translate
+    if memory.policy_name == 'opt':
+        for (pid, address), use in zip(trace, next_uses(trace, memory.page_size)):
+            translate(pid, address, use)
+    else:
+        for pid, address in trace:
+            translate(pid, address)
+    return memory
+
+def read_trace(path):
+    # One "pid address" reference per line; addresses may be decimal or 0x-prefixed hex
+    trace = []
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) >= 2 and not fields[0].startswith('#'):
+                trace.append((fields[0], int(fields[1], 0)))
+    return trace
+
+def synthetic_trace(num_references, num_processes=4, pages_per_process=256, page_size=4,
+                    working_set=16, locality=0.9, seed=0):
+    # Each process mostly touches a working set of pages that drifts over time
+    rng = random.Random(seed)
+    bases = [0] * num_processes
+    trace = []
+    for _ in range(num_references):
+        pid = rng.randrange(num_processes)
+        if rng.random() < locality:
+            page = (bases[pid] + rng.randrange(working_set)) % pages_per_process
+        else:
+            page = rng.randrange(pages_per_process)
+        if rng.random() < 0.001:
+            bases[pid] = rng.randrange(pages_per_process)
+        trace.append((pid, page * page_size + rng.randrange(page_size)))
+    return trace
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay an address trace through demand paging.')
+    parser.add_argument('--trace', help='file of "pid address" lines (default: a synthetic trace)')
+    parser.add_argument('--frames', type=int, default=64, help='physical frames')
+    parser.add_argument('--page-size', type=int, default=4)
+    parser.add_argument('--tlb', type=int, default=16, help='TLB entries')
+    parser.add_argument('--page-table', default='flat', choices=list(PAGE_TABLES))
+    parser.add_argument('--va-bits', type=int, default=32, help='virtual address bits')
+    parser.add_argument('--policies', nargs='+', default=sorted(POLICIES), choices=sorted(POLICIES))
+    parser.add_argument('--references', type=int, default=100000, help='synthetic trace length')
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--pages', type=int, default=256, help='pages per process in the synthetic trace')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        trace = read_trace(args.trace)
+    else:
+        trace = synthetic_trace(args.references, args.processes, args.pages, args.page_size, seed=args.seed)
+
+    print(f"{'policy':<8} {'references':>11} {'faults':>9} {'fault rate':>11} {'TLB hits':>9} {'walk':>6} {'seconds':>8}")
+    for policy in args.policies:
+        memory = VirtualMemory(args.frames * args.page_size, args.page_size, policy, args.tlb, args.page_table,
+                               args.va_bits)
+        started = time.perf_counter()
+        replay(memory, trace)
+        elapsed = time.perf_counter() - started
+        print(f"{policy:<8} {memory.references:>11} {memory.faults:>9} {memory.fault_rate():>11.4f} "
+              f"{memory.tlb_hit_ratio():>9.4f} {memory.walk_cost():>6.2f} {elapsed:>8.2f}")
+
+if __name__ == '__main__':
+    sys.exit(main())
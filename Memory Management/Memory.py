@@ -1,6 +1,19 @@
+import os
+import sys
 import tkinter as tk
+from array import array
 from tkinter import messagebox
 
+# The allocator engines are shared with the Assignmnet folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Assignmnet'))
+from buddy import BuddyAllocator
+from compaction import Compactor
+from freelist import FreeList
+from ownership import OwnershipIndex
+from frametable import FrameTable
+from placement import PartitionIndex, Placement
+from slab import SlabAllocator
+
 class MemoryPartition:
     def __init__(self, start, size, is_free=True, process_id=None):
         self.start = start
@@ -8,6 +21,13 @@ class MemoryPartition:
         self.is_free = is_free
         self.process_id = process_id
 
+class SlabPartition(MemoryPartition):
+    # A slab extent, shown as one block holding the processes with objects in it
+    def __init__(self, start, size, object_size, process_ids):
+        super().__init__(start, size, False)
+        self.object_size = object_size
+        self.process_ids = process_ids
+
 class MemoryManager:
     def __init__(self, partition_sizes):
         self.partitions = []
@@ -15,50 +35,40 @@ class MemoryManager:
         for size in partition_sizes:
             self.partitions.append(MemoryPartition(start_address, size))
             start_address += size
+        # Free capacity per partition (-1 once occupied)
+        self.placement = Placement(PartitionIndex([partition.size for partition in self.partitions]))
+        self.owners = OwnershipIndex()  # process id -> partition numbers
+
+    def allocate(self, process_id, process_size, strategy='first_fit'):
+        i = self.placement.find(process_size, strategy)
+        if i is None:
+            return False
+        partition = self.partitions[i]
+        partition.is_free = False
+        partition.process_id = process_id
+        self.placement.index.update(i, -1)
+        self.owners.add(process_id, i)
+        return True
 
     def allocate_first_fit(self, process_id, process_size):
-        for partition in self.partitions:
-            if partition.is_free and partition.size >= process_size:
-                partition.is_free = False
-                partition.process_id = process_id
-                return True
-        return False
+        return self.allocate(process_id, process_size, 'first_fit')
 
     def allocate_best_fit(self, process_id, process_size):
-        best_fit_partition = None
-        best_fit_size = float('inf')
-
-        for partition in self.partitions:
-            if partition.is_free and partition.size >= process_size and partition.size < best_fit_size:
-                best_fit_partition = partition
-                best_fit_size = partition.size
-
-        if best_fit_partition:
-            best_fit_partition.is_free = False
-            best_fit_partition.process_id = process_id
-            return True
-        return False
+        return self.allocate(process_id, process_size, 'best_fit')
 
     def allocate_worst_fit(self, process_id, process_size):
-        worst_fit_partition = None
-        worst_fit_size = -1
+        return self.allocate(process_id, process_size, 'worst_fit')
 
-        for partition in self.partitions:
-            if partition.is_free and partition.size >= process_size and partition.size > worst_fit_size:
-                worst_fit_partition = partition
-                worst_fit_size = partition.size
-
-        if worst_fit_partition:
-            worst_fit_partition.is_free = False
-            worst_fit_partition.process_id = process_id
-            return True
-        return False
+    def free_space(self):
+        # (free KB, largest free block) for the instrumentation
+        return self.placement.index.free_space()
 
     def deallocate(self, process_id):
-        for partition in self.partitions:
-            if partition.process_id == process_id:
-                partition.is_free = True
-                partition.process_id = None
+        for i in self.owners.pop(process_id) or ():
+            partition = self.partitions[i]
+            partition.is_free = True
+            partition.process_id = None
+            self.placement.index.update(i, partition.size)
 
     def get_memory_status(self):
         status = []
@@ -67,130 +77,146 @@ class MemoryManager:
         return status
 
 class DynamicMemoryManager:
-    def __init__(self, total_memory_size):
+    def __init__(self, total_memory_size, size_classes=None, compaction=None):
         self.total_memory_size = total_memory_size
-        self.blocks = [MemoryPartition(0, total_memory_size)]
+        self.free_blocks = FreeList(total_memory_size)
+        self.allocated = {}  # start -> occupied MemoryPartition
+        self.process_blocks = OwnershipIndex()  # process id -> starts of its blocks
+        self.placement = Placement(self.free_blocks)
+        # Optional slab caches for the recurring small sizes, carved from free_blocks
+        self.slabs = SlabAllocator(self.free_blocks, size_classes) if size_classes else None
+        self.compactor = None
+        if compaction:
+            self.compactor = Compactor(self.free_blocks, self._movable, self._movable_size, self._relocate, compaction)
+
+    @property
+    def blocks(self):
+        # Free, occupied and slab blocks in address order; together they cover all of memory
+        blocks = [MemoryPartition(start, size) for start, size in self.free_blocks]
+        if self.slabs is None:
+            blocks.extend(self.allocated.values())
+        else:
+            slab_pids = {}  # slab start -> pids with an object in it
+            for start, block in self.allocated.items():
+                if start in self.slabs:
+                    slab_pids.setdefault(self.slabs.objects[start][1].start, []).append(block.process_id)
+                else:
+                    blocks.append(block)
+            blocks.extend(SlabPartition(start, size, object_size, slab_pids.get(start, []))
+                          for start, size, object_size in self.slabs.extents())
+        blocks.sort(key=lambda block: block.start)
+        return blocks
+
+    def allocate(self, process_id, process_size, strategy='first_fit'):
+        if self.slabs is not None and process_size > 0:
+            start = self.slabs.allocate(process_size)
+            if start is not None:
+                self._occupy(start, process_id, process_size)
+                return True
+        start = self.placement.find(process_size, strategy)
+        if start is None and self.slabs is not None and self.slabs.reclaim():
+            start = self.placement.find(process_size, strategy)
+        if start is None and self.compactor is not None and process_size > 0:
+            start = self.compactor.make_room(process_size)
+        return self._split_block(start, process_id, process_size)
 
     def allocate_first_fit(self, process_id, process_size):
-        for block in self.blocks:
-            if block.is_free and block.size >= process_size:
-                self._split_block(block, process_id, process_size)
-                return True
-        return False
+        return self.allocate(process_id, process_size, 'first_fit')
 
     def allocate_best_fit(self, process_id, process_size):
-        best_fit_block = None
-        best_fit_size = float('inf')
+        return self.allocate(process_id, process_size, 'best_fit')
 
-        for block in self.blocks:
-            if block.is_free and block.size >= process_size and block.size < best_fit_size:
-                best_fit_block = block
-                best_fit_size = block.size
+    def allocate_worst_fit(self, process_id, process_size):
+        return self.allocate(process_id, process_size, 'worst_fit')
 
-        if best_fit_block:
-            self._split_block(best_fit_block, process_id, process_size)
-            return True
-        return False
+    def free_space(self):
+        return self.free_blocks.free_space()
 
-    def allocate_worst_fit(self, process_id, process_size):
-        worst_fit_block = None
-        worst_fit_size = -1
-
-        for block in self.blocks:
-            if block.is_free and block.size >= process_size and block.size > worst_fit_size:
-                worst_fit_block = block
-                worst_fit_size = block.size
-
-        if worst_fit_block:
-            self._split_block(worst_fit_block, process_id, process_size)
-            return True
-        return False
-
-    def _split_block(self, block, process_id, process_size):
-        if block.size > process_size:
-            new_block = MemoryPartition(block.start + process_size, block.size - process_size)
-            self.blocks.insert(self.blocks.index(block) + 1, new_block)
-        block.size = process_size
-        block.is_free = False
-        block.process_id = process_id
+    def _split_block(self, start, process_id, process_size):
+        if start is None or process_size <= 0:
+            return False
+        self.free_blocks.take(start, process_size)
+        self._occupy(start, process_id, process_size)
+        return True
+
+    def _occupy(self, start, process_id, process_size):
+        self.allocated[start] = MemoryPartition(start, process_size, False, process_id)
+        self.process_blocks.add(process_id, start)
 
     def deallocate(self, process_id):
-        for block in self.blocks:
-            if block.process_id == process_id:
-                block.is_free = True
-                block.process_id = None
-        self._merge_free_blocks()
-
-    def _merge_free_blocks(self):
-        merged_blocks = []
-        previous_block = None
-
-        for block in self.blocks:
-            if previous_block and previous_block.is_free and block.is_free:
-                previous_block.size += block.size
+        for start in self.process_blocks.pop(process_id) or ():
+            block = self.allocated.pop(start)
+            if self.slabs is not None and start in self.slabs:
+                self.slabs.free(start)
             else:
-                merged_blocks.append(block)
-                previous_block = block
-
-        self.blocks = merged_blocks
+                self.free_blocks.release(block.start, block.size)
+        if self.compactor is not None:
+            self.compactor.step()
+
+    def _movable(self):
+        return ((start, block.size) for start, block in self.allocated.items()
+                if self.slabs is None or start not in self.slabs)
+
+    def _movable_size(self, start):
+        block = self.allocated.get(start)
+        if block is None or (self.slabs is not None and start in self.slabs):
+            return None
+        return block.size
+
+    def _relocate(self, moves):
+        blocks = [self.allocated.pop(old) for old, new, size in moves]
+        for (old, new, size), block in zip(moves, blocks):
+            block.start = new
+            self.allocated[new] = block
+            self.process_blocks.replace(block.process_id, old, new)
 
     def get_memory_status(self):
         status = []
         for i, block in enumerate(self.blocks):
-            status.append(f"Block {i} ({block.start}-{block.start + block.size} KB): {'Free' if block.is_free else f'Occupied by Process {block.process_id}'}")
+            if isinstance(block, SlabPartition):
+                pids = ', '.join(str(pid) for pid in block.process_ids) or 'none'
+                state = f"Slab cache (class {block.object_size}), Processes: {pids}"
+            else:
+                state = 'Free' if block.is_free else f'Occupied by Process {block.process_id}'
+            status.append(f"Block {i} ({block.start}-{block.start + block.size} KB): {state}")
+        if self.slabs is not None:
+            stats = self.slabs.stats()
+            status.append(f"Slabs: {stats['slabs']}, Cached: {stats['cached']} KB, Hit Rate: {stats['hit_rate']:.1%}")
+        if self.compactor is not None:
+            stats = self.compactor.stats()
+            status.append(f"Compactions: {stats['compactions'] + stats['steps']}, Blocks Moved: {stats['moves']}, Moved: {stats['moved']} KB")
         return status
 
 class BuddyMemoryManager:
     def __init__(self, total_memory_size):
         self.total_memory_size = total_memory_size
-        self.blocks = [MemoryPartition(0, total_memory_size)]
         self.min_block_size = 1  # Define the minimum block size for the buddy system
+        self.allocator = BuddyAllocator(total_memory_size, self.min_block_size)
+        self.process_blocks = OwnershipIndex()  # process id -> start addresses of its blocks
+
+    def free_space(self):
+        return self.allocator.free_space()
 
     def allocate_memory(self, process_id, process_size):
-        block = self._find_suitable_block(process_size)
-        if not block:
+        start = self.allocator.allocate(process_size)
+        if start is None:
             return False
-        self._split_block(block, process_id, process_size)
+        self.process_blocks.add(process_id, start)
         return True
 
-    def _find_suitable_block(self, process_size):
-        for block in self.blocks:
-            if block.is_free and block.size >= process_size:
-                return block
-        return None
-
-    def _split_block(self, block, process_id, process_size):
-        while block.size // 2 >= process_size and block.size // 2 >= self.min_block_size:
-            new_block = MemoryPartition(block.start + block.size // 2, block.size // 2)
-            block.size //= 2
-            self.blocks.insert(self.blocks.index(block) + 1, new_block)
-        block.is_free = False
-        block.process_id = process_id
-
     def deallocate_memory(self, process_id):
-        for block in self.blocks:
-            if block.process_id == process_id:
-                block.is_free = True
-                block.process_id = None
-        self._merge_free_blocks()
-
-    def _merge_free_blocks(self):
-        merged_blocks = []
-        previous_block = None
-
-        for block in self.blocks:
-            if previous_block and previous_block.is_free and block.is_free and previous_block.size == block.size:
-                previous_block.size *= 2
-            else:
-                merged_blocks.append(block)
-                previous_block = block
-
-        self.blocks = merged_blocks
+        starts = self.process_blocks.pop(process_id)
+        if starts is None:
+            return False
+        for start in starts:
+            self.allocator.free(start)
+        return True
 
     def get_memory_status(self):
+        owners = self.process_blocks.owners()
         status = []
-        for i, block in enumerate(self.blocks):
-            status.append(f"Block {i} ({block.start}-{block.start + block.size} KB): {'Free' if block.is_free else f'Occupied by Process {block.process_id}'}")
+        for i, (start, size, is_free) in enumerate(self.allocator.blocks()):
+            status.append(f"Block {i} ({start}-{start + size} KB): {'Free' if is_free else f'Occupied by Process {owners[start]}'}")
         return status
 
 class PagingMemoryManager:
@@ -198,25 +224,21 @@ class PagingMemoryManager:
         self.total_memory_size = total_memory_size
         self.page_size = page_size
         self.num_pages = total_memory_size // page_size
-        self.frames = [None] * self.num_pages
+        self.frames = FrameTable(self.num_pages)
         self.page_table = {}
 
+    def free_space(self):
+        free, largest = self.frames.free_space()
+        return free * self.page_size, largest * self.page_size
+
     def allocate_memory(self, process_id, process_size):
         num_pages_needed = (process_size + self.page_size - 1) // self.page_size
-        allocated_frames = []
-        for i in range(self.num_pages):
-            if self.frames[i] is None:
-                allocated_frames.append(i)
-                if len(allocated_frames) == num_pages_needed:
-                    break
-        if len(allocated_frames) < num_pages_needed:
+        allocated_frames = self.frames.allocate(num_pages_needed)
+        if allocated_frames is None:
             messagebox.showwarning("Error", "Not enough memory to allocate the process!")
             return False
 
-        for frame in allocated_frames:
-            self.frames[frame] = process_id
-
-        self.page_table[process_id] = allocated_frames
+        self.page_table.setdefault(process_id, array('l')).extend(allocated_frames)
 
         return True
 
@@ -224,20 +246,18 @@ class PagingMemoryManager:
         if process_id not in self.page_table:
             return False
 
-        for frame in self.page_table[process_id]:
-            self.frames[frame] = None
-
-        del self.page_table[process_id]
+        self.frames.free(self.page_table.pop(process_id))
 
         return True
 
     def get_memory_status(self):
         status = []
-        for i, frame in enumerate(self.frames):
-            if frame is None:
-                status.append(f"Frame {i}: Free")
+        for first, last, process_id in self.frames.layout(self.page_table):
+            frames = f"Frame {first}" if first == last else f"Frames {first}-{last}"
+            if process_id is None:
+                status.append(f"{frames}: Free")
             else:
-                status.append(f"Frame {i}: Occupied by Process {frame}")
+                status.append(f"{frames}: Occupied by Process {process_id}")
         return status
 
 class MemoryManagerApp:
@@ -255,6 +275,8 @@ class MemoryManagerApp:
         tk.Radiobutton(self.root, text="First Fit", variable=self.strategy, value="First Fit").grid(row=0, column=1)
         tk.Radiobutton(self.root, text="Best Fit", variable=self.strategy, value="Best Fit").grid(row=0, column=2)
         tk.Radiobutton(self.root, text="Worst Fit", variable=self.strategy, value="Worst Fit").grid(row=0, column=3)
+        tk.Radiobutton(self.root, text="Next Fit", variable=self.strategy, value="Next Fit").grid(row=0, column=4)
+        tk.Radiobutton(self.root, text="Segregated Fit", variable=self.strategy, value="Segregated Fit").grid(row=0, column=5)
 
         tk.Label(self.root, text="Memory Partitioning Type:").grid(row=1, column=0)
         self.partitioning_type = tk.StringVar(value="Equal")
@@ -326,12 +348,8 @@ class MemoryManagerApp:
         partitioning_type = self.partitioning_type.get()
 
         if partitioning_type == "Equal" or partitioning_type == "Unequal" or partitioning_type == "Dynamic":
-            if strategy == "First Fit":
-                success = self.memory_manager.allocate_first_fit(process_id, process_size)
-            elif strategy == "Best Fit":
-                success = self.memory_manager.allocate_best_fit(process_id, process_size)
-            elif strategy == "Worst Fit":
-                success = self.memory_manager.allocate_worst_fit(process_id, process_size)
+            # "Best Fit" -> 'best_fit'
+            success = self.memory_manager.allocate(process_id, process_size, strategy.lower().replace(' ', '_'))
         elif partitioning_type == "Buddy System":
             success = self.memory_manager.allocate_memory(process_id, process_size)
         elif partitioning_type == "Paging":
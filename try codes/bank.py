@@ -1,66 +1,125 @@
+import heapq
+import itertools
 import random
 import time
-import matplotlib.pyplot as plt
+
+from metrics import MetricsAccumulator
+from metrics_store import MetricsStore
+from ready_queue import BlockingReadyQueue, make_ready_queue
+from workload import Workload
+
+# Event kinds for the discrete-event mode, in tie-break order for events at the same instant
+DEPARTURE = 0
+ARRIVAL = 1
+START = 2
 
 class Customer:
-    def __init__(self, id):
+    def __init__(self, id, arrival_time=None, service_time=None, priority=None):
         self.id = id
-        self.service_time = random.randint(1, 10)  # in seconds
-        self.arrival_time = time.time()
+        self.service_time = random.randint(1, 10) if service_time is None else service_time  # in seconds
+        self.remaining_time = self.service_time
+        self.priority = random.randint(1, 5) if priority is None else priority  # 1 is the most urgent
+        self.arrival_time = time.time() if arrival_time is None else arrival_time
         self.start_time = None
         self.end_time = None
 
 class Teller:
-    def __init__(self, id, queue, scheduling_algorithm):
+    def __init__(self, id, queue, scheduling_algorithm, quantum=2, context_switch=0.0, on_complete=None):
         self.id = id
         self.queue = queue
+        self.on_complete = on_complete
         self.scheduling_algorithm = scheduling_algorithm
+        self.quantum = quantum
+        self.context_switch = context_switch
+        self.busy = False
+        self.current_customer = None
+        self.last_customer = None
+        self.slice_start = 0.0
+        self.slice_length = 0.0
+        self.token = 0  # bumped on preemption so the stale departure event is ignored
+
+    def next_customer(self):
+        return self.queue.pop()
+
+    def time_slice(self, customer):
+        if self.scheduling_algorithm == 'RR':
+            return min(self.quantum, customer.remaining_time)
+        return customer.remaining_time
+
+    def switch_cost(self, customer):
+        return 0.0 if customer is self.last_customer else self.context_switch
 
     def serve_customer(self):
         while True:
-            if self.queue:
-                if self.scheduling_algorithm == 'SJF':
-                    customer = min(self.queue, key=lambda x: x.service_time)
-                    self.queue.remove(customer)
-                else:
-                    customer = self.queue.pop(0)
+            customer = self.queue.get()
 
+            time.sleep(self.switch_cost(customer))
+            self.last_customer = customer
+            if customer.start_time is None:
                 customer.start_time = time.time()
-                print(f'Customer {customer.id} is in Teller {self.id}')
-                time.sleep(customer.service_time)
-                customer.end_time = time.time()
-                print(f'Customer {customer.id} leaves the Teller {self.id}')
+            print(f'Customer {customer.id} is in Teller {self.id}')
+
+            # A sleeping thread cannot be interrupted, so in real time the preemptive
+            # policies run in quanta and a better customer takes over at the next boundary
+            if self.queue.preemptive:
+                time_slice = min(self.quantum, customer.remaining_time)
             else:
-                time.sleep(0.1)
+                time_slice = self.time_slice(customer)
+            time.sleep(time_slice)
+            customer.remaining_time -= time_slice
+            if customer.remaining_time > 0:
+                self.queue.push(customer)
+                print(f'Customer {customer.id} returns to the Queue')
+                continue
+
+            customer.end_time = time.time()
+            if self.on_complete is not None:
+                self.on_complete(customer)
+            print(f'Customer {customer.id} leaves the Teller {self.id}')
 
 class BankSimulation:
-    def __init__(self, scheduling_algorithm):
-        self.queue_max_size = 10
-        self.customers = []
+    def __init__(self, scheduling_algorithm, quantum=2, context_switch=0.0, num_tellers=3, queue_max_size=10,
+                 arrival_rate=None, seed=None, workload=None, recorder=None):
+        self.queue_max_size = queue_max_size
+        if workload is None:
+            # arrival_rate is in customers per second; None keeps the original 1-3 s uniform gaps
+            if arrival_rate is None:
+                workload = Workload(seed)
+            else:
+                workload = Workload(seed, arrivals='poisson', arrival_rate=arrival_rate)
+        self.workload = workload
+        self.metrics = MetricsAccumulator()
+        self.recorder = recorder  # optional per-customer event sink, e.g. MetricsStore.event_writer()
         self.tellers = []
         self.scheduling_algorithm = scheduling_algorithm
-        self.queue = []
+        self.quantum = quantum
+        self.context_switch = context_switch
+        self.queue = make_ready_queue(scheduling_algorithm)
 
-        for i in range(3):
-            self.tellers.append(Teller(i + 1, self.queue, self.scheduling_algorithm))
+        for i in range(num_tellers):
+            self.tellers.append(Teller(i + 1, self.queue, self.scheduling_algorithm, quantum, context_switch,
+                                       self.complete_customer))
 
     def generate_customers(self):
         customer_id = 1
         while True:
-            if len(self.queue) < self.queue_max_size:
-                new_customer = Customer(customer_id)
-                self.queue.append(new_customer)
-                print(f'Customer {new_customer.id} enters the Queue')
-                self.customers.append(new_customer)
-                time.sleep(random.randint(1, 3))
-                customer_id += 1
-            else:
+            if self.queue.full():
                 print('Queue is FULL.')
-                time.sleep(1)
+            gap, service_time, priority = self.workload.next()
+            new_customer = Customer(customer_id, service_time=service_time, priority=priority)
+            # Blocks until a teller frees a slot instead of polling
+            self.queue.put(new_customer)
+            print(f'Customer {new_customer.id} enters the Queue')
+            time.sleep(gap)
+            customer_id += 1
 
     def start(self):
         import threading
 
+        self.queue = BlockingReadyQueue(self.queue, self.queue_max_size)
+        for teller in self.tellers:
+            teller.queue = self.queue
+
         threading.Thread(target=self.generate_customers, daemon=True).start()
 
         for teller in self.tellers:
@@ -70,14 +129,150 @@ class BankSimulation:
 
         self.calculate_and_plot_metrics()
 
+    def simulate(self, duration=30, max_customers=None, verbose=False):
+        # Discrete-event run on a virtual clock: no threads and no sleeping. Stops generating
+        # arrivals after max_customers (then drains the queue) or at duration virtual seconds.
+        self.clock = 0.0
+        self.events = []
+        self._event_ids = itertools.count()
+        self._next_customer_id = 1
+        self._max_customers = max_customers
+        self._arrival_blocked = False
+        self._verbose = verbose
+
+        self._schedule(0.0, ARRIVAL)
+
+        while self.events:
+            event_time, kind, _, teller, token = heapq.heappop(self.events)
+            if max_customers is None and event_time > duration:
+                break
+            if kind == DEPARTURE and token != teller.token:
+                continue
+            self.clock = event_time
+
+            if kind == ARRIVAL:
+                self._handle_arrival()
+            elif kind == START:
+                self._handle_start(teller)
+            else:
+                self._handle_departure(teller)
+
+        return self.calculate_metrics()
+
+    def _schedule(self, event_time, kind, teller=None):
+        token = teller.token if teller is not None else 0
+        heapq.heappush(self.events, (event_time, kind, next(self._event_ids), teller, token))
+
+    def _handle_arrival(self):
+        if self._max_customers is not None and self._next_customer_id > self._max_customers:
+            return
+        if len(self.queue) >= self.queue_max_size:
+            # The generator waits for a free slot; the next start re-schedules this arrival
+            self._arrival_blocked = True
+            return
+
+        gap, service_time, priority = self.workload.next()
+        new_customer = Customer(self._next_customer_id, self.clock, service_time, priority)
+        self._next_customer_id += 1
+        self.queue.push(new_customer)
+        if self._verbose:
+            print(f'[{self.clock:.0f}s] Customer {new_customer.id} enters the Queue')
+
+        self._schedule(self.clock + gap, ARRIVAL)
+        if not self._dispatch_idle_teller() and self.queue.preemptive:
+            self._preempt_for(new_customer)
+
+    def _handle_start(self, teller):
+        if not self.queue:
+            teller.busy = False
+            return
+
+        customer = teller.next_customer()
+        teller.current_customer = customer
+        teller.slice_start = self.clock + teller.switch_cost(customer)
+        teller.slice_length = teller.time_slice(customer)
+        teller.last_customer = customer
+        if customer.start_time is None:
+            customer.start_time = teller.slice_start
+        if self._verbose:
+            print(f'[{self.clock:.0f}s] Customer {customer.id} is in Teller {teller.id}')
+        self._schedule(teller.slice_start + teller.slice_length, DEPARTURE, teller)
+
+        if self._arrival_blocked:
+            self._arrival_blocked = False
+            self._schedule(self.clock, ARRIVAL)
+
+    def _handle_departure(self, teller):
+        customer = teller.current_customer
+        customer.remaining_time -= teller.slice_length
+        teller.current_customer = None
+        if customer.remaining_time > 0:
+            self.queue.push(customer)
+            if self._verbose:
+                print(f'[{self.clock:.0f}s] Customer {customer.id} returns to the Queue')
+        else:
+            customer.end_time = self.clock
+            self.complete_customer(customer)
+            if self._verbose:
+                print(f'[{self.clock:.0f}s] Customer {customer.id} leaves the Teller {teller.id}')
+
+        if self.queue:
+            self._schedule(self.clock, START, teller)
+        else:
+            teller.busy = False
+
+    def _dispatch_idle_teller(self):
+        for teller in self.tellers:
+            if not teller.busy:
+                teller.busy = True
+                self._schedule(self.clock, START, teller)
+                return True
+        return False
+
+    def _preempt_for(self, customer):
+        # Take the teller serving the worst customer if the new arrival beats it
+        key = self.queue.key(customer)
+        victim = None
+        victim_key = key
+        for teller in self.tellers:
+            if teller.current_customer is None:
+                continue
+            running_key = self._running_key(teller)
+            if running_key > victim_key:
+                victim = teller
+                victim_key = running_key
+        if victim is None:
+            return
+
+        running = victim.current_customer
+        running.remaining_time -= max(0.0, self.clock - victim.slice_start)
+        victim.current_customer = None
+        victim.token += 1
+        self.queue.push(running)
+        if self._verbose:
+            print(f'[{self.clock:.0f}s] Customer {running.id} is preempted at Teller {victim.id}')
+        self._schedule(self.clock, START, victim)
+
+    def _running_key(self, teller):
+        running = teller.current_customer
+        if self.scheduling_algorithm == 'SRTF':
+            return running.remaining_time - max(0.0, self.clock - teller.slice_start)
+        return self.queue.key(running)
+
+    def complete_customer(self, customer):
+        self.metrics.add(customer)
+        if self.recorder is not None:
+            self.recorder.add(customer)
+
+    def calculate_metrics(self):
+        return self.metrics.summary()
+
     def calculate_and_plot_metrics(self):
-        served_customers = [c for c in self.customers if c.end_time]
-        avg_turnaround_time = sum(c.end_time - c.arrival_time for c in served_customers) / len(served_customers)
-        avg_waiting_time = sum(c.start_time - c.arrival_time for c in served_customers) / len(served_customers)
-        avg_response_time = sum(c.start_time - c.arrival_time for c in served_customers) / len(served_customers)
+        import matplotlib.pyplot as plt
 
+        metrics = self.calculate_metrics()
         labels = ['Average Turnaround Time', 'Average Waiting Time', 'Average Response Time']
-        values = [avg_turnaround_time, avg_waiting_time, avg_response_time]
+        values = [metrics[label] for label in labels]
 
         plt.bar(labels, values, color=['red', 'blue', 'green'])
         plt.ylabel('Time (seconds)')
@@ -89,9 +284,50 @@ if __name__ == '__main__':
     print("1. First-Come-First-Serve (FCFS)")
     print("2. Shortest Job First (SJF)")
     print("3. Round Robin (RR)")
+    print("4. Shortest Remaining Time First (SRTF)")
+    print("5. Priority (preemptive)")
 
     choice = int(input() or '1')
-    algorithm = {1: 'FCFS', 2: 'SJF', 3: 'RR'}.get(choice, 'FCFS')
+    algorithm = {1: 'FCFS', 2: 'SJF', 3: 'RR', 4: 'SRTF', 5: 'PRIORITY'}.get(choice, 'FCFS')
+
+    quantum = 2
+    if algorithm in ('RR', 'SRTF', 'PRIORITY'):
+        print("Time quantum in seconds (default 2):")
+        quantum = float(input() or '2')
+    print("Context switch cost in seconds (default 0):")
+    context_switch = float(input() or '0')
+
+    print("Select Simulation Mode:")
+    print("1. Real time (30 seconds)")
+    print("2. Discrete event (virtual clock)")
+
+    mode = int(input() or '1')
+
+    print("Random seed (blank for a different run every time):")
+    seed = input()
+    seed = int(seed) if seed else None
+
+    store = MetricsStore()
+    run_id = store.new_run_id()
+    parameters = {'algorithm': algorithm, 'tellers': 3, 'queue_max_size': 10, 'service': 'uniform', 'seed': seed,
+                  'quantum': quantum, 'context_switch': context_switch}
+
+    bank_simulation = BankSimulation(algorithm, quantum, context_switch, seed=seed)
+    if mode == 2:
+        print("Number of customers to simulate:")
+        num_customers = int(input() or '1000000')
+        started = time.perf_counter()
+        parameters['customers'] = num_customers
+        with store.event_writer(run_id) as recorder:
+            bank_simulation.recorder = recorder
+            metrics = bank_simulation.simulate(max_customers=num_customers)
+        elapsed = time.perf_counter() - started
+        print(f'Simulated {num_customers} customers ({bank_simulation.clock:.0f} virtual seconds) in {elapsed:.2f}s')
+        for name, value in metrics.items():
+            print(f'{name}: {value}')
+    else:
+        bank_simulation.start()
+        metrics = bank_simulation.calculate_metrics()
 
-    bank_simulation = BankSimulation(algorithm)
-    bank_simulation.start()
+    store.append_run(run_id, parameters, metrics)
+    print(f'Run {run_id} saved to {store.runs_path}')
@@ -0,0 +1,124 @@
+import bisect
+import math
+import threading
+
+# Constant-memory metrics for the bank simulator. Each completed customer is folded into the
+# running statistics and can then be dropped, so memory does not grow with the run length.
+
+class RunningStats:
+    # Count, mean and variance with Welford's online update
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def stdev(self):
+        return math.sqrt(self.variance())
+
+class P2Quantile:
+    # Streaming quantile estimate with the P-square algorithm (Jain & Chlamtac, 1985):
+    # five markers whose heights track the min, p/2, p, (1+p)/2 and max quantiles
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.increments = (0, p / 2, p, (1 + p) / 2, 1)  # desired marker position is 1 + (count - 1) * increment
+
+    def add(self, value):
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = bisect.bisect_right(heights, value) - 1
+
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+
+        for i in (1, 2, 3):
+            d = 1 + (self.count - 1) * self.increments[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (d <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i, step):
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def _linear(self, i, step):
+        q, n = self.heights, self.positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+    def value(self):
+        if not self.heights:
+            return 0.0
+        if self.count <= 5:
+            # The markers are still the sorted samples themselves: use the nearest-rank quantile
+            return self.heights[min(self.count - 1, int(self.p * self.count))]
+        return self.heights[2]
+
+class MetricsAccumulator:
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.lock = threading.Lock()  # tellers report completions from their own threads
+        self.turnaround = RunningStats()
+        self.waiting = RunningStats()
+        self.response = RunningStats()
+        self.waiting_quantiles = [P2Quantile(p) for p in self.QUANTILES]
+
+    def add(self, customer):
+        turnaround = customer.end_time - customer.arrival_time
+        waiting = turnaround - customer.service_time
+        response = customer.start_time - customer.arrival_time
+        with self.lock:
+            self.turnaround.add(turnaround)
+            self.waiting.add(waiting)
+            self.response.add(response)
+            for quantile in self.waiting_quantiles:
+                quantile.add(waiting)
+
+    def summary(self):
+        with self.lock:
+            summary = {
+                'Average Turnaround Time': self.turnaround.mean,
+                'Average Waiting Time': self.waiting.mean,
+                'Average Response Time': self.response.mean,
+                'Customers Served': self.turnaround.count,
+                'Waiting Time Std Dev': self.waiting.stdev(),
+            }
+            for quantile in self.waiting_quantiles:
+                summary[f'Waiting Time P{quantile.p * 100:g}'] = quantile.value()
+        return summary
@@ -0,0 +1,153 @@
+import csv
+import mmap
+import os
+import uuid
+from array import array
+
+# On-disk store for bank simulation results, replacing the "Name: value" *_metrics.txt files.
+#
+#   <root>/runs.csv                      one row per run, columns fixed by RUN_SCHEMA
+#   <root>/events/<run_id>/<column>.bin  per-customer events, one raw native-order array per column
+#
+# runs.csv is only ever appended to, and the event columns are appended in chunks while the
+# simulation runs. Loading is lazy: runs() streams rows and events() memory-maps the columns,
+# so thousands of runs can be scanned without parsing text or reading every event file.
+
+def _optional(convert):
+    return lambda value: None if value == '' else convert(value)
+
+RUN_SCHEMA = [
+    ('run_id', str),
+    ('algorithm', str),
+    ('tellers', _optional(int)),
+    ('queue_max_size', _optional(int)),
+    ('arrival_rate', _optional(float)),
+    ('service', str),
+    ('seed', _optional(int)),
+    ('customers', _optional(int)),
+    ('quantum', _optional(float)),
+    ('context_switch', _optional(float)),
+    ('Average Turnaround Time', float),
+    ('Average Waiting Time', float),
+    ('Average Response Time', float),
+    ('Customers Served', _optional(int)),
+    ('Waiting Time Std Dev', _optional(float)),
+    ('Waiting Time P50', _optional(float)),
+    ('Waiting Time P95', _optional(float)),
+    ('Waiting Time P99', _optional(float)),
+]
+RUN_FIELDS = [name for name, _ in RUN_SCHEMA]
+# The run parameters, between run_id and the first summary column
+PARAMETER_FIELDS = RUN_FIELDS[1:RUN_FIELDS.index('Average Turnaround Time')]
+
+EVENT_SCHEMA = [
+    ('id', 'q'),
+    ('arrival_time', 'd'),
+    ('start_time', 'd'),
+    ('end_time', 'd'),
+    ('service_time', 'd'),
+]
+
+class EventWriter:
+    def __init__(self, directory, chunk_size=65536):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.columns = {name: array(typecode) for name, typecode in EVENT_SCHEMA}
+        for name, _ in EVENT_SCHEMA:
+            open(self._path(name), 'wb').close()
+
+    def _path(self, name):
+        return os.path.join(self.directory, f'{name}.bin')
+
+    def add(self, customer):
+        columns = self.columns
+        columns['id'].append(customer.id)
+        columns['arrival_time'].append(customer.arrival_time)
+        columns['start_time'].append(customer.start_time)
+        columns['end_time'].append(customer.end_time)
+        columns['service_time'].append(customer.service_time)
+        if len(columns['id']) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        for name, column in self.columns.items():
+            if column:
+                with open(self._path(name), 'ab') as file:
+                    column.tofile(file)
+                del column[:]
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read_text_metrics(path):
+    # {name: value} from one of the old "Name: value" files, skipping blank lines
+    summary = {}
+    with open(path, 'r') as file:
+        for line in file:
+            if line.strip():
+                name, value = line.strip().split(': ')
+                summary[name] = float(value)
+    return summary
+
+class MetricsStore:
+    def __init__(self, root='metrics'):
+        self.root = root
+        self.runs_path = os.path.join(root, 'runs.csv')
+        self.events_root = os.path.join(root, 'events')
+        os.makedirs(self.events_root, exist_ok=True)
+
+    def new_run_id(self):
+        return uuid.uuid4().hex[:12]
+
+    def event_writer(self, run_id):
+        return EventWriter(os.path.join(self.events_root, run_id))
+
+    def append_run(self, run_id, parameters, summary):
+        row = dict(parameters)
+        row.update(summary)
+        row['run_id'] = run_id
+        new_file = not os.path.exists(self.runs_path)
+        with open(self.runs_path, 'a', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=RUN_FIELDS, extrasaction='ignore')
+            if new_file:
+                writer.writeheader()
+            writer.writerow({name: '' if row.get(name) is None else row[name] for name in RUN_FIELDS})
+
+    def runs(self, **filters):
+        # Streams runs.csv one typed row at a time, e.g. store.runs(algorithm='SJF', tellers=3)
+        if not os.path.exists(self.runs_path):
+            return
+        converters = dict(RUN_SCHEMA)
+        with open(self.runs_path, newline='') as file:
+            for raw in csv.DictReader(file):
+                row = {name: converters[name](raw[name]) for name in RUN_FIELDS}
+                if all(row[name] == value for name, value in filters.items()):
+                    yield row
+
+    def events(self, run_id):
+        # Column name -> memoryview over the mapped file; nothing is read until it is indexed
+        directory = os.path.join(self.events_root, run_id)
+        columns = {}
+        for name, typecode in EVENT_SCHEMA:
+            path = os.path.join(directory, f'{name}.bin')
+            if os.path.getsize(path) == 0:
+                columns[name] = memoryview(array(typecode))
+                continue
+            with open(path, 'rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            columns[name] = memoryview(mapped).cast(typecode)
+        return columns
+
+    def import_text_metrics(self, path, algorithm):
+        # Migrates one of the old "Name: value" files (e.g. FCFS_metrics.txt) into runs.csv
+        summary = read_text_metrics(path)
+        run_id = self.new_run_id()
+        self.append_run(run_id, {'algorithm': algorithm}, summary)
+        return run_id
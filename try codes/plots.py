@@ -0,0 +1,106 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')  # render to files; no display needed
+import matplotlib.pyplot as plt
+
+from metrics_store import PARAMETER_FIELDS, MetricsStore, read_text_metrics
+
+# Headless charts for bank simulation metrics, in the bar (bank3.py) or line (bank3line.py) style.
+# Figures come from the metrics store, one per configuration, and are rendered in parallel
+# worker processes, e.g.
+#   python plots.py --store metrics --mode line --format svg --out reports
+
+METRICS = ['Average Turnaround Time', 'Average Waiting Time', 'Average Response Time']
+COLORS = ['blue', 'green', 'red']
+# Every run parameter except the seed, which is averaged over
+SPLIT_BY = [name for name in PARAMETER_FIELDS if name != 'seed']
+
+def render(labels, rows, path, mode='bar', title=None, xlabel='Scheduling Algorithm'):
+    fig = plt.figure(figsize=(10, 5))
+    for i, metric in enumerate(METRICS):
+        ax = fig.add_subplot(1, 3, i + 1)
+        values = [row[metric] for row in rows]
+        if mode == 'bar':
+            ax.bar(labels, values, color=[COLORS[j % len(COLORS)] for j in range(len(labels))])
+        else:
+            ax.plot(labels, values, marker='o', linestyle='-', color=COLORS[i % len(COLORS)])
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(metric)
+        ax.set_title(metric)
+    if title:
+        fig.suptitle(title)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+def render_job(job):
+    return render(**job)
+
+def render_many(jobs, workers=None):
+    if workers == 1 or len(jobs) == 1:
+        return [render_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render_job, jobs))
+
+def jobs_from_store(store, out_dir, mode='bar', fmt='png', group_by='algorithm'):
+    # One figure per combination of the other SPLIT_BY fields; the x axis is group_by, averaged over seeds
+    split_by = [name for name in SPLIT_BY if name != group_by]
+    figures = {}
+    for run in store.runs():
+        figure_key = tuple(run[name] for name in split_by)
+        group = figures.setdefault(figure_key, {})
+        totals = group.setdefault(run[group_by], {metric: [0.0, 0] for metric in METRICS})
+        for metric in METRICS:
+            totals[metric][0] += run[metric]
+            totals[metric][1] += 1
+
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = []
+    for figure_key, group in figures.items():
+        labels = [str(label) for label in group]
+        rows = [{metric: total / count for metric, (total, count) in totals.items()} for totals in group.values()]
+        title = ', '.join(f'{name}={value}' for name, value in zip(split_by, figure_key) if value not in (None, ''))
+        name = '_'.join(f'{value}' for value in figure_key if value not in (None, '')) or 'all'
+        jobs.append({
+            'labels': labels,
+            'rows': rows,
+            'path': os.path.join(out_dir, f'{mode}_{name}.{fmt}'),
+            'mode': mode,
+            'title': title or None,
+            'xlabel': 'Scheduling Algorithm' if group_by == 'algorithm' else group_by,
+        })
+    return jobs
+
+def plot_text_metrics(algorithms, mode, path, directory='.'):
+    # The old *_metrics.txt files written by bank3.dart
+    rows = [read_text_metrics(os.path.join(directory, f'{algorithm}_metrics.txt')) for algorithm in algorithms]
+    return render(algorithms, rows, path, mode)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render bank simulation metrics to image files.')
+    parser.add_argument('--store', default='metrics', help='metrics store directory')
+    parser.add_argument('--text', nargs='+', metavar='ALGORITHM',
+                        help='plot <ALGORITHM>_metrics.txt files from the current directory instead')
+    parser.add_argument('--mode', choices=['bar', 'line'], default='bar')
+    parser.add_argument('--format', choices=['png', 'svg'], default='png')
+    parser.add_argument('--out', default='reports', help='output directory')
+    parser.add_argument('--group-by', default='algorithm', help='run field for the x axis')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    args = parser.parse_args(argv)
+
+    if args.text:
+        os.makedirs(args.out, exist_ok=True)
+        paths = [plot_text_metrics(args.text, args.mode, os.path.join(args.out, f'{args.mode}.{args.format}'))]
+    else:
+        jobs = jobs_from_store(MetricsStore(args.store), args.out, args.mode, args.format, args.group_by)
+        paths = render_many(jobs, args.workers)
+    for path in paths:
+        print(path)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+# Ready queues for the tellers. Every queue supports push/pop/len, and pop() always returns the
+# customer the scheduling algorithm would dispatch next. Preemptive queues also expose key():
+# a waiting customer with a smaller key than a customer in service takes over the teller.
+
+class FCFSQueue:
+    preemptive = False
+
+    def __init__(self):
+        self.customers = deque()
+
+    def push(self, customer):
+        self.customers.append(customer)
+
+    def pop(self):
+        return self.customers.popleft()
+
+    def __len__(self):
+        return len(self.customers)
+
+class SJFQueue:
+    preemptive = False
+
+    def __init__(self):
+        self.heap = []
+        self.order = itertools.count()  # keeps FCFS order between equal keys
+
+    def key(self, customer):
+        return customer.service_time
+
+    def push(self, customer):
+        heapq.heappush(self.heap, (self.key(customer), next(self.order), customer))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+class SRTFQueue(SJFQueue):
+    preemptive = True
+
+    def key(self, customer):
+        return customer.remaining_time
+
+class PriorityQueue(SJFQueue):
+    preemptive = True
+
+    def key(self, customer):
+        return customer.priority
+
+class RoundRobinQueue(FCFSQueue):
+    # A ring of customers: the head is served next and a customer whose quantum expired is
+    # pushed back to the tail
+    pass
+
+class BlockingReadyQueue:
+    # Bounded, thread-safe wrapper for the real-time mode. put() blocks while the queue is full
+    # and get() blocks while it is empty, so neither the generator nor the tellers poll.
+    def __init__(self, ready_queue, max_size):
+        self.ready_queue = ready_queue
+        self.max_size = max_size
+        self.preemptive = ready_queue.preemptive
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def put(self, customer):
+        with self.not_full:
+            while len(self.ready_queue) >= self.max_size:
+                self.not_full.wait()
+            # The customer only arrives once there is room, as with the old polling generator
+            customer.arrival_time = time.time()
+            self.ready_queue.push(customer)
+            self.not_empty.notify()
+
+    def push(self, customer):
+        # Requeue of a customer already in the bank: it keeps its place in the system, so it
+        # must not wait for a slot (every teller blocking here would deadlock the bank)
+        with self.lock:
+            self.ready_queue.push(customer)
+            self.not_empty.notify()
+
+    def get(self):
+        with self.not_empty:
+            while not len(self.ready_queue):
+                self.not_empty.wait()
+            customer = self.ready_queue.pop()
+            self.not_full.notify()
+            return customer
+
+    def full(self):
+        with self.lock:
+            return len(self.ready_queue) >= self.max_size
+
+    def __len__(self):
+        with self.lock:
+            return len(self.ready_queue)
+
+READY_QUEUES = {
+    'FCFS': FCFSQueue,
+    'SJF': SJFQueue,
+    'RR': RoundRobinQueue,
+    'SRTF': SRTFQueue,
+    'PRIORITY': PriorityQueue,
+}
+
+def make_ready_queue(scheduling_algorithm):
+    return READY_QUEUES.get(scheduling_algorithm, FCFSQueue)()
@@ -0,0 +1,139 @@
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bank import BankSimulation
+from metrics_store import MetricsStore
+from workload import SERVICES, Workload
+
+# Runs a grid of discrete-event bank simulations across all cores, e.g.
+#   python sweep.py --algorithms FCFS SJF RR --tellers 2 3 4 --seeds 10 --customers 100000
+
+METRICS = ['Average Turnaround Time', 'Average Waiting Time', 'Average Response Time']
+PARAMETERS = ['algorithm', 'tellers', 'queue_max_size', 'arrival_rate']
+
+def build_grid(algorithms, tellers, queue_sizes, arrival_rates, seeds, customers, quantum=2, context_switch=0.0,
+               service='uniform'):
+    grid = []
+    for algorithm, num_tellers, queue_max_size, arrival_rate, seed in itertools.product(
+            algorithms, tellers, queue_sizes, arrival_rates, seeds):
+        grid.append({
+            'algorithm': algorithm,
+            'tellers': num_tellers,
+            'queue_max_size': queue_max_size,
+            'arrival_rate': arrival_rate,
+            'seed': seed,
+            'customers': customers,
+            'quantum': quantum,
+            'context_switch': context_switch,
+            'service': service,
+        })
+    return grid
+
+def run_one(params):
+    if params['arrival_rate'] is None:
+        workload = Workload(params['seed'], service=params['service'])
+    else:
+        workload = Workload(params['seed'], 'poisson', params['service'], arrival_rate=params['arrival_rate'])
+    simulation = BankSimulation(params['algorithm'], params['quantum'], params['context_switch'],
+                                params['tellers'], params['queue_max_size'], workload=workload)
+    started = time.perf_counter()
+    if params.get('events_store'):
+        # Each worker writes its own run directory; summaries are appended by the parent
+        with MetricsStore(params['events_store']).event_writer(params['run_id']) as recorder:
+            simulation.recorder = recorder
+            metrics = simulation.simulate(max_customers=params['customers'])
+    else:
+        metrics = simulation.simulate(max_customers=params['customers'])
+    result = dict(params)
+    result.update(metrics)
+    result['virtual_time'] = simulation.clock
+    result['wall_time'] = time.perf_counter() - started
+    return result
+
+def sweep(grid, workers=None):
+    if workers == 1:
+        return [run_one(params) for params in grid]
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(grid) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_one, grid, chunksize=chunksize))
+
+def aggregate(results):
+    # Average every metric over the seeds of each configuration
+    groups = {}
+    for result in results:
+        key = tuple(result[name] for name in PARAMETERS)
+        groups.setdefault(key, []).append(result)
+
+    rows = []
+    for key, runs in groups.items():
+        row = dict(zip(PARAMETERS, key))
+        row['runs'] = len(runs)
+        for name in METRICS:
+            row[name] = sum(run[name] for run in runs) / len(runs)
+        rows.append(row)
+    return rows
+
+def format_table(rows):
+    headers = ['Algorithm', 'Tellers', 'Queue', 'Rate', 'Runs', 'Turnaround', 'Waiting', 'Response']
+    lines = [' '.join(f'{header:>10}' for header in headers)]
+    for row in rows:
+        rate = 'uniform' if row['arrival_rate'] is None else f"{row['arrival_rate']:g}"
+        cells = [row['algorithm'], row['tellers'], row['queue_max_size'], rate, row['runs']]
+        cells += [f'{row[name]:.3f}' for name in METRICS]
+        lines.append(' '.join(f'{cell:>10}' for cell in cells))
+    return '\n'.join(lines)
+
+def write_csv(rows, path):
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def parse_rate(value):
+    return None if value == 'uniform' else float(value)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sweep bank simulations over a parameter grid.')
+    parser.add_argument('--algorithms', nargs='+', default=['FCFS', 'SJF', 'RR'])
+    parser.add_argument('--tellers', nargs='+', type=int, default=[3])
+    parser.add_argument('--queue-sizes', nargs='+', type=int, default=[10])
+    parser.add_argument('--arrival-rates', nargs='+', type=parse_rate, default=[None],
+                        help="customers per second, or 'uniform' for the 1-3 s gaps")
+    parser.add_argument('--service', choices=sorted(SERVICES), default='uniform', help='service time distribution')
+    parser.add_argument('--seeds', type=int, default=5, help='number of seeds per configuration')
+    parser.add_argument('--customers', type=int, default=10000, help='customers per run')
+    parser.add_argument('--quantum', type=float, default=2)
+    parser.add_argument('--context-switch', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--csv', help='also write every run to this CSV file')
+    parser.add_argument('--store', help='append every run to the metrics store in this directory')
+    parser.add_argument('--events', action='store_true', help='with --store, also record per-customer events')
+    args = parser.parse_args(argv)
+
+    grid = build_grid(args.algorithms, args.tellers, args.queue_sizes, args.arrival_rates, range(args.seeds),
+                      args.customers, args.quantum, args.context_switch, args.service)
+    store = MetricsStore(args.store) if args.store else None
+    if store:
+        for params in grid:
+            params['run_id'] = store.new_run_id()
+            if args.events:
+                params['events_store'] = args.store
+
+    started = time.perf_counter()
+    results = sweep(grid, args.workers)
+    if store:
+        for result in results:
+            store.append_run(result['run_id'], result, result)
+    print(format_table(aggregate(results)))
+    print(f'{len(results)} runs in {time.perf_counter() - started:.1f}s')
+    if args.csv:
+        write_csv(results, args.csv)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bank import BankSimulation
+
+# The discrete-event bank checked against hand-worked timelines, e.g.
+#   python -m pytest test_bank.py
+
+class Script:
+    # A workload replaying fixed (gap, service_time, priority) triples
+    def __init__(self, items):
+        self.items = list(items)
+
+    def next(self):
+        return self.items.pop(0)
+
+class Recorder:
+    def __init__(self):
+        self.customers = []
+
+    def add(self, customer):
+        self.customers.append(customer)
+
+def run(algorithm, items, num_tellers=1, **options):
+    recorder = Recorder()
+    simulation = BankSimulation(algorithm, num_tellers=num_tellers, workload=Script(items), recorder=recorder,
+                                **options)
+    metrics = simulation.simulate(max_customers=len(items))
+    timeline = {customer.id: (customer.arrival_time, customer.start_time, customer.end_time)
+                for customer in recorder.customers}
+    return timeline, metrics
+
+class SimulationTest(unittest.TestCase):
+    def test_fcfs_timeline(self):
+        timeline, metrics = run('FCFS', [(1, 4, 1), (1, 2, 1), (1, 1, 1)])
+        self.assertEqual(timeline, {1: (0, 0, 4), 2: (1, 4, 6), 3: (2, 6, 7)})
+        self.assertEqual(metrics['Customers Served'], 3)
+        self.assertAlmostEqual(metrics['Average Turnaround Time'], (4 + 5 + 5) / 3)
+        self.assertAlmostEqual(metrics['Average Waiting Time'], (0 + 3 + 4) / 3)
+
+    def test_sjf_timeline(self):
+        # The shortest waiting job goes next; the running one is not preempted
+        timeline, metrics = run('SJF', [(1, 5, 1), (1, 3, 1), (1, 1, 1)])
+        self.assertEqual(timeline, {1: (0, 0, 5), 2: (1, 6, 9), 3: (2, 5, 6)})
+
+    def test_round_robin_timeline(self):
+        # A 0-2, B 2-4, A 4-6, B 6-7, A 7-8
+        timeline, metrics = run('RR', [(1, 5, 1), (1, 3, 1)], quantum=2)
+        self.assertEqual(timeline, {1: (0, 0, 8), 2: (1, 2, 7)})
+        self.assertAlmostEqual(metrics['Average Response Time'], (0 + 1) / 2)
+
+    def test_round_robin_with_a_large_quantum_is_fcfs(self):
+        items = [(1, 4, 1), (1, 2, 1), (1, 1, 1)]
+        self.assertEqual(run('RR', items, quantum=10), run('FCFS', items))
+
+    def test_context_switch(self):
+        # Every change of customer at the teller costs half a second
+        timeline, metrics = run('RR', [(1, 5, 1), (1, 3, 1)], quantum=2, context_switch=0.5)
+        self.assertEqual(timeline, {1: (0, 0.5, 10.5), 2: (1, 3, 9)})
+
+    def test_srtf_preempts(self):
+        timeline, metrics = run('SRTF', [(1, 5, 1), (1, 1, 1)])
+        self.assertEqual(timeline, {1: (0, 0, 6), 2: (1, 1, 2)})
+
+    def test_priority_preempts(self):
+        timeline, metrics = run('PRIORITY', [(1, 5, 3), (1, 2, 1)])
+        self.assertEqual(timeline, {1: (0, 0, 7), 2: (1, 1, 3)})
+
+    def test_tellers_in_parallel(self):
+        timeline, metrics = run('FCFS', [(0, 4, 1), (0, 2, 1), (0, 1, 1)], num_tellers=2)
+        self.assertEqual(timeline, {1: (0, 0, 4), 2: (0, 0, 2), 3: (0, 2, 3)})
+
+    def test_full_queue_holds_arrivals_back(self):
+        # The third customer waits for a slot and arrives when the second one starts
+        timeline, metrics = run('FCFS', [(0, 4, 1), (0, 2, 1), (0, 1, 1)], queue_max_size=1)
+        self.assertEqual(timeline, {1: (0, 0, 4), 2: (0, 4, 6), 3: (4, 6, 7)})
+
+    def test_duration_stops_arrivals(self):
+        simulation = BankSimulation('FCFS', num_tellers=1, workload=Script([(10, 1, 1)] * 10))
+        metrics = simulation.simulate(duration=25)
+        self.assertEqual(metrics['Customers Served'], 3)
+        self.assertEqual(simulation.clock, 21)
+
+    def test_same_seed_same_metrics(self):
+        first = BankSimulation('FCFS', seed=5).simulate(max_customers=500)
+        second = BankSimulation('FCFS', seed=5).simulate(max_customers=500)
+        self.assertEqual(first, second)
+        self.assertEqual(first['Customers Served'], 500)
+
+if __name__ == '__main__':
+    unittest.main()
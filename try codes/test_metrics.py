@@ -0,0 +1,88 @@
+import os
+import random
+import statistics
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from metrics import MetricsAccumulator, P2Quantile, RunningStats
+
+# Streaming metrics checked against the sorted samples, e.g.
+#   python -m pytest test_metrics.py
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+def nearest_rank(ordered, p):
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+def estimate(p, values):
+    quantile = P2Quantile(p)
+    for value in values:
+        quantile.add(value)
+    return quantile.value()
+
+class RunningStatsTest(unittest.TestCase):
+    def test_matches_statistics(self):
+        rng = random.Random(0)
+        for n in (1, 2, 3, 10, 1000):
+            values = [rng.uniform(-50, 50) for _ in range(n)]
+            stats = RunningStats()
+            for value in values:
+                stats.add(value)
+            self.assertEqual(stats.count, n)
+            self.assertAlmostEqual(stats.mean, statistics.fmean(values))
+            self.assertAlmostEqual(stats.variance(), statistics.variance(values) if n > 1 else 0.0)
+            self.assertEqual((stats.min, stats.max), (min(values), max(values)))
+
+class P2QuantileTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(P2Quantile(0.5).value(), 0.0)
+
+    def test_small_samples(self):
+        rng = random.Random(1)
+        for n in range(1, 11):
+            for trial in range(50):
+                values = [rng.randint(1, 20) for _ in range(n)]
+                ordered = sorted(values)
+                for p in QUANTILES:
+                    if n <= 5:
+                        # Exact while the markers are the samples
+                        self.assertEqual(estimate(p, values), nearest_rank(ordered, p))
+                    else:
+                        self.assertLessEqual(ordered[0], estimate(p, values))
+                        self.assertLessEqual(estimate(p, values), ordered[-1])
+
+    def test_five_samples(self):
+        values = [3, 12, 8, 5, 9]
+        self.assertEqual([estimate(p, values) for p in QUANTILES], [8, 12, 12])
+
+    def test_large_sample(self):
+        rng = random.Random(2)
+        values = [rng.expovariate(1.0) for _ in range(100000)]
+        ordered = sorted(values)
+        for p in QUANTILES:
+            exact = nearest_rank(ordered, p)
+            self.assertAlmostEqual(estimate(p, values), exact, delta=0.01 * exact)
+
+class MetricsAccumulatorTest(unittest.TestCase):
+    def test_summary(self):
+        class Customer:
+            def __init__(self, arrival_time, start_time, service_time):
+                self.arrival_time = arrival_time
+                self.start_time = start_time
+                self.service_time = service_time
+                self.end_time = start_time + service_time
+
+        metrics = MetricsAccumulator()
+        for customer in [Customer(0, 0, 4), Customer(1, 4, 2), Customer(2, 6, 3)]:
+            metrics.add(customer)
+        summary = metrics.summary()
+        self.assertEqual(summary['Customers Served'], 3)
+        self.assertAlmostEqual(summary['Average Turnaround Time'], (4 + 5 + 7) / 3)
+        self.assertAlmostEqual(summary['Average Waiting Time'], (0 + 3 + 4) / 3)
+        self.assertAlmostEqual(summary['Average Response Time'], (0 + 3 + 4) / 3)
+        self.assertEqual(summary['Waiting Time P50'], 3)
+        self.assertEqual(summary['Waiting Time P99'], 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bank import BankSimulation
+from metrics_store import MetricsStore
+
+# Runs and events written to disk and read back, e.g.
+#   python -m pytest test_metrics_store.py
+
+class Recorder:
+    def __init__(self, writer):
+        self.writer = writer
+        self.customers = []
+
+    def add(self, customer):
+        self.writer.add(customer)
+        self.customers.append(customer)
+
+class MetricsStoreTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = MetricsStore(os.path.join(directory.name, 'metrics'))
+
+    def test_run_round_trip(self):
+        parameters = {'algorithm': 'SJF', 'tellers': 3, 'queue_max_size': 10, 'arrival_rate': None,
+                      'service': 'uniform', 'seed': 4, 'customers': 200, 'quantum': 2.0, 'context_switch': 0.0}
+        summary = BankSimulation('SJF', seed=4).simulate(max_customers=200)
+        self.store.append_run('first', parameters, summary)
+        self.store.append_run('second', dict(parameters, algorithm='FCFS'), summary)
+
+        rows = list(self.store.runs())
+        self.assertEqual([row['run_id'] for row in rows], ['first', 'second'])
+        row = rows[0]
+        for name, value in parameters.items():
+            self.assertEqual(row[name], value, name)
+        for name, value in summary.items():
+            self.assertAlmostEqual(row[name], value, msg=name)
+        self.assertEqual([row['run_id'] for row in self.store.runs(algorithm='FCFS')], ['second'])
+
+    def test_no_runs(self):
+        self.assertEqual(list(self.store.runs()), [])
+
+    def test_events_round_trip(self):
+        run_id = self.store.new_run_id()
+        with self.store.event_writer(run_id) as writer:
+            # A small chunk size so the columns are appended several times
+            writer.chunk_size = 7
+            recorder = Recorder(writer)
+            BankSimulation('RR', seed=1, recorder=recorder).simulate(max_customers=50)
+        events = self.store.events(run_id)
+        self.assertEqual(list(events['id']), [customer.id for customer in recorder.customers])
+        for name in ('arrival_time', 'start_time', 'end_time', 'service_time'):
+            self.assertEqual(list(events[name]), [getattr(customer, name) for customer in recorder.customers])
+
+    def test_empty_events(self):
+        run_id = self.store.new_run_id()
+        self.store.event_writer(run_id).close()
+        self.assertEqual(len(self.store.events(run_id)['end_time']), 0)
+
+    def test_import_text_metrics(self):
+        path = os.path.join(self.store.root, 'FCFS_metrics.txt')
+        with open(path, 'w') as file:
+            file.write('Average Turnaround Time: 12.5\n\nAverage Waiting Time: 4.25\nAverage Response Time: 4.25\n')
+        run_id = self.store.import_text_metrics(path, 'FCFS')
+        row, = self.store.runs(run_id=run_id)
+        self.assertEqual((row['algorithm'], row['Average Turnaround Time'], row['Average Waiting Time']),
+                         ('FCFS', 12.5, 4.25))
+        self.assertIsNone(row['tellers'])
+
+if __name__ == '__main__':
+    unittest.main()
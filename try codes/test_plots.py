@@ -0,0 +1,74 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from metrics_store import MetricsStore
+
+try:
+    import plots
+except ImportError:
+    plots = None
+
+# Headless chart rendering from the metrics store, e.g.
+#   python -m pytest test_plots.py
+
+SUMMARY = {'Average Turnaround Time': 6.0, 'Average Waiting Time': 2.0, 'Average Response Time': 2.0}
+
+@unittest.skipIf(plots is None, 'matplotlib is not installed')
+class PlotsTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.store = MetricsStore(os.path.join(self.directory, 'metrics'))
+
+    def add_run(self, algorithm, tellers, seed, turnaround):
+        parameters = {'algorithm': algorithm, 'tellers': tellers, 'queue_max_size': 10, 'service': 'uniform',
+                      'seed': seed, 'customers': 100}
+        summary = dict(SUMMARY, **{'Average Turnaround Time': turnaround})
+        self.store.append_run(self.store.new_run_id(), parameters, summary)
+
+    def test_one_figure_per_configuration(self):
+        self.add_run('FCFS', 2, 0, 4.0)
+        self.add_run('FCFS', 2, 1, 8.0)
+        self.add_run('SJF', 2, 0, 5.0)
+        self.add_run('FCFS', 3, 0, 3.0)
+        jobs = plots.jobs_from_store(self.store, os.path.join(self.directory, 'reports'))
+        self.assertEqual(len(jobs), 2)
+        job = next(job for job in jobs if 'tellers=2' in job['title'])
+        self.assertEqual(job['labels'], ['FCFS', 'SJF'])
+        # Averaged over the seeds
+        self.assertEqual([row['Average Turnaround Time'] for row in job['rows']], [6.0, 5.0])
+
+        paths = plots.render_many(jobs, workers=2)
+        for path in paths:
+            self.assertGreater(os.path.getsize(path), 0)
+
+    def test_group_by_tellers(self):
+        self.add_run('FCFS', 2, 0, 4.0)
+        self.add_run('FCFS', 3, 0, 3.0)
+        job, = plots.jobs_from_store(self.store, self.directory, mode='line', fmt='svg', group_by='tellers')
+        self.assertEqual((job['labels'], job['xlabel']), (['2', '3'], 'tellers'))
+        self.assertTrue(job['path'].endswith('.svg'))
+
+    def test_text_metrics(self):
+        for algorithm in ('FCFS', 'SJF'):
+            with open(os.path.join(self.directory, f'{algorithm}_metrics.txt'), 'w') as file:
+                file.writelines(f'{name}: {value}\n' for name, value in SUMMARY.items())
+        output = io.StringIO()
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            with contextlib.redirect_stdout(output):
+                plots.main(['--text', 'FCFS', 'SJF', '--mode', 'line', '--out', 'reports'])
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(output.getvalue().split(), [os.path.join('reports', 'line.png')])
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'reports', 'line.png')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import random
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bank import Customer
+from ready_queue import READY_QUEUES, BlockingReadyQueue, FCFSQueue, SJFQueue, make_ready_queue
+
+# Ready queues checked against sorting the waiting customers, e.g.
+#   python -m pytest test_ready_queue.py
+
+def drain(queue):
+    return [queue.pop().id for _ in range(len(queue))]
+
+class ReadyQueueTest(unittest.TestCase):
+    def test_dispatch_order(self):
+        rng = random.Random(0)
+        customers = [Customer(i, 0, rng.randint(1, 5), rng.randint(1, 3)) for i in range(200)]
+        keys = {
+            'FCFS': lambda customer: 0,
+            'RR': lambda customer: 0,
+            'SJF': lambda customer: customer.service_time,
+            'SRTF': lambda customer: customer.remaining_time,
+            'PRIORITY': lambda customer: customer.priority,
+        }
+        for name, key in keys.items():
+            queue = make_ready_queue(name)
+            for customer in customers:
+                queue.push(customer)
+            # sorted() is stable, so equal keys stay in arrival order
+            self.assertEqual(drain(queue), [customer.id for customer in sorted(customers, key=key)], name)
+
+    def test_preemptive_queues(self):
+        self.assertEqual({name for name, queue in READY_QUEUES.items() if queue.preemptive}, {'SRTF', 'PRIORITY'})
+
+    def test_unknown_algorithm_is_fcfs(self):
+        self.assertIsInstance(make_ready_queue('LOTTERY'), FCFSQueue)
+
+class BlockingReadyQueueTest(unittest.TestCase):
+    def start(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        return thread
+
+    def test_get_waits_for_put(self):
+        queue = BlockingReadyQueue(FCFSQueue(), 2)
+        served = []
+        thread = self.start(lambda: served.append(queue.get().id))
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+        queue.put(Customer(1, 0, 1, 1))
+        thread.join(5)
+        self.assertEqual(served, [1])
+
+    def test_put_waits_for_a_slot(self):
+        queue = BlockingReadyQueue(FCFSQueue(), 1)
+        queue.put(Customer(1, 0, 1, 1))
+        self.assertTrue(queue.full())
+        late = Customer(2, 0, 1, 1)
+        thread = self.start(queue.put, late)
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+        self.assertEqual(queue.get().id, 1)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        # The customer arrives once it is in the queue, not when it started waiting
+        self.assertGreater(late.arrival_time, 0)
+        self.assertEqual(queue.get().id, 2)
+
+    def test_push_ignores_the_limit(self):
+        queue = BlockingReadyQueue(SJFQueue(), 1)
+        queue.put(Customer(1, 0, 5, 1))
+        queue.push(Customer(2, 0, 3, 1))
+        self.assertEqual(len(queue), 2)
+        self.assertEqual([queue.get().id, queue.get().id], [2, 1])
+
+    def test_producers_and_consumers(self):
+        queue = BlockingReadyQueue(FCFSQueue(), 3)
+        served = []
+        lock = threading.Lock()
+
+        def teller(count):
+            for _ in range(count):
+                customer = queue.get()
+                with lock:
+                    served.append(customer.id)
+
+        tellers = [self.start(teller, 100) for _ in range(4)]
+        for i in range(400):
+            queue.put(Customer(i, 0, 1, 1))
+        for thread in tellers:
+            thread.join(5)
+        self.assertEqual(sorted(served), list(range(400)))
+        self.assertEqual(len(queue), 0)
+
+if __name__ == '__main__':
+    unittest.main()
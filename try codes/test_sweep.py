@@ -0,0 +1,60 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import sweep
+from metrics_store import MetricsStore
+
+# The parameter sweep on a small grid, e.g.
+#   python -m pytest test_sweep.py
+
+class SweepTest(unittest.TestCase):
+    def test_grid(self):
+        grid = sweep.build_grid(['FCFS', 'RR'], [2, 3], [10], [None, 0.5], range(3), 100)
+        self.assertEqual(len(grid), 2 * 2 * 1 * 2 * 3)
+        self.assertEqual(grid[0], {'algorithm': 'FCFS', 'tellers': 2, 'queue_max_size': 10, 'arrival_rate': None,
+                                   'seed': 0, 'customers': 100, 'quantum': 2, 'context_switch': 0.0,
+                                   'service': 'uniform'})
+
+    def test_pool_matches_serial(self):
+        grid = sweep.build_grid(['FCFS', 'SJF'], [2], [10], [None, 0.5], range(2), 200)
+        serial = sweep.sweep(grid, workers=1)
+        pooled = sweep.sweep(grid, workers=2)
+        for first, second in zip(serial, pooled):
+            self.assertEqual({name: first[name] for name in sweep.METRICS + ['virtual_time']},
+                             {name: second[name] for name in sweep.METRICS + ['virtual_time']})
+        self.assertEqual([result['Customers Served'] for result in serial], [200] * len(grid))
+
+    def test_aggregate(self):
+        results = [
+            {'algorithm': 'FCFS', 'tellers': 3, 'queue_max_size': 10, 'arrival_rate': None, 'seed': seed,
+             'Average Turnaround Time': seed, 'Average Waiting Time': 2 * seed, 'Average Response Time': 1.0}
+            for seed in range(4)]
+        row, = sweep.aggregate(results)
+        self.assertEqual(row['runs'], 4)
+        self.assertEqual((row['Average Turnaround Time'], row['Average Waiting Time']), (1.5, 3.0))
+        self.assertIn('uniform', sweep.format_table([row]))
+
+    def test_main_with_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = os.path.join(directory, 'metrics')
+            path = os.path.join(directory, 'runs.csv')
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                sweep.main(['--algorithms', 'FCFS', 'RR', '--seeds', '2', '--customers', '50', '--workers', '1',
+                            '--csv', path, '--store', root, '--events'])
+            self.assertIn('4 runs in', output.getvalue())
+            store = MetricsStore(root)
+            runs = list(store.runs())
+            self.assertEqual(sorted(run['algorithm'] for run in runs), ['FCFS', 'FCFS', 'RR', 'RR'])
+            for run in runs:
+                self.assertEqual(len(store.events(run['run_id'])['id']), 50)
+            with open(path) as file:
+                self.assertEqual(len(file.readlines()), 5)
+
+if __name__ == '__main__':
+    unittest.main()
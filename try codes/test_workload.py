@@ -0,0 +1,72 @@
+import os
+import statistics
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import workload
+from workload import ARRIVALS, SERVICES, TraceWorkload, Workload, record_trace
+
+# Seeded workloads, e.g.
+#   python -m pytest test_workload.py
+
+BACKENDS = [False, True] if workload.np is not None else [False]
+
+def draw(n, **options):
+    generator = Workload(**options)
+    return [generator.next() for _ in range(n)]
+
+class WorkloadTest(unittest.TestCase):
+    def test_same_seed_same_customers(self):
+        for vectorised in BACKENDS:
+            for arrivals in ARRIVALS:
+                for service in SERVICES:
+                    options = dict(seed=7, arrivals=arrivals, service=service, batch_size=100, vectorised=vectorised)
+                    self.assertEqual(draw(250, **options), draw(250, **options))
+                    self.assertNotEqual(draw(250, **options), draw(250, **dict(options, seed=8)))
+
+    def test_distributions(self):
+        for vectorised in BACKENDS:
+            for arrivals in ARRIVALS:
+                for service in SERVICES:
+                    items = draw(20000, seed=1, arrivals=arrivals, service=service, period=600,
+                                 vectorised=vectorised)
+                    gaps = [gap for gap, service_time, priority in items]
+                    services = [service_time for gap, service_time, priority in items]
+                    self.assertGreaterEqual(min(gaps), 0)
+                    self.assertAlmostEqual(statistics.fmean(services), 5.5, delta=0.2)
+                    self.assertEqual({priority for gap, service_time, priority in items}, {1, 2, 3, 4, 5})
+                    if arrivals == 'bursty':
+                        # Bursts at 4x the base rate for a fifth of the time: 1.6x the arrivals
+                        self.assertAlmostEqual(statistics.fmean(gaps), 2 / 1.6, delta=0.1)
+                    else:
+                        self.assertAlmostEqual(statistics.fmean(gaps), 2, delta=0.1)
+                    if service == 'uniform':
+                        self.assertEqual(set(services), set(range(1, 11)))
+                    if arrivals == 'uniform':
+                        self.assertEqual(set(gaps), {1, 2, 3})
+
+    def test_unknown_distribution(self):
+        with self.assertRaises(ValueError):
+            Workload(arrivals='gamma')
+        with self.assertRaises(ValueError):
+            Workload(service='gamma')
+
+    def test_trace_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.csv')
+            record_trace(Workload(3, 'poisson', 'exponential'), path, 50)
+            expected = draw(50, seed=3, arrivals='poisson', service='exponential')
+            replayed = TraceWorkload(path)
+            items = [replayed.next() for _ in range(50)]
+            for (gap, service_time, priority), (gap_expected, service_expected, priority_expected) in zip(
+                    items[:-1], expected[:-1]):
+                self.assertAlmostEqual(gap, gap_expected)
+                self.assertAlmostEqual(service_time, service_expected)
+                self.assertEqual(priority, priority_expected)
+            # The replay loops
+            self.assertEqual(replayed.next(), items[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,248 @@
+import csv
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:  # optional; plots.py needs it through matplotlib anyway
+    np = None
+
+# Seeded customer workloads for the bank simulator. Every run owns its own generator, so a
+# (seed, distributions) pair always produces the same customers. Customers are drawn in batches
+# of batch_size. With NumPy installed each batch is drawn as arrays from a numpy Generator, which
+# is what makes millions of customers cheap; without it (or with vectorised=False) the same
+# distributions are drawn one value at a time from random.Random. The two backends give different
+# streams for the same seed.
+#
+# Arrival processes:  uniform (1-3 s gaps, the original generator), poisson, bursty, diurnal
+# Service times:      uniform (1-10 s, the original Customer), exponential, lognormal
+
+class Workload:
+    def __init__(self, seed=None, arrivals='uniform', service='uniform', arrival_rate=0.5, mean_service=5.5,
+                 service_sigma=0.5, burst_factor=4.0, burst_fraction=0.2, burst_length=30.0, period=86400.0,
+                 amplitude=0.8, batch_size=4096, vectorised=None):
+        if arrivals not in ARRIVALS:
+            raise ValueError(f'Unknown arrival process: {arrivals}')
+        if service not in SERVICES:
+            raise ValueError(f'Unknown service distribution: {service}')
+        self.vectorised = np is not None if vectorised is None else vectorised
+        if self.vectorised and np is None:
+            raise ValueError('vectorised workloads need NumPy')
+        self.rng = random.Random(seed)
+        self.generator = np.random.default_rng(seed) if self.vectorised else None
+        self.arrivals = arrivals
+        self.service = service
+        self.arrival_rate = arrival_rate
+        self.mean_service = mean_service
+        self.service_sigma = service_sigma
+        self.burst_factor = burst_factor
+        self.burst_fraction = burst_fraction
+        self.burst_length = burst_length
+        self.period = period
+        self.amplitude = amplitude
+        self.batch_size = batch_size
+        self.clock = 0.0  # time the diurnal and vectorised bursty processes have been drawn up to
+        self.last_arrival = 0.0  # time of the last vectorised arrival handed out
+        self.in_burst = False
+        self.burst_left = 0.0
+        self.batch = []
+        self.position = 0
+        self.pending = None  # arrival times drawn past the end of the last vectorised batch
+
+    def next(self):
+        # (gap to the next arrival, service time, priority) for the next customer
+        if self.position == len(self.batch):
+            self.batch = self.next_batch()
+            self.position = 0
+        item = self.batch[self.position]
+        self.position += 1
+        return item
+
+    def next_batch(self):
+        n = self.batch_size
+        if self.vectorised:
+            gaps = VECTOR_ARRIVALS[self.arrivals](self, n)
+            services = VECTOR_SERVICES[self.service](self, n)
+            priorities = self.generator.integers(1, 6, n)
+            return list(zip(gaps.tolist(), services.tolist(), priorities.tolist()))
+        gaps = ARRIVALS[self.arrivals](self, n)
+        services = SERVICES[self.service](self, n)
+        priorities = [self.rng.randint(1, 5) for _ in range(n)]
+        return list(zip(gaps, services, priorities))
+
+    def uniform_gaps(self, n):
+        randint = self.rng.randint
+        return [randint(1, 3) for _ in range(n)]
+
+    def poisson_gaps(self, n):
+        expovariate = self.rng.expovariate
+        rate = self.arrival_rate
+        return [expovariate(rate) for _ in range(n)]
+
+    def bursty_gaps(self, n):
+        # Two-state modulated Poisson process: bursts at burst_factor times the base rate
+        # occupy roughly burst_fraction of the time
+        rng = self.rng
+        calm_length = self.burst_length * (1 - self.burst_fraction) / self.burst_fraction
+        gaps = []
+        gap = 0.0
+        while len(gaps) < n:
+            if self.burst_left <= 0:
+                self.in_burst = not self.in_burst
+                self.burst_left = rng.expovariate(1 / (self.burst_length if self.in_burst else calm_length))
+            rate = self.arrival_rate * (self.burst_factor if self.in_burst else 1.0)
+            step = rng.expovariate(rate)
+            if step > self.burst_left:
+                # No arrival before the state flips; the process is memoryless, so redraw after it
+                gap += self.burst_left
+                self.burst_left = 0
+                continue
+            self.burst_left -= step
+            gaps.append(gap + step)
+            gap = 0.0
+        return gaps
+
+    def diurnal_gaps(self, n):
+        # Non-homogeneous Poisson process with a sinusoidal daily rate, sampled by thinning
+        rng = self.rng
+        peak = self.arrival_rate * (1 + self.amplitude)
+        omega = 2 * math.pi / self.period
+        gaps = []
+        last = self.clock
+        t = self.clock
+        while len(gaps) < n:
+            t += rng.expovariate(peak)
+            rate = self.arrival_rate * (1 + self.amplitude * math.sin(omega * t))
+            if rng.random() * peak <= rate:
+                gaps.append(t - last)
+                last = t
+        self.clock = t
+        return gaps
+
+    def uniform_service(self, n):
+        randint = self.rng.randint
+        return [randint(1, 10) for _ in range(n)]
+
+    def exponential_service(self, n):
+        expovariate = self.rng.expovariate
+        rate = 1 / self.mean_service
+        return [expovariate(rate) for _ in range(n)]
+
+    def lognormal_service(self, n):
+        # mu is chosen so the distribution mean is mean_service
+        lognormvariate = self.rng.lognormvariate
+        sigma = self.service_sigma
+        mu = math.log(self.mean_service) - sigma * sigma / 2
+        return [lognormvariate(mu, sigma) for _ in range(n)]
+
+    def uniform_gaps_vector(self, n):
+        return self.generator.integers(1, 4, n)
+
+    def poisson_gaps_vector(self, n):
+        return self.generator.exponential(1 / self.arrival_rate, n)
+
+    def bursty_gaps_vector(self, n):
+        # Same process as bursty_gaps, one state period at a time: a Poisson number of arrivals,
+        # placed uniformly over the period
+        generator = self.generator
+        calm_length = self.burst_length * (1 - self.burst_fraction) / self.burst_fraction
+        times = [self.pending] if self.pending is not None else []
+        count = 0 if self.pending is None else len(self.pending)
+        while count < n:
+            self.in_burst = not self.in_burst
+            length = generator.exponential(self.burst_length if self.in_burst else calm_length)
+            rate = self.arrival_rate * (self.burst_factor if self.in_burst else 1.0)
+            arrivals = self.clock + np.sort(generator.uniform(0, length, generator.poisson(rate * length)))
+            times.append(arrivals)
+            count += len(arrivals)
+            self.clock += length
+        return self._gaps(np.concatenate(times), n)
+
+    def diurnal_gaps_vector(self, n):
+        # Same thinning as diurnal_gaps, on arrays of candidate arrivals
+        generator = self.generator
+        peak = self.arrival_rate * (1 + self.amplitude)
+        omega = 2 * math.pi / self.period
+        times = [self.pending] if self.pending is not None else []
+        count = 0 if self.pending is None else len(self.pending)
+        t = self.clock  # time of the last candidate drawn
+        while count < n:
+            candidates = t + np.cumsum(generator.exponential(1 / peak, 2 * n))
+            rates = self.arrival_rate * (1 + self.amplitude * np.sin(omega * candidates))
+            accepted = candidates[generator.uniform(0, peak, 2 * n) <= rates]
+            times.append(accepted)
+            count += len(accepted)
+            t = candidates[-1]
+        self.clock = t
+        return self._gaps(np.concatenate(times), n)
+
+    def _gaps(self, times, n):
+        # Gaps between the next n arrival times; the rest are kept for the next batch
+        gaps = np.diff(times[:n], prepend=self.last_arrival)
+        self.last_arrival = times[n - 1]
+        self.pending = times[n:]
+        return gaps
+
+    def uniform_service_vector(self, n):
+        return self.generator.integers(1, 11, n)
+
+    def exponential_service_vector(self, n):
+        return self.generator.exponential(self.mean_service, n)
+
+    def lognormal_service_vector(self, n):
+        sigma = self.service_sigma
+        return self.generator.lognormal(math.log(self.mean_service) - sigma * sigma / 2, sigma, n)
+
+ARRIVALS = {
+    'uniform': Workload.uniform_gaps,
+    'poisson': Workload.poisson_gaps,
+    'bursty': Workload.bursty_gaps,
+    'diurnal': Workload.diurnal_gaps,
+}
+
+SERVICES = {
+    'uniform': Workload.uniform_service,
+    'exponential': Workload.exponential_service,
+    'lognormal': Workload.lognormal_service,
+}
+
+VECTOR_ARRIVALS = {
+    'uniform': Workload.uniform_gaps_vector,
+    'poisson': Workload.poisson_gaps_vector,
+    'bursty': Workload.bursty_gaps_vector,
+    'diurnal': Workload.diurnal_gaps_vector,
+}
+
+VECTOR_SERVICES = {
+    'uniform': Workload.uniform_service_vector,
+    'exponential': Workload.exponential_service_vector,
+    'lognormal': Workload.lognormal_service_vector,
+}
+
+class TraceWorkload:
+    # Replays a recorded trace: a CSV with arrival_time, service_time and priority columns.
+    # Gaps come from consecutive arrival times; the replay loops if the simulation outlasts it.
+    def __init__(self, path):
+        with open(path, newline='') as file:
+            rows = [(float(row['arrival_time']), float(row['service_time']), int(row['priority']))
+                    for row in csv.DictReader(file)]
+        if not rows:
+            raise ValueError(f'Trace {path} has no customers')
+        gaps = [max(following[0] - row[0], 0.0) for row, following in zip(rows, rows[1:])] + [0.0]
+        self.items = [(gap, service, priority) for gap, (_, service, priority) in zip(gaps, rows)]
+        self.position = 0
+
+    def next(self):
+        item = self.items[self.position]
+        self.position = (self.position + 1) % len(self.items)
+        return item
+
+def record_trace(workload, path, num_customers):
+    arrival_time = 0.0
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['arrival_time', 'service_time', 'priority'])
+        for _ in range(num_customers):
+            gap, service_time, priority = workload.next()
+            writer.writerow([arrival_time, service_time, priority])
+            arrival_time += gap